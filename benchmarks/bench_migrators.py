@@ -0,0 +1,65 @@
+"""
+Migrator comparison after a batch of devices comes back empty: half of
+the cluster holds PROCS_PER_DEVICE processes, the other half just
+recovered with none. Reports steps until every process finished, the
+moves made, and the time spent in rebalance() per step, for the push
+HeapTaskMigrator and the pull StealingTaskMigrator with the same per-step
+move budget (which also caps the idle devices a stealing step visits).
+
+    python benchmarks/bench_migrators.py [DEVICES] [PROCS_PER_DEVICE] [MAX_MOVES] [SEED]
+"""
+import sys
+import pathlib
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from os_sim.application.devices.simple_device import SimpleDevice
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator
+from os_sim.application.simulation.profiler import StepProfiler
+from os_sim.application.simulation.stealing_migrator import StealingTaskMigrator
+
+
+def run(kind: str, devices: int, procs: int, max_moves: int, seed: int) -> tuple[int, int, float]:
+    devs = []
+    for i in range(devices):
+        os_ = BasicOperatingSystem(memory=SimpleMemoryManager(_total=procs * 2), scheduler=RoundRobinScheduler())
+        if i % 2 == 0:
+            os_.create_processes([(5 + (j * 7) % 20, 1) for j in range(procs)])
+        devs.append(SimpleDevice(_id=i + 1, _os=os_))
+    if kind == "heap":
+        migrator = HeapTaskMigrator(max_moves=max_moves)
+    else:
+        migrator = StealingTaskMigrator(max_moves=max_moves, max_thieves=max_moves, seed=seed)
+    sim = SimulationEngine(devices=devs, task_migrator=migrator)
+    sim.profiler = StepProfiler(max_samples=1)
+
+    rebalance_s = 0.0
+    total = sum(d.os().load for d in devs)
+    while sim.completed_count < total:
+        sim.step()
+        rebalance_s += sim.profiler.samples[-1].rebalance_s
+    return sim.time, migrator.total_moves, rebalance_s / sim.time
+
+
+def main() -> None:
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    procs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    max_moves = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+
+    print(f"{devices} devices, {procs} processes on every other one, {max_moves} moves/step, seed {seed}")
+    print(f"{'migrator':>8} | {'steps':>6} | {'moves':>6} | {'rebalance us/step':>17}")
+    print("-" * 47)
+    for kind in ("heap", "steal"):
+        steps, moves, per_step = run(kind, devices, procs, max_moves, seed)
+        print(f"{kind:>8} | {steps:6d} | {moves:6d} | {per_step * 1e6:17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Microbenchmark: per-pick and per-remove cost of RoundRobinScheduler
+as the run queue grows.
+
+    python benchmarks/bench_round_robin.py
+"""
+import sys
+import pathlib
+import timeit
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.domain.processes import Process
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+PICKS = 100_000
+
+
+def bench(size: int) -> tuple[float, float]:
+    sched = RoundRobinScheduler()
+    procs = [Process(pid=i, cpu_time=1, mem_required=1) for i in range(size)]
+    for p in procs:
+        sched.add(p)
+
+    pick_s = timeit.timeit(sched.pick_next, number=PICKS)
+
+    victims = procs[::max(1, size // 1000)][:1000]
+    remove_s = timeit.timeit(lambda: [sched.remove(p) for p in victims], number=1)
+    return pick_s / PICKS, remove_s / len(victims)
+
+
+def main() -> None:
+    print(f"{'queue':>10} | {'ns/pick':>8} | {'ns/remove':>9}")
+    print("-" * 33)
+    for size in SIZES:
+        pick, remove = bench(size)
+        print(f"{size:>10} | {pick * 1e9:8.1f} | {remove * 1e9:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
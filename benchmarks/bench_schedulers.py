@@ -0,0 +1,99 @@
+"""
+Scheduler comparison: wait and turnaround (mean / p50 / p95 / p99, in
+steps) of every scheduler on the same seeded workload, a mix of short
+interactive jobs (priority 0) and long batch jobs (priority 2) arriving
+over time on a few devices, plus simulation steps/second. QUANTUM and
+SWITCH_COST apply the OS time slice and context-switch cost to every run.
+
+    python benchmarks/bench_schedulers.py [DEVICES] [JOBS_PER_DEVICE] [SEED] [QUANTUM] [SWITCH_COST]
+"""
+import sys
+import pathlib
+import random
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from os_sim.application.devices.simple_device import SimpleDevice
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.scheduling.heap_schedulers import PriorityScheduler, SRTFScheduler
+from os_sim.application.scheduling.mlfq import MLFQScheduler
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.application.simulation.latency_metrics import LatencyMetrics
+
+SCHEDULERS = {
+    "rr": RoundRobinScheduler,
+    "priority": PriorityScheduler,
+    "srtf": SRTFScheduler,
+    "mlfq": MLFQScheduler,
+}
+
+
+def workload(jobs: int, seed: int) -> list[tuple[int, int, int]]:
+    """(arrival step, cpu_time, priority) per job, sorted by arrival."""
+    rng = random.Random(seed)
+    out = []
+    t = 0
+    for _ in range(jobs):
+        # mean gap 22 steps against ~19 steps of work: ~85% busy
+        t += rng.randint(0, 44)
+        if rng.random() < 0.8:
+            out.append((t, rng.randint(1, 6), 0))
+        else:
+            out.append((t, rng.randint(40, 120), 2))
+    return out
+
+
+def run(kind: str, devices: int, jobs: int, seed: int, quantum: int = 0, switch_cost: int = 0) -> tuple[dict, float]:
+    oses = [
+        BasicOperatingSystem(
+            memory=SimpleMemoryManager(_total=jobs * 2),
+            scheduler=SCHEDULERS[kind](),
+            quantum=quantum,
+            switch_cost=switch_cost,
+        )
+        for _ in range(devices)
+    ]
+    sim = SimulationEngine(devices=[SimpleDevice(_id=i + 1, _os=os_) for i, os_ in enumerate(oses)])
+    sim.set_metrics(LatencyMetrics())
+    arrivals = [workload(jobs, seed + i) for i in range(devices)]
+    at = [0] * devices
+    total = devices * jobs
+
+    start = time.perf_counter()
+    while sim.completed_count < total:
+        now = sim.time + 1
+        for i, jobs_i in enumerate(arrivals):
+            while at[i] < len(jobs_i) and jobs_i[at[i]][0] <= now:
+                _, cpu_time, priority = jobs_i[at[i]]
+                oses[i].create_process(cpu_time=cpu_time, mem_required=1, priority=priority)
+                at[i] += 1
+        sim.step()
+    elapsed = time.perf_counter() - start
+    return sim.metrics.summary(per_device=False)["cluster"], sim.time / elapsed
+
+
+def main() -> None:
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    quantum = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    switch_cost = int(sys.argv[5]) if len(sys.argv) > 5 else 0
+
+    print(f"{devices} devices x {jobs} jobs, seed {seed}, quantum {quantum}, switch cost {switch_cost}")
+    print(f"{'scheduler':>9} | {'wait mean/p50/p95/p99':>24} | {'turnaround mean/p50/p95/p99':>28} | {'steps/s':>8}")
+    print("-" * 79)
+    for kind in SCHEDULERS:
+        summary, rate = run(kind, devices, jobs, seed, quantum, switch_cost)
+        cols = [
+            "/".join(str(round(d[k])) for k in ("mean", "p50", "p95", "p99"))
+            for d in (summary["wait"], summary["turnaround"])
+        ]
+        print(f"{kind:>9} | {cols[0]:>24} | {cols[1]:>28} | {rate:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
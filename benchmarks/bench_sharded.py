@@ -0,0 +1,71 @@
+"""
+Scaling benchmark: steps/second of ShardedSimulationEngine from 1 to N
+workers on the same cluster, next to the single-process SimulationEngine.
+
+    python benchmarks/bench_sharded.py [DEVICES] [PROCS_PER_DEVICE] [STEPS]
+"""
+import os
+import sys
+import pathlib
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
+
+from os_sim.application.devices.simple_device import SimpleDevice
+from os_sim.application.ipc.simple_bus import SimpleMessageBus
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator
+from os_sim.application.simulation.random_failure import RandomFailureStrategy
+from os_sim.application.simulation.sharded_engine import ShardedSimulationEngine
+
+
+def build(num_devices: int, procs_per_device: int) -> SimulationEngine:
+    devices = []
+    for dev_id in range(1, num_devices + 1):
+        os_ = BasicOperatingSystem(
+            memory=SimpleMemoryManager(_total=procs_per_device * 8),
+            scheduler=RoundRobinScheduler(),
+        )
+        for i in range(procs_per_device):
+            os_.create_process(cpu_time=5 + (i * 7 + dev_id) % 40, mem_required=1 + i % 6)
+        devices.append(SimpleDevice(_id=dev_id, _os=os_))
+    return SimulationEngine(
+        devices=devices,
+        task_migrator=HeapTaskMigrator(imbalance_threshold=2, max_moves=4),
+        failure_strategy=RandomFailureStrategy(fail_probability=0.01, recovery_delay=3, seed=1),
+        message_bus=SimpleMessageBus(),
+    )
+
+
+def timed(sim, steps: int) -> float:
+    start = time.perf_counter()
+    for _ in range(steps):
+        sim.step()
+    return steps / (time.perf_counter() - start)
+
+
+def main() -> None:
+    num_devices = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    procs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    print(f"{num_devices} devices x {procs} procs, {steps} steps")
+    base = timed(build(num_devices, procs), steps)
+    print(f"{'engine':>12} | {'steps/s':>9} | {'speedup':>7}")
+    print("-" * 35)
+    print(f"{'reference':>12} | {base:9.1f} | {1.0:7.2f}")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ShardedSimulationEngine.from_engine(build(num_devices, procs), workers) as sim:
+            rate = timed(sim, steps)
+        print(f"{f'{workers} workers':>12} | {rate:9.1f} | {rate / base:7.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import sys
 import pathlib
+import multiprocessing
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 SRC_DIR = BASE_DIR / "src"
@@ -9,4 +10,6 @@ from os_sim.cli.main import main
 
 
 if __name__ == "__main__":
+    # needed by the sharded engine's worker processes in frozen builds
+    multiprocessing.freeze_support()
     main()
@@ -31,5 +31,11 @@ class SimpleDevice(IDevice):
         if self._state is DeviceState.ONLINE:
             self._os.tick()
 
+    def fail(self) -> None:
+        self._state = DeviceState.FAILED
+
+    def recover(self) -> None:
+        self._state = DeviceState.ONLINE
+
     def is_alive(self) -> bool:
         return self._state is DeviceState.ONLINE
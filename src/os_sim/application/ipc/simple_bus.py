@@ -1,6 +1,7 @@
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
+from typing import Collection, Deque, Dict, List, Optional
 
 from os_sim.domain.messages import Message
 from os_sim.interfaces.ipc import IMessageBus
@@ -9,28 +10,88 @@ from os_sim.interfaces.logging import ILogger
 
 @dataclass(slots=True)
 class SimpleMessageBus(IMessageBus):
+    """
+    Message bus with one FIFO mailbox per destination device, so polling
+    costs O(mail for that device) rather than O(all pending mail).
+
+    drain_all only looks at mailboxes that got mail since they were last
+    offered; mail for a device the caller does not know is parked until
+    on_device_added() or new mail for it.
+    """
     logger: ILogger | None = None
-    _pending: List[Message] = field(default_factory=list)
+    _mailboxes: Dict[int, Deque[Message]] = field(default_factory=dict)
+    # destinations with mail drain_all has not offered yet, in arrival order
+    _fresh: Dict[int, None] = field(default_factory=dict)
+    _pending: int = 0
+    _sent: int = 0
+    _delivered: int = 0
 
     def send(self, message: Message) -> None:
-        self._pending.append(message)
+        box = self._mailboxes.get(message.to_device)
+        if box is None:
+            box = self._mailboxes[message.to_device] = deque()
+        box.append(message)
+        self._fresh[message.to_device] = None
+        self._pending += 1
+        self._sent += 1
         if self.logger:
             self.logger.log(
-                f"[IPC] {message.from_device} → {message.to_device}: {message.payload}"
+                f"[IPC] {message.from_device} → {message.to_device}: {message.payload}",
+                device=message.to_device,
             )
 
     def poll_for_device(self, device_id: int) -> List[Message]:
-        to_deliver: List[Message] = [
-            m for m in self._pending if m.to_device == device_id
-        ]
-        if not to_deliver:
+        box = self._mailboxes.pop(device_id, None)
+        self._fresh.pop(device_id, None)
+        if not box:
             return []
+        return self._take(device_id, box)
+
+    def drain_all(
+            self, device_ids: Optional[Collection[int]] = None
+    ) -> Dict[int, List[Message]]:
+        if not self._fresh:
+            return {}
+
+        fresh, self._fresh = self._fresh, {}
+        mailboxes = self._mailboxes
+        delivered: Dict[int, List[Message]] = {}
+        for device_id in fresh:
+            if device_ids is None or device_id in device_ids:
+                delivered[device_id] = self._take(device_id, mailboxes.pop(device_id))
+        return delivered
 
-        self._pending = [m for m in self._pending if m.to_device != device_id]
+    def on_device_added(self, device_id: int) -> None:
+        if device_id in self._mailboxes:
+            self._fresh[device_id] = None
 
-        if self.logger and to_deliver:
+    def _take(self, device_id: int, box: Deque[Message]) -> List[Message]:
+        to_deliver = list(box)
+        self._pending -= len(to_deliver)
+        self._delivered += len(to_deliver)
+
+        if self.logger:
             self.logger.log(
-                f"[IPC] Delivered {len(to_deliver)} messages to device {device_id}"
+                f"[IPC] Delivered {len(to_deliver)} messages to device {device_id}",
+                device=device_id,
             )
 
         return to_deliver
+
+    # ---- counters ----
+
+    @property
+    def pending_count(self) -> int:
+        return self._pending
+
+    @property
+    def fresh_count(self) -> int:
+        return len(self._fresh)
+
+    @property
+    def sent_count(self) -> int:
+        return self._sent
+
+    @property
+    def delivered_count(self) -> int:
+        return self._delivered
@@ -1,22 +1,109 @@
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
+from typing import Deque, Dict, List, Optional
 
+from os_sim.domain.log_entry import LogEntry
 from os_sim.interfaces.logging import IReadableLogger
 
 
 @dataclass(slots=True)
 class InMemoryLogger(IReadableLogger):
-    _lines: List[str] = field(default_factory=list)
+    """
+    Fixed-capacity ring buffer of LogEntry records.
+
+    Appending is O(1): the oldest entry is overwritten in place and dropped
+    from the tag/device/pid indexes, where it is always the leftmost item.
+    Each index holds entry sequence numbers in append order, so filtered
+    queries only walk the matching entries.
+    """
     _max_lines: int = 1000
+    time: int = 0
+
+    _entries: List[Optional[LogEntry]] = field(init=False)
+    _count: int = 0
+    _by_tag: Dict[str, Deque[int]] = field(default_factory=dict)
+    _by_device: Dict[int, Deque[int]] = field(default_factory=dict)
+    _by_pid: Dict[int, Deque[int]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._max_lines = max(1, self._max_lines)
+        self._entries = [None] * self._max_lines
+
+    def set_time(self, time: int) -> None:
+        self.time = time
 
-    def log(self, message: str) -> None:
-        self._lines.append(message)
-        if len(self._lines) > self._max_lines:
-            overflow = len(self._lines) - self._max_lines
-            del self._lines[:overflow]
+    def log(self, message: str, *, device: int | None = None, pid: int | None = None) -> None:
+        tag = None
+        if message.startswith("["):
+            end = message.find("]")
+            if end > 0:
+                tag = message[1:end]
+
+        seq = self._count
+        slot = seq % self._max_lines
+        old = self._entries[slot]
+        if old is not None:
+            _drop_oldest(self._by_tag, old.tag)
+            _drop_oldest(self._by_device, old.device)
+            _drop_oldest(self._by_pid, old.pid)
+
+        self._entries[slot] = LogEntry(self.time, tag, device, pid, message)
+        _index(self._by_tag, tag, seq)
+        _index(self._by_device, device, seq)
+        _index(self._by_pid, pid, seq)
+        self._count += 1
 
     def get_last(self, n: int = 20) -> List[str]:
+        return [e.message for e in self.query(n)]
+
+    def query(
+            self,
+            n: int = 20,
+            *,
+            tag: str | None = None,
+            device: int | None = None,
+            pid: int | None = None,
+    ) -> List[LogEntry]:
         if n <= 0:
             return []
-        return self._lines[-n:]
+
+        indexes = [
+            idx.get(key, ())
+            for idx, key in ((self._by_tag, tag), (self._by_device, device), (self._by_pid, pid))
+            if key is not None
+        ]
+        if not indexes:
+            first = max(0, self._count - min(n, self._max_lines))
+            return [self._entries[seq % self._max_lines] for seq in range(first, self._count)]
+
+        # walk the most selective index backwards, check the other filters
+        found: List[LogEntry] = []
+        for seq in reversed(min(indexes, key=len)):
+            e = self._entries[seq % self._max_lines]
+            if (tag is None or e.tag == tag) \
+                    and (device is None or e.device == device) \
+                    and (pid is None or e.pid == pid):
+                found.append(e)
+                if len(found) == n:
+                    break
+        found.reverse()
+        return found
+
+
+def _index(index: Dict, key, seq: int) -> None:
+    if key is None:
+        return
+    seqs = index.get(key)
+    if seqs is None:
+        seqs = index[key] = deque()
+    seqs.append(seq)
+
+
+def _drop_oldest(index: Dict, key) -> None:
+    if key is None:
+        return
+    seqs = index[key]
+    seqs.popleft()
+    if not seqs:
+        del index[key]
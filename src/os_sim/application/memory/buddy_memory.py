@@ -0,0 +1,169 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from heapq import heapify, heappop, heappush
+from typing import Dict, List, Optional, Set, Tuple
+
+from os_sim.interfaces.memory_manager import IMemoryManager
+
+
+@dataclass(slots=True)
+class BuddyMemoryManager(IMemoryManager):
+    """
+    Binary buddy allocator over the address range [0, total).
+
+    Requests are rounded up to a power-of-two multiple of `min_block` and
+    placed at the lowest free address of that size, splitting larger blocks
+    as needed; freed blocks merge with their free buddy. Both take
+    O(log total) steps. `total` need not be a power of two: the range
+    starts out as its largest aligned power-of-two blocks.
+
+    Blocks are tracked per owner, so every allocation needs one. `used`
+    counts requested memory, `reserved` the rounded block sizes.
+    """
+    _total: int
+    min_block: int = 1
+    _used: int = 0
+    _reserved: int = 0
+    # high-water mark of _used
+    _peak: int = 0
+
+    # per order: free block offsets, plus a min-heap of them for lowest-address
+    # picks; heap entries whose offset left the set are skipped lazily
+    _free: List[Set[int]] = field(init=False)
+    _heaps: List[List[int]] = field(init=False)
+    # owner -> (offset, order, requested amount)
+    _blocks: Dict[int, Tuple[int, int, int]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.min_block <= 0 or self.min_block & (self.min_block - 1):
+            raise ValueError("min_block must be a power of two")
+        units = self._total // self.min_block
+        orders = max(1, units.bit_length())
+        self._free = [set() for _ in range(orders)]
+        self._heaps = [[] for _ in range(orders)]
+        self._blocks = {}
+
+        offset = 0
+        while units:
+            order = units.bit_length() - 1
+            self._push(offset, order)
+            offset += self.min_block << order
+            units -= 1 << order
+
+    def block_size(self, amount: int) -> int:
+        """Bytes reserved for a request of `amount`."""
+        if amount <= 0:
+            return 0
+        return self.min_block << self._order(amount)
+
+    # ---- IMemoryManager ----
+
+    def can_alloc(self, amount: int) -> bool:
+        if amount <= 0:
+            return True
+        order = self._order(amount)
+        return any(self._free[order:])
+
+    def alloc(self, amount: int, owner: Optional[int] = None) -> bool:
+        if owner is None:
+            raise ValueError("BuddyMemoryManager needs an owner for every allocation")
+        if owner in self._blocks:
+            raise ValueError(f"owner {owner} already holds a block")
+        if amount <= 0:
+            self._blocks[owner] = (-1, -1, 0)
+            return True
+
+        order = self._order(amount)
+        free = self._free
+        k = order
+        while k < len(free) and not free[k]:
+            k += 1
+        if k >= len(free):
+            return False
+
+        offset = self._pop(k)
+        # split down, keeping the lower half and freeing the upper ones
+        while k > order:
+            k -= 1
+            self._push(offset + (self.min_block << k), k)
+
+        self._blocks[owner] = (offset, order, amount)
+        self._used += amount
+        if self._used > self._peak:
+            self._peak = self._used
+        self._reserved += self.min_block << order
+        return True
+
+    def free(self, amount: int, owner: Optional[int] = None) -> None:
+        block = self._blocks.pop(owner, None)
+        if block is None:
+            return
+        offset, order, requested = block
+        if order < 0:
+            return
+        self._used -= requested
+        self._reserved -= self.min_block << order
+
+        free = self._free
+        # the xor buddy is only ever free at this order when both halves
+        # lie inside one of the initial blocks, so no range check is needed
+        while order + 1 < len(free):
+            buddy = offset ^ (self.min_block << order)
+            if buddy not in free[order]:
+                break
+            free[order].remove(buddy)
+            offset = min(offset, buddy)
+            order += 1
+        self._push(offset, order)
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def peak_used(self) -> int:
+        return self._peak
+
+    @property
+    def reserved(self) -> int:
+        return self._reserved
+
+    @property
+    def largest_free_block(self) -> int:
+        for order in range(len(self._free) - 1, -1, -1):
+            if self._free[order]:
+                return self.min_block << order
+        return 0
+
+    @property
+    def fragmentation(self) -> float:
+        free_bytes = sum(len(s) << k for k, s in enumerate(self._free)) * self.min_block
+        if not free_bytes:
+            return 0.0
+        return 1.0 - self.largest_free_block / free_bytes
+
+    # ---- free lists ----
+
+    def _order(self, amount: int) -> int:
+        units = -(-amount // self.min_block)
+        return (units - 1).bit_length()
+
+    def _push(self, offset: int, order: int) -> None:
+        self._free[order].add(offset)
+        heap = self._heaps[order]
+        heappush(heap, offset)
+        if len(heap) > 2 * len(self._free[order]) + 16:
+            heap[:] = self._free[order]
+            heapify(heap)
+
+    def _pop(self, order: int) -> int:
+        heap, free = self._heaps[order], self._free[order]
+        while True:
+            offset = heappop(heap)
+            if offset in free:
+                free.remove(offset)
+                return offset
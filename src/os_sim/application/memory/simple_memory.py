@@ -1,5 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
 from os_sim.interfaces.memory_manager import IMemoryManager
 
 
@@ -7,17 +9,41 @@ from os_sim.interfaces.memory_manager import IMemoryManager
 class SimpleMemoryManager(IMemoryManager):
     _total: int
     _used: int = 0
+    # high-water mark of _used
+    _peak: int = 0
 
     def can_alloc(self, amount: int) -> bool:
         return self._used + amount <= self._total
 
-    def alloc(self, amount: int) -> bool:
+    def alloc(self, amount: int, owner: Optional[int] = None) -> bool:
         if not self.can_alloc(amount):
             return False
         self._used += amount
+        if self._used > self._peak:
+            self._peak = self._used
         return True
 
-    def free(self, amount: int) -> None:
+    def alloc_many(self, amounts: Sequence[int], first_owner: int) -> List[bool]:
+        total = sum(amounts)
+        if self._used + total <= self._total:
+            self._used += total
+            if self._used > self._peak:
+                self._peak = self._used
+            return [True] * len(amounts)
+        # does not fit as a whole: admit greedily in order
+        used, cap = self._used, self._total
+        flags = []
+        for amount in amounts:
+            ok = used + amount <= cap
+            if ok:
+                used += amount
+            flags.append(ok)
+        self._used = used
+        if used > self._peak:
+            self._peak = used
+        return flags
+
+    def free(self, amount: int, owner: Optional[int] = None) -> None:
         self._used = max(0, self._used - amount)
 
     @property
@@ -27,3 +53,8 @@ class SimpleMemoryManager(IMemoryManager):
     @property
     def used(self) -> int:
         return self._used
+
+    @property
+    def peak_used(self) -> int:
+        # a manager built with memory already in use starts at that mark
+        return max(self._peak, self._used)
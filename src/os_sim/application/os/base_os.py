@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from itertools import compress
+from typing import Callable, List, Optional, Iterable, Tuple
+
+from os_sim.application.simulation.latency_metrics import LatencyMetrics
+from os_sim.domain.pid_namespace import PidNamespace
+from os_sim.domain.process_table import NOT_RUN, ProcessRef, ProcessTable
+from os_sim.domain.states import ProcessState
+from os_sim.domain.messages import Message
+from os_sim.domain.processes import Process
+from os_sim.interfaces.operating_system import IOperatingSystem
+from os_sim.interfaces.memory_manager import IMemoryManager
+from os_sim.interfaces.logging import ILogger
+
+
+_FINISHED = ProcessState.FINISHED.value
+
+
+@dataclass(slots=True, kw_only=True)
+class TableOperatingSystem(IOperatingSystem):
+    """
+    What every OS over a ProcessTable shares: memory, pids, the inbox,
+    moving processes in and out, finishing and reaping them. Subclasses
+    own the run queues through _admit / _wake / _forget and decide what
+    runs in tick().
+    """
+    memory: IMemoryManager
+
+    logger: ILogger | None = None
+
+    device_id: int | None = None
+
+    # called with the new load whenever it or active_load changes
+    load_listener: Callable[[int], None] | None = None
+
+    # processes that ran to completion on this OS
+    finished_count: int = 0
+
+    # latency store shared with the engine; arrival / first-run / finish
+    # steps are only stamped while one is attached
+    metrics: LatencyMetrics | None = None
+
+    # ticks a process runs before going back to the scheduler; 0 = until it
+    # finishes (or a preemptive scheduler takes the CPU away)
+    quantum: int = 0
+    # ticks without progress whenever a different process gets the CPU
+    switch_cost: int = 0
+
+    # cluster-wide pids, so processes can move without changing pid; None
+    # numbers processes per device
+    pids: PidNamespace | None = None
+
+    # columnar process table
+    _table: ProcessTable = field(default_factory=ProcessTable)
+    # FINISHED / MIGRATED processes waiting to be removed from the table
+    _reap_queue: List[ProcessRef] = field(default_factory=list)
+    _next_pid: int = 1
+    _inbox: List[Message] = field(default_factory=list)
+    # BLOCKED processes, i.e. moving in through a transport
+    _blocked: int = 0
+
+    # ---- run queues, per subclass ----
+
+    @abstractmethod
+    def _admit(self, proc: ProcessRef, runnable: bool) -> None:
+        """`proc` entered the table; queue it now if `runnable`."""
+
+    def _admit_many(self, procs: List[ProcessRef]) -> None:
+        for p in procs:
+            self._admit(p, True)
+
+    @abstractmethod
+    def _wake(self, proc: ProcessRef) -> None:
+        """A BLOCKED `proc` became READY."""
+
+    @abstractmethod
+    def _forget(self, proc: ProcessRef) -> None:
+        """`proc` is being reaped."""
+
+    # ---- API IOperatingSystem ----
+
+    def create_process(self, cpu_time: int, mem_required: int, priority: int = 0) -> Optional[ProcessRef]:
+        pid = self._peek_pid()
+        if not self.memory.alloc(mem_required, pid):
+            return None
+
+        metrics = self.metrics
+        arrival = metrics.time if metrics is not None else 0
+        p = self._table.add(pid, cpu_time, mem_required, arrival=arrival, priority=priority)
+        self._take_pids(1)
+
+        self._admit(p, True)
+        self._load_changed()
+
+        return p
+
+    def create_processes(self, specs: Iterable[Tuple[int, int]]) -> List[Optional[ProcessRef]]:
+        """
+        Batch create_process: memory is reserved in one call, admitted specs
+        get a contiguous pid range and go into the table and the run queue
+        in bulk. Same outcome as creating them one by one.
+        """
+        specs = list(specs)
+        if not specs:
+            return []
+        first = self._peek_pid()
+        admitted_flags = self.memory.alloc_many([mem for _, mem in specs], first)
+        admitted = list(compress(specs, admitted_flags))
+        if not admitted:
+            return [None] * len(specs)
+
+        metrics = self.metrics
+        refs = self._table.extend(
+            first,
+            [cpu_time for cpu_time, _ in admitted],
+            [mem for _, mem in admitted],
+            arrival=metrics.time if metrics is not None else 0,
+        )
+        self._take_pids(len(refs))
+
+        self._admit_many(refs)
+        self._load_changed()
+
+        it = iter(refs)
+        return [next(it) if ok else None for ok in admitted_flags]
+
+    @property
+    def created_count(self) -> int:
+        """Processes ever created on this OS (moved-in ones not included)."""
+        return self._next_pid - 1
+
+    def _peek_pid(self) -> int:
+        return self._next_pid if self.pids is None else self.pids.next_pid
+
+    def _take_pids(self, count: int) -> None:
+        # with a shared namespace _next_pid only counts local creations
+        self._next_pid += count
+        if self.pids is not None:
+            self.pids.take(count)
+
+    def processes(self) -> ProcessTable:
+        return self._table
+
+    def get_process(self, pid: int) -> Optional[ProcessRef]:
+        return self._table.get(pid)
+
+    def count_processes(self, *states: ProcessState) -> int:
+        return self._table.count(*states)
+
+    def first_process(self, *states: ProcessState) -> Optional[ProcessRef]:
+        return self._table.first(*states)
+
+    @property
+    def load(self) -> int:
+        """Number of processes that still want CPU (not FINISHED / MIGRATED)."""
+        return len(self._table) - len(self._reap_queue)
+
+    @property
+    def active_load(self) -> int:
+        """READY / RUNNING processes, the part of `load` that can be moved away."""
+        return self.load - self._blocked
+
+    def evict_process(self, pid: int) -> Optional[ProcessRef]:
+        p = self._table.get(pid)
+        if p is None or p.state in (ProcessState.FINISHED, ProcessState.MIGRATED):
+            return None
+        if p.state is ProcessState.BLOCKED:
+            self._blocked -= 1
+        p.remaining = 0
+        p.state = ProcessState.MIGRATED
+        self._reap_queue.append(p)
+        self._load_changed()
+        return p
+
+    def adopt_process(self, proc: Process, blocked: bool = False) -> Optional[ProcessRef]:
+        pid = proc.pid
+        if pid in self._table or not self.memory.alloc(proc.mem_required, pid):
+            return None
+        p = self._table.add(
+            pid, proc.cpu_time, proc.mem_required,
+            state=ProcessState.BLOCKED if blocked else ProcessState.READY,
+            arrival=getattr(proc, "arrival", 0), priority=proc.priority,
+        )
+        p.remaining = proc.remaining
+        p.first_run = getattr(proc, "first_run", NOT_RUN)
+        p.migrations = getattr(proc, "migrations", 0) + 1
+        if blocked:
+            self._blocked += 1
+        self._admit(p, not blocked)
+        self._load_changed()
+        return p
+
+    def unblock_process(self, pid: int) -> Optional[ProcessRef]:
+        p = self._table.get(pid)
+        if p is None or p.state is not ProcessState.BLOCKED:
+            return None
+        p.state = ProcessState.READY
+        self._blocked -= 1
+        self._wake(p)
+        self._load_changed()
+        return p
+
+    def deliver_messages(self, messages: Iterable[Message]) -> None:
+        msgs = list(messages)
+        if not msgs:
+            return
+        self._inbox.extend(msgs)
+        if self.logger:
+            self.logger.log(f"[OS] Received {len(msgs)} messages", device=self.device_id)
+
+    def pending_messages(self) -> Iterable[Message]:
+        return tuple(self._inbox)
+
+    # ---- ticking helpers ----
+
+    def _process_inbox(self) -> None:
+        # only drained while there is a logger to report to
+        if self.logger:
+            self.logger.log(
+                f"[OS] Processing {len(self._inbox)} incoming messages", device=self.device_id
+            )
+            self._inbox.clear()
+
+    def _dispatched(self, proc: ProcessRef) -> None:
+        """Stamp the first run of `proc`, which just got a CPU."""
+        table = self._table
+        row = proc.row
+        if self.metrics is not None and table.first_run[row] == NOT_RUN:
+            table.first_run[row] = self.metrics.time
+
+    def _finish(self, proc: ProcessRef, row: int) -> None:
+        """`proc`, at `row` of the table, has run out of CPU time."""
+        table = self._table
+        table.state[row] = _FINISHED
+        self._reap_queue.append(proc)
+        self.finished_count += 1
+        if self.metrics is not None:
+            self.metrics.record_completion(
+                self.device_id, table.arrival[row], table.first_run[row], table.migrations[row]
+            )
+        self._load_changed()
+        if self.logger:
+            dev_info = f" on device {self.device_id}" if self.device_id is not None else ""
+            self.logger.log(
+                f"[OS] Process pid={proc.pid} finished{dev_info}",
+                device=self.device_id, pid=proc.pid,
+            )
+
+    def _load_changed(self) -> None:
+        if self.load_listener is not None:
+            self.load_listener(self.load)
+
+    def _reap(self) -> None:
+        if not self._reap_queue:
+            return
+
+        for p in self._reap_queue:
+            mem, state = p.mem_required, p.state
+            self._forget(p)
+            self._table.remove(p.pid)
+            self.memory.free(mem, p.pid)
+            if self.logger and state == ProcessState.FINISHED:
+                dev_info = f" on device {self.device_id}" if self.device_id is not None else ""
+                self.logger.log(
+                    f"[OS] Reaped {state.name.lower()} process pid={p.pid}, "
+                    f"mem={mem}{dev_info}",
+                    device=self.device_id, pid=p.pid,
+                )
+
+        self._reap_queue.clear()
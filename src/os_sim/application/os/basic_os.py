@@ -1,47 +1,52 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Iterable
+from dataclasses import dataclass
+from typing import List, Optional
 
-from os_sim.domain.processes import Process
+from os_sim.application.os.base_os import TableOperatingSystem
+from os_sim.domain.process_table import ProcessRef
 from os_sim.domain.states import ProcessState
-from os_sim.domain.messages import Message
-from os_sim.interfaces.operating_system import IOperatingSystem
 from os_sim.interfaces.scheduler import IScheduler
-from os_sim.interfaces.memory_manager import IMemoryManager
-from os_sim.interfaces.logging import ILogger
 
 
-@dataclass(slots=True)
-class BasicOperatingSystem(IOperatingSystem):
-    memory: IMemoryManager
-    scheduler: IScheduler
+_READY = ProcessState.READY.value
+# state codes of processes that no longer run
+_DONE = (ProcessState.FINISHED.value, ProcessState.MIGRATED.value)
 
-    logger: ILogger | None = None
 
-    device_id: int | None = None
+@dataclass(slots=True)
+class BasicOperatingSystem(TableOperatingSystem):
+    """Single-CPU OS: one scheduler, one running process at a time."""
+    scheduler: IScheduler
 
-    _processes: List[Process] = field(default_factory=list)
-    _current: Optional[Process] = None
-    _next_pid: int = 1
-    _inbox: List[Message] = field(default_factory=list)
+    # dispatches of a process other than the one that ran last
+    context_switches: int = 0
+    # processes sent back to the scheduler before finishing
+    preemptions: int = 0
+    # ticks spent on switch_cost
+    switch_ticks: int = 0
 
-    # ---- API IOperatingSystem ----
+    _current: Optional[ProcessRef] = None
+    # pid that held the CPU last (0: none yet), ticks of its current slice
+    # and switch ticks still to pay before it runs
+    _last_pid: int = 0
+    _slice_used: int = 0
+    _switch_left: int = 0
 
-    def create_process(self, cpu_time: int, mem_required: int) -> Optional[Process]:
-        if not self.memory.alloc(mem_required):
-            return None
+    # ---- run queue ----
 
-        p = Process(pid=self._next_pid, cpu_time=cpu_time, mem_required=mem_required)
-        self._next_pid += 1
+    def _admit(self, proc: ProcessRef, runnable: bool) -> None:
+        if runnable:
+            self.scheduler.add(proc)
 
-        self._processes.append(p)
-        self.scheduler.add(p)
+    def _admit_many(self, procs: List[ProcessRef]) -> None:
+        self.scheduler.add_many(procs)
 
-        return p
+    def _wake(self, proc: ProcessRef) -> None:
+        self.scheduler.add(proc)
 
-    def processes(self) -> Iterable[Process]:
-        return tuple(self._processes)
+    def _forget(self, proc: ProcessRef) -> None:
+        self.scheduler.remove(proc)
 
     def _pick_new_current(self) -> None:
         next_proc = self.scheduler.pick_next()
@@ -52,67 +57,74 @@ class BasicOperatingSystem(IOperatingSystem):
             self._current = None
 
     def tick(self) -> None:
-        # check income msg
-        if self._inbox and self.logger:
-            self.logger.log(f"[OS] Processing {len(self._inbox)} incoming messages")
-            self._inbox.clear()
+        if self._inbox:
+            self._process_inbox()
+
+        table = self._table
+        cur = self._current
+        row = cur.row if cur is not None else -1
 
         # if current proc is FINISHED or MIGRATED, pick a new one
-        if self._current is None or self._current.state in (ProcessState.FINISHED, ProcessState.MIGRATED):
+        if cur is None or table.state[row] in _DONE:
             self._pick_new_current()
-
-        if not self._current:
-            # remove dead procs
-            self._cleanup_finished()
-            return  # idle
-
-        if self._current.state is ProcessState.MIGRATED:
-            self._cleanup_finished()
+            cur = self._current
+            if cur is None:
+                # remove dead procs
+                self._reap()
+                return  # idle
+            row = cur.row
+            self._dispatched(cur)
+            self._slice_used = 0
+            if cur.pid != self._last_pid:
+                self._last_pid = cur.pid
+                self.context_switches += 1
+                self._switch_left = self.switch_cost
+
+        if self._switch_left:
+            # loading the process, no progress this tick
+            self._switch_left -= 1
+            self.switch_ticks += 1
+            self._reap()
             return
 
-        # execute current proc
-        self._current.remaining -= 1
-
-        if self._current.remaining <= 0:
-            self._current.state = ProcessState.FINISHED
-            if self.logger:
-                dev_info = f" on device {self.device_id}" if self.device_id is not None else ""
-                self.logger.log(
-                    f"[OS] Process pid={self._current.pid} finished"
-                    f"{dev_info}"
-                )
+        # execute current proc, straight on its table row
+        table.remaining[row] -= 1
+
+        if table.remaining[row] <= 0:
+            self._finish(cur, row)
             self._current = None
+        else:
+            preempt = self.scheduler.preemptive and self.scheduler.ran(cur)
+            if self.quantum:
+                self._slice_used += 1
+                preempt = preempt or self._slice_used >= self.quantum
+            if preempt:
+                # back to the scheduler, a new pick happens next tick
+                table.state[row] = _READY
+                self.preemptions += 1
+                self.scheduler.requeue(cur)
+                self._current = None
 
         # remove FINISHED procs
-        self._cleanup_finished()
-
-    def deliver_messages(self, messages: Iterable[Message]) -> None:
-        msgs = list(messages)
-        if not msgs:
-            return
-        self._inbox.extend(msgs)
-        if self.logger:
-            self.logger.log(f"[OS] Received {len(msgs)} messages")
-
-    def pending_messages(self) -> Iterable[Message]:
-        return tuple(self._inbox)
-
-    def _cleanup_finished(self) -> None:
-        if not self._processes:
-            return
+        self._reap()
+
+    def next_event_in(self) -> Optional[int]:
+        if self._reap_queue or (self._inbox and self.logger):
+            return 1
+        cur = self._current
+        if cur is None or cur.state in (ProcessState.FINISHED, ProcessState.MIGRATED):
+            # BLOCKED processes wait for an unblock_process() from outside
+            table = self._table
+            return 1 if len(table) > table.count(ProcessState.BLOCKED) else None
+        if self.scheduler.preemptive or self._switch_left:
+            # any tick may switch processes
+            return 1
+        if self.quantum:
+            return max(1, min(cur.remaining, self.quantum - self._slice_used))
+        return max(1, cur.remaining)
+
+    def fast_forward(self, ticks: int) -> None:
+        if self._current is not None:
+            self._current.remaining -= ticks
+            self._slice_used += ticks
 
-        alive: list[Process] = []
-        for p in self._processes:
-            if p.state in (ProcessState.FINISHED, ProcessState.MIGRATED):
-                self.scheduler.remove(p)
-                self.memory.free(p.mem_required)
-                if self.logger and p.state == ProcessState.FINISHED:
-                    dev_info = f" on device {self.device_id}" if self.device_id is not None else ""
-                    self.logger.log(
-                        f"[OS] Reaped {p.state.name.lower()} process pid={p.pid}, "
-                        f"mem={p.mem_required}{dev_info}"
-                    )
-            else:
-                alive.append(p)
-
-        self._processes = alive
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from os_sim.application.os.base_os import TableOperatingSystem
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.domain.process_table import ProcessRef, ProcessTable
+from os_sim.domain.states import ProcessState
+from os_sim.interfaces.scheduler import IScheduler
+from os_sim.interfaces.memory_manager import IMemoryManager
+
+
+_READY = ProcessState.READY.value
+# state codes of processes that no longer run
+_DONE = (ProcessState.FINISHED.value, ProcessState.MIGRATED.value)
+
+
+@dataclass(slots=True)
+class Core:
+    """One CPU of a MultiCoreOperatingSystem: its run queue and what it runs."""
+    scheduler: IScheduler
+    current: Optional[ProcessRef] = None
+    # processes queued on or running on this core
+    load: int = 0
+
+    # ticks spent advancing a process
+    busy_ticks: int = 0
+    context_switches: int = 0
+    preemptions: int = 0
+    switch_ticks: int = 0
+    # processes taken from sibling run queues
+    steals: int = 0
+
+    last_pid: int = 0
+    slice_used: int = 0
+    switch_left: int = 0
+
+
+@dataclass(slots=True)
+class MultiCoreOperatingSystem(TableOperatingSystem):
+    """
+    Operating system of a device with several cores sharing one memory and
+    process table.
+
+    Every tick, each core advances its own current process by one unit,
+    with the same quantum / switch-cost rules as BasicOperatingSystem. New
+    processes are spread over the cores' run queues in turn; a core left
+    without work steals a waiting process from the sibling with the most
+    waiting before the cores run.
+    """
+    cores: List[Core]
+
+    # idle cores take waiting processes from busy siblings
+    steal: bool = True
+
+    # ticks run, the denominator of core utilisation
+    ticks: int = 0
+
+    # pid -> index of the core whose run queue holds it
+    _home: Dict[int, int] = field(default_factory=dict)
+    # core that receives the next new process
+    _place: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.cores:
+            raise ValueError("MultiCoreOperatingSystem needs at least one core")
+
+    @classmethod
+    def with_cores(
+            cls,
+            memory: IMemoryManager,
+            count: int,
+            scheduler: Callable[[], IScheduler] = RoundRobinScheduler,
+            **kwargs,
+    ) -> "MultiCoreOperatingSystem":
+        """`count` cores, each with a fresh `scheduler()` run queue."""
+        return cls(memory=memory, cores=[Core(scheduler()) for _ in range(count)], **kwargs)
+
+    # ---- run queues ----
+
+    def _admit(self, proc: ProcessRef, runnable: bool) -> None:
+        index = self._place
+        self._place = (index + 1) % len(self.cores)
+        core = self.cores[index]
+        core.load += 1
+        self._home[proc.pid] = index
+        if runnable:
+            core.scheduler.add(proc)
+
+    def _wake(self, proc: ProcessRef) -> None:
+        self.cores[self._home[proc.pid]].scheduler.add(proc)
+
+    def _forget(self, proc: ProcessRef) -> None:
+        core = self.cores[self._home.pop(proc.pid)]
+        core.scheduler.remove(proc)
+        core.load -= 1
+
+    # ---- per-core counters ----
+
+    @property
+    def context_switches(self) -> int:
+        return sum(c.context_switches for c in self.cores)
+
+    @property
+    def preemptions(self) -> int:
+        return sum(c.preemptions for c in self.cores)
+
+    @property
+    def switch_ticks(self) -> int:
+        return sum(c.switch_ticks for c in self.cores)
+
+    def utilisation(self) -> List[float]:
+        """Share of ticks each core spent advancing a process."""
+        if not self.ticks:
+            return [0.0] * len(self.cores)
+        return [c.busy_ticks / self.ticks for c in self.cores]
+
+    # ---- ticking ----
+
+    def tick(self) -> None:
+        if self._inbox:
+            self._process_inbox()
+
+        self.ticks += 1
+        if self.steal and len(self.cores) > 1:
+            self._balance()
+        table = self._table
+        for core in self.cores:
+            self._run_core(core, table)
+
+        self._reap()
+
+    def _balance(self) -> None:
+        # before anything runs, so a process a sibling has just preempted
+        # cannot run twice in one tick
+        for i, core in enumerate(self.cores):
+            if not core.load:
+                self._steal_for(i)
+
+    def _run_core(self, core: Core, table: ProcessTable) -> None:
+        cur = core.current
+        if cur is None or table.state[cur.row] in _DONE:
+            cur = self._pick(core)
+            if cur is None:
+                return
+        row = cur.row
+
+        if core.switch_left:
+            core.switch_left -= 1
+            core.switch_ticks += 1
+            return
+
+        table.remaining[row] -= 1
+        core.busy_ticks += 1
+
+        if table.remaining[row] <= 0:
+            self._finish(cur, row)
+            core.current = None
+        else:
+            sched = core.scheduler
+            preempt = sched.preemptive and sched.ran(cur)
+            if self.quantum:
+                core.slice_used += 1
+                preempt = preempt or core.slice_used >= self.quantum
+            if preempt:
+                table.state[row] = _READY
+                core.preemptions += 1
+                sched.requeue(cur)
+                core.current = None
+
+    def _pick(self, core: Core) -> Optional[ProcessRef]:
+        proc = core.scheduler.pick_next()
+        if proc is None or proc.state in (ProcessState.FINISHED, ProcessState.MIGRATED):
+            core.current = None
+            return None
+        proc.state = ProcessState.RUNNING
+        core.current = proc
+        self._dispatched(proc)
+        core.slice_used = 0
+        if proc.pid != core.last_pid:
+            core.last_pid = proc.pid
+            core.context_switches += 1
+            core.switch_left = self.switch_cost
+        return proc
+
+    def _steal_for(self, index: int) -> bool:
+        """Move one waiting process from the busiest sibling to core `index`."""
+        cores = self.cores
+        best, most = -1, 0
+        for i, c in enumerate(cores):
+            # the victim runs one of its processes next whatever happens
+            waiting = c.load - 1
+            if i != index and waiting > most:
+                best, most = i, waiting
+        if best < 0:
+            return False
+        victim = cores[best]
+        proc = victim.scheduler.steal(victim.current)
+        if proc is None:
+            return False
+        thief = cores[index]
+        victim.load -= 1
+        thief.load += 1
+        thief.steals += 1
+        self._home[proc.pid] = index
+        thief.scheduler.add(proc)
+        return True
+
+    def next_event_in(self) -> Optional[int]:
+        if self._reap_queue or (self._inbox and self.logger):
+            return 1
+        table = self._table
+        running = 0
+        best: Optional[int] = None
+        for core in self.cores:
+            cur = core.current
+            if cur is None or table.state[cur.row] in _DONE:
+                continue
+            running += 1
+            if core.scheduler.preemptive or core.switch_left:
+                return 1
+            ticks = cur.remaining
+            if self.quantum:
+                ticks = min(ticks, self.quantum - core.slice_used)
+            if best is None or ticks < best:
+                best = ticks
+        if len(table) - table.count(ProcessState.BLOCKED) > running:
+            # a waiting process and (being waiting) a core that will pick it
+            return 1
+        return None if best is None else max(1, best)
+
+    def fast_forward(self, ticks: int) -> None:
+        self.ticks += ticks
+        for core in self.cores:
+            if core.current is not None:
+                core.current.remaining -= ticks
+                core.slice_used += ticks
+                core.busy_ticks += ticks
@@ -0,0 +1,127 @@
+from __future__ import annotations
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from heapq import heapify, heappop, heappush
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
+
+from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
+from os_sim.interfaces.scheduler import IScheduler
+
+_DONE = (ProcessState.FINISHED, ProcessState.MIGRATED)
+
+
+@dataclass(slots=True)
+class _KeyedHeapScheduler(IScheduler):
+    """
+    Ready queue ordered by `_key(proc)`, FIFO among equal keys.
+
+    pick_next pops the process it hands out; the OS gives it back through
+    requeue() when it is preempted. Removal is lazy: the heap entry stays
+    until it reaches the top or stale entries outnumber live ones. add,
+    pick and remove are O(log n) amortized.
+    """
+    preemptive: ClassVar[bool] = True
+
+    # (key, seq, pid); an entry is live while _queued[pid] has its seq
+    _heap: List[Tuple[int, int, int]] = field(default_factory=list)
+    _queued: Dict[int, Tuple[int, Process]] = field(default_factory=dict)
+    _seq: int = 0
+
+    @abstractmethod
+    def _key(self, proc: Process) -> int:
+        """Ordering key of `proc`, lower runs first."""
+
+    def add(self, proc: Process) -> None:
+        self._seq += 1
+        self._queued[proc.pid] = (self._seq, proc)
+        heappush(self._heap, (self._key(proc), self._seq, proc.pid))
+
+    def add_many(self, procs: Iterable[Process]) -> None:
+        procs = list(procs)
+        if len(procs) < len(self._heap):
+            for p in procs:
+                self.add(p)
+            return
+        # a batch at least as big as the heap: append and re-heapify
+        seq, queued, key = self._seq, self._queued, self._key
+        entries = []
+        for p in procs:
+            seq += 1
+            queued[p.pid] = (seq, p)
+            entries.append((key(p), seq, p.pid))
+        self._seq = seq
+        self._heap.extend(entries)
+        heapify(self._heap)
+
+    def pick_next(self) -> Optional[Process]:
+        heap, queued = self._heap, self._queued
+        while heap:
+            _, seq, pid = heappop(heap)
+            entry = queued.get(pid)
+            if entry is None or entry[0] != seq:
+                continue
+            del queued[pid]
+            proc = entry[1]
+            # evicted but not yet reaped
+            if proc.state in _DONE:
+                continue
+            return proc
+        return None
+
+    def remove(self, proc: Process) -> None:
+        if self._queued.pop(proc.pid, None) is not None:
+            self._maybe_compact()
+
+    def ran(self, proc: Process) -> bool:
+        top = self._peek_key()
+        return top is not None and top < self._key(proc)
+
+    def requeue(self, proc: Process) -> None:
+        self.add(proc)
+
+    def steal(self, running: Optional[Process]) -> Optional[Process]:
+        # the running process is not queued; hand out what would run next
+        return self.pick_next()
+
+    def _peek_key(self) -> Optional[int]:
+        heap, queued = self._heap, self._queued
+        while heap:
+            key, seq, pid = heap[0]
+            entry = queued.get(pid)
+            if entry is not None and entry[0] == seq:
+                return key
+            heappop(heap)
+        return None
+
+    def _maybe_compact(self) -> None:
+        heap, queued = self._heap, self._queued
+        if len(heap) > 32 and len(heap) > 2 * len(queued):
+            self._heap = [e for e in heap if queued.get(e[2], (None,))[0] == e[1]]
+            heapify(self._heap)
+
+    def queued(self) -> int:
+        return len(self._queued)
+
+
+@dataclass(slots=True)
+class PriorityScheduler(_KeyedHeapScheduler):
+    """
+    Static priorities, lower `priority` first, round-robin among equals.
+    The running process is preempted as soon as a more urgent one is ready;
+    low priorities can starve (MLFQScheduler does not).
+    """
+
+    def _key(self, proc: Process) -> int:
+        return proc.priority
+
+
+@dataclass(slots=True)
+class SRTFScheduler(_KeyedHeapScheduler):
+    """
+    Shortest remaining time first: the ready process with the least CPU
+    left runs, preempting the running one when a shorter job arrives.
+    """
+
+    def _key(self, proc: Process) -> int:
+        return proc.remaining
@@ -0,0 +1,106 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, List, Optional
+
+from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
+from os_sim.interfaces.scheduler import IScheduler
+
+_DONE = (ProcessState.FINISHED, ProcessState.MIGRATED)
+
+
+@dataclass(slots=True)
+class MLFQScheduler(IScheduler):
+    """
+    Multilevel feedback queue with `levels` round-robin queues.
+
+    New processes start in level 0. A process that uses up its slice
+    (`quantum` << level ticks) drops one level; the running process is also
+    preempted when a higher level has work. After every `boost_interval`
+    ticks of CPU that ended with the process still running (the ticks
+    ran() sees; finishing, idle and switch ticks are not counted; 0 =
+    never) all processes return to level 0, so long jobs cannot starve.
+    pick, add and remove are O(levels) at most.
+    """
+    preemptive: ClassVar[bool] = True
+
+    levels: int = 3
+    quantum: int = 2
+    boost_interval: int = 100
+
+    _queues: List[OrderedDict[int, Process]] = field(init=False)
+    # pid -> level, for queued and running processes
+    _level: Dict[int, int] = field(default_factory=dict)
+    # ticks the running process has used of its slice
+    _used: int = 0
+    # ran() calls since the last boost
+    _since_boost: int = 0
+
+    def __post_init__(self) -> None:
+        if self.levels < 1 or self.quantum < 1:
+            raise ValueError("MLFQScheduler needs levels >= 1 and quantum >= 1")
+        self._queues = [OrderedDict() for _ in range(self.levels)]
+
+    def slice_of(self, level: int) -> int:
+        return self.quantum << level
+
+    def add(self, proc: Process) -> None:
+        self._level[proc.pid] = 0
+        self._queues[0][proc.pid] = proc
+
+    def pick_next(self) -> Optional[Process]:
+        for queue in self._queues:
+            while queue:
+                pid, proc = queue.popitem(last=False)
+                if proc.state in _DONE:
+                    # evicted but not yet reaped
+                    self._level.pop(pid, None)
+                    continue
+                self._used = 0
+                return proc
+        return None
+
+    def remove(self, proc: Process) -> None:
+        level = self._level.pop(proc.pid, None)
+        if level is not None:
+            self._queues[level].pop(proc.pid, None)
+
+    def ran(self, proc: Process) -> bool:
+        self._used += 1
+        self._since_boost += 1
+        if self.boost_interval and self._since_boost >= self.boost_interval:
+            self._boost()
+        level = self._level.get(proc.pid, 0)
+        if self._used >= self.slice_of(level):
+            if level + 1 < self.levels:
+                self._level[proc.pid] = level + 1
+            return True
+        queues = self._queues
+        return any(queues[i] for i in range(level))
+
+    def requeue(self, proc: Process) -> None:
+        self._queues[self._level.get(proc.pid, 0)][proc.pid] = proc
+
+    def steal(self, running: Optional[Process]) -> Optional[Process]:
+        # longest-waiting process of the lowest non-empty level; the running
+        # one is not queued, and _used belongs to it, so it is left alone
+        for queue in reversed(self._queues):
+            while queue:
+                pid, proc = queue.popitem(last=False)
+                del self._level[pid]
+                if proc.state not in _DONE:
+                    return proc
+        return None
+
+    def _boost(self) -> None:
+        self._since_boost = 0
+        top = self._queues[0]
+        for queue in self._queues[1:]:
+            top.update(queue)
+            queue.clear()
+        for pid in self._level:
+            self._level[pid] = 0
+
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues)
@@ -1,24 +1,63 @@
 from __future__ import annotations
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Callable, Iterable, Optional
 from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
 from os_sim.interfaces.scheduler import IScheduler
 
 
 @dataclass(slots=True)
 class RoundRobinScheduler(IScheduler):
-    _queue: List[Process] = field(default_factory=list)
+    """
+    Round-robin run queue keyed by pid.
+
+    The head of the queue is rotated to the tail on every pick and any entry
+    can be dropped by pid, all in O(1).
+    """
+    _queue: OrderedDict[int, Optional[Process]] = field(default_factory=OrderedDict)
+    # builds the entry of a pid queued without one (None), so a restored
+    # queue need not hold an object per process up front
+    _resolve: Callable[[int], Process] | None = None
 
     def add(self, proc: Process) -> None:
-        self._queue.append(proc)
+        self._queue[proc.pid] = proc
+
+    def add_many(self, procs: Iterable[Process]) -> None:
+        self._queue.update((p.pid, p) for p in procs)
 
     def pick_next(self) -> Optional[Process]:
         if not self._queue:
             return None
-        proc = self._queue.pop(0)
-        self._queue.append(proc)
+        pid = next(iter(self._queue))
+        self._queue.move_to_end(pid)
+        proc = self._queue[pid]
+        if proc is None:
+            proc = self._queue[pid] = self._resolve(pid)
         return proc
 
     def remove(self, proc: Process) -> None:
-        if proc in self._queue:
-            self._queue.remove(proc)
+        self.remove_pid(proc.pid)
+
+    def remove_pid(self, pid: int) -> Optional[Process]:
+        if pid not in self._queue:
+            return None
+        proc = self._queue.pop(pid)
+        return proc if proc is not None else self._resolve(pid)
+
+    def steal(self, running: Optional[Process]) -> Optional[Process]:
+        # the head waited longest; the running process sits at the tail
+        skip = running.pid if running is not None else None
+        for pid, proc in self._queue.items():
+            if proc is None:
+                proc = self._resolve(pid)
+            if pid != skip and proc.state is ProcessState.READY:
+                break
+        else:
+            return None
+        self._queue.pop(pid)
+        return proc
+
+    def queued(self) -> int:
+        """Processes waiting in the run queue (the running one excluded)."""
+        return len(self._queue)
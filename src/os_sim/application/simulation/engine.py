@@ -1,12 +1,17 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
 
 from os_sim.interfaces.device import IDevice
 from os_sim.interfaces.task_migrator import ITaskMigrator
 from os_sim.interfaces.failure_strategy import IFailureStrategy
 from os_sim.interfaces.ipc import IMessageBus
 from os_sim.interfaces.logging import ILogger
+from os_sim.interfaces.workload import IWorkload
+from os_sim.application.simulation.latency_metrics import LatencyMetrics
+from os_sim.application.simulation.profiler import StepProfiler, StepSample
+from os_sim.application.simulation.transport import ProcessTransport
 
 
 @dataclass(slots=True)
@@ -16,23 +21,160 @@ class SimulationEngine:
     failure_strategy: Optional[IFailureStrategy] = None
     message_bus: Optional[IMessageBus] = None
     logger: Optional[ILogger] = None
+    # process arrivals injected at the start of every step
+    workload: Optional[IWorkload] = None
 
     time: int = 0
+    # skip runs of steps in which nothing but CPU burn-down happens
+    event_driven: bool = False
+    # per-phase timings and counters of every step, when set
+    profiler: Optional[StepProfiler] = None
+    # per-process latency store shared with every OS that has a `metrics` slot
+    metrics: Optional[LatencyMetrics] = None
+    # identity-preserving migration, see set_transport
+    transport: Optional[ProcessTransport] = None
+    # finished_count of removed devices, see completed_count
+    _completed_on_removed: int = 0
+    # device id -> device, for message delivery and remove_device
+    _by_id: Dict[int, IDevice] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for d in self.devices:
+            _check_pids(d, self.transport)
+            self._by_id[d.id] = d
+            if self.task_migrator:
+                self.task_migrator.on_device_added(d)
+            if self.failure_strategy:
+                self.failure_strategy.on_device_added(d, self.time)
+            if self.workload:
+                self.workload.on_device_added(d)
+            self._attach_metrics(d)
+            self._attach_pids(d)
+
+    def add_device(self, device: IDevice) -> None:
+        _check_pids(device, self.transport)
+        self.devices.append(device)
+        self._by_id[device.id] = device
+        if self.message_bus:
+            self.message_bus.on_device_added(device.id)
+        if self.task_migrator:
+            self.task_migrator.on_device_added(device)
+        if self.failure_strategy:
+            self.failure_strategy.on_device_added(device, self.time)
+        if self.workload:
+            self.workload.on_device_added(device)
+        self._attach_metrics(device)
+        self._attach_pids(device)
+
+    def set_workload(self, workload: Optional[IWorkload]) -> None:
+        """Attach (or detach) a workload after construction."""
+        self.workload = workload
+        if workload:
+            for d in self.devices:
+                workload.on_device_added(d)
+
+    def set_metrics(self, metrics: Optional[LatencyMetrics]) -> None:
+        """Attach (or detach) a latency store after construction."""
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.time = self.time
+        for d in self.devices:
+            self._attach_metrics(d)
+
+    def _attach_metrics(self, device: IDevice) -> None:
+        os_ = device.os()
+        if hasattr(os_, "metrics"):
+            os_.metrics = self.metrics
+
+    def set_transport(self, transport: ProcessTransport) -> None:
+        """
+        Move processes with `transport` from now on: every OS with a `pids`
+        slot draws from its namespace and the migrator hands moves to it.
+        OSes must either share that namespace already or not have created
+        any process yet, otherwise their pids could clash across devices.
+        """
+        for d in self.devices:
+            _check_pids(d, transport)
+        self.transport = transport
+        transport.time = self.time
+        if hasattr(self.task_migrator, "transport"):
+            self.task_migrator.transport = transport
+        for d in self.devices:
+            self._attach_pids(d)
+
+    def _attach_pids(self, device: IDevice) -> None:
+        os_ = device.os()
+        if self.transport is not None and hasattr(os_, "pids"):
+            os_.pids = self.transport.pids
+
+    def remove_device(self, device_id: int) -> Optional[IDevice]:
+        d = self.devices_by_id().pop(device_id, None)
+        if d is None:
+            return None
+        self.devices.remove(d)
+        self._completed_on_removed += getattr(d.os(), "finished_count", 0)
+        if self.task_migrator:
+            self.task_migrator.on_device_removed(device_id)
+        if self.failure_strategy:
+            self.failure_strategy.on_device_removed(device_id)
+        if self.workload:
+            self.workload.on_device_removed(device_id)
+        if self.transport:
+            self.transport.on_device_removed(device_id)
+        return d
+
+    def devices_by_id(self) -> Dict[int, IDevice]:
+        """Device id -> device, rebuilt if `devices` grew or shrank behind add/remove_device."""
+        if len(self._by_id) != len(self.devices):
+            self._by_id = {d.id: d for d in self.devices}
+        return self._by_id
+
+    def _deliver_messages(self) -> int:
+        by_id = self.devices_by_id()
+        delivered = 0
+        for dev_id, inbox in self.message_bus.drain_all(by_id).items():
+            by_id[dev_id].os().deliver_messages(inbox)
+            delivered += len(inbox)
+        return delivered
+
+    @property
+    def completed_count(self) -> int:
+        """Processes that ran to completion, on any device ever attached."""
+        return self._completed_on_removed + sum(
+            getattr(d.os(), "finished_count", 0) for d in self.devices
+        )
+
+    @property
+    def failure_count(self) -> int:
+        return getattr(self.failure_strategy, "failure_count", 0)
+
+    @property
+    def total_moves(self) -> int:
+        return getattr(self.task_migrator, "total_moves", 0)
 
     def step(self) -> None:
+        if self.profiler is not None:
+            self._profiled_step(self.profiler)
+            return
         self.time += 1
+        if self.metrics is not None:
+            self.metrics.time = self.time
         if self.logger:
+            self.logger.set_time(self.time)
             self.logger.log(f"[SIM] === Step t={self.time} ===")
 
+        if self.workload:
+            self.workload.apply(self.time, self.devices)
+
         if self.failure_strategy:
             self.failure_strategy.apply(self.time, self.devices)
 
         # pass msgs
         if self.message_bus:
-            for d in self.devices:
-                inbox = self.message_bus.poll_for_device(d.id)
-                if inbox:
-                    d.os().deliver_messages(inbox)
+            self._deliver_messages()
+
+        if self.transport:
+            self.transport.land(self.time)
 
         # tick devices
         for d in self.devices:
@@ -41,3 +183,149 @@ class SimulationEngine:
         # migrate tasks
         if self.task_migrator:
             self.task_migrator.rebalance(self.devices)
+
+    def _profiled_step(self, prof: StepProfiler) -> None:
+        """step() with every phase and device tick timed."""
+        start = perf_counter()
+        created, finished = self._process_totals()
+        failures, moves = self.failure_count, self.total_moves
+
+        self.time += 1
+        if self.metrics is not None:
+            self.metrics.time = self.time
+        if self.logger:
+            self.logger.set_time(self.time)
+            self.logger.log(f"[SIM] === Step t={self.time} ===")
+
+        tw = perf_counter()
+        if self.workload:
+            self.workload.apply(self.time, self.devices)
+
+        t0 = perf_counter()
+        if self.failure_strategy:
+            self.failure_strategy.apply(self.time, self.devices)
+
+        t1 = perf_counter()
+        delivered = 0
+        if self.message_bus:
+            delivered = self._deliver_messages()
+
+        t2 = perf_counter()
+        # landings count as device tick time
+        if self.transport:
+            self.transport.land(self.time)
+
+        device_time, device_ticks = prof.device_time, prof.device_ticks
+        slowest, slowest_id = 0.0, -1
+        for d in self.devices:
+            t = perf_counter()
+            d.tick()
+            dt = perf_counter() - t
+            dev_id = d.id
+            device_time[dev_id] = device_time.get(dev_id, 0.0) + dt
+            device_ticks[dev_id] = device_ticks.get(dev_id, 0) + 1
+            if dt > slowest:
+                slowest, slowest_id = dt, dev_id
+
+        t3 = perf_counter()
+        if self.task_migrator:
+            self.task_migrator.rebalance(self.devices)
+        t4 = perf_counter()
+
+        created_after, finished_after = self._process_totals()
+        prof.record(StepSample(
+            time=self.time,
+            workload_s=t0 - tw,
+            failures_s=t1 - t0,
+            messages_s=t2 - t1,
+            ticks_s=t3 - t2,
+            rebalance_s=t4 - t3,
+            # includes the counter bookkeeping around the phases
+            total_s=perf_counter() - start,
+            slowest_device=slowest_id,
+            slowest_tick_s=slowest,
+            messages=delivered,
+            created=created_after - created,
+            finished=finished_after - finished,
+            migrated=self.total_moves - moves,
+            failures=self.failure_count - failures,
+        ))
+
+    def _process_totals(self) -> Tuple[int, int]:
+        created = finished = 0
+        for d in self.devices:
+            os_ = d.os()
+            created += getattr(os_, "created_count", 0)
+            finished += getattr(os_, "finished_count", 0)
+        return created, finished
+
+    def run(self, steps: int) -> None:
+        """
+        Advance by `steps` steps. In event-driven mode, stretches where every
+        device just burns down its current process are applied in bulk; the
+        state at the target time is the same as stepping one by one.
+        """
+        target = self.time + steps
+        while self.time < target:
+            self.step()
+            if not self.event_driven or self.time >= target:
+                continue
+            next_event = self.next_event_time()
+            skip = (target if next_event is None else min(next_event - 1, target)) - self.time
+            if skip > 0:
+                self._fast_forward(skip)
+
+    def next_event_time(self) -> Optional[int]:
+        """Earliest step at which something other than CPU burn-down happens."""
+        now = self.time
+        # mail parked for unknown devices waits for add_device, not for a step
+        if self.message_bus and self.message_bus.fresh_count:
+            return now + 1
+        if self.task_migrator and not self.task_migrator.is_settled():
+            return now + 1
+
+        next_event: Optional[int] = None
+        if self.failure_strategy:
+            next_event = self.failure_strategy.next_event_time(now, self.devices)
+            if next_event == now + 1:
+                return next_event
+        if self.transport:
+            landing = self.transport.next_event_time()
+            if landing is not None and (next_event is None or landing < next_event):
+                next_event = landing
+                if landing == now + 1:
+                    return next_event
+        if self.workload:
+            arrival = self.workload.next_event_time(now)
+            if arrival is not None and (next_event is None or arrival < next_event):
+                next_event = arrival
+                if arrival == now + 1:
+                    return next_event
+
+        for d in self.devices:
+            if not d.is_alive():
+                continue
+            ticks = d.os().next_event_in()
+            if ticks is not None and (next_event is None or now + ticks < next_event):
+                next_event = now + ticks
+                if ticks == 1:
+                    break
+        return next_event
+
+    def _fast_forward(self, ticks: int) -> None:
+        self.time += ticks
+        for d in self.devices:
+            if d.is_alive():
+                d.os().fast_forward(ticks)
+
+
+def _check_pids(device: IDevice, transport: Optional[ProcessTransport]) -> None:
+    """An OS that numbered processes on its own cannot join a shared pid namespace."""
+    os_ = device.os()
+    if transport is None or not hasattr(os_, "pids"):
+        return
+    if os_.pids is not transport.pids and os_.created_count:
+        raise ValueError(
+            f"device {device.id} numbered {os_.created_count} processes outside the "
+            f"transport's pid namespace; create its OS with pids=transport.pids"
+        )
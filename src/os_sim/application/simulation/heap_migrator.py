@@ -0,0 +1,186 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import partial
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from os_sim.interfaces.task_migrator import ITaskMigrator
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.operating_system import IOperatingSystem
+from os_sim.application.simulation.migration import device_loads, move_first_active, sync_devices
+from os_sim.application.simulation.transport import ProcessTransport
+
+
+@dataclass(slots=True)
+class RebalanceReport:
+    moves: int = 0
+    # max - min load among alive devices once rebalancing stopped
+    imbalance: int = 0
+
+
+@dataclass(slots=True)
+class LoadIndex:
+    """
+    Per-device loads kept in lazily-invalidated min/max heaps.
+
+    Each device has a `load` (work it still has to run, processes moving
+    in included), which the min heap orders, and an `active` load (the part
+    that could be moved away), which the max heap orders. Entries are
+    (key, device_id) and go stale once they no longer match those dicts.
+    Devices reported dead by the `alive` callback are set aside while
+    peeking and pushed back by `release()`. Ties go to the smallest
+    device id.
+    """
+    loads: Dict[int, int] = field(default_factory=dict)
+    active: Dict[int, int] = field(default_factory=dict)
+    _min_heap: List[Tuple[int, int]] = field(default_factory=list)
+    _max_heap: List[Tuple[int, int]] = field(default_factory=list)
+    _skipped_min: List[Tuple[int, int]] = field(default_factory=list)
+    _skipped_max: List[Tuple[int, int]] = field(default_factory=list)
+
+    def set(self, device_id: int, load: int, active: Optional[int] = None) -> None:
+        """`active` defaults to the whole `load`."""
+        if active is None:
+            active = load
+        if self.loads.get(device_id) != load:
+            self.loads[device_id] = load
+            heappush(self._min_heap, (load, device_id))
+        if self.active.get(device_id) != active:
+            self.active[device_id] = active
+            heappush(self._max_heap, (-active, device_id))
+
+        # drop stale entries once they dominate the heaps
+        if len(self._min_heap) + len(self._max_heap) > 8 * len(self.loads) + 128:
+            self._min_heap = [(l, d) for d, l in self.loads.items()]
+            self._max_heap = [(-l, d) for d, l in self.active.items()]
+            heapify(self._min_heap)
+            heapify(self._max_heap)
+
+    def discard(self, device_id: int) -> None:
+        self.loads.pop(device_id, None)
+        self.active.pop(device_id, None)
+
+    def most_loaded(self, alive: Callable[[int], bool]) -> Optional[Tuple[int, int]]:
+        """(device id, active load) of the alive device with the most movable work."""
+        return self._peek(self._max_heap, -1, self.active, self._skipped_max, alive)
+
+    def least_loaded(self, alive: Callable[[int], bool]) -> Optional[Tuple[int, int]]:
+        """(device id, load) of the alive device with the least work."""
+        return self._peek(self._min_heap, 1, self.loads, self._skipped_min, alive)
+
+    def release(self) -> None:
+        """Push back the dead devices set aside by the last peeks."""
+        for entry in self._skipped_min:
+            heappush(self._min_heap, entry)
+        for entry in self._skipped_max:
+            heappush(self._max_heap, entry)
+        self._skipped_min.clear()
+        self._skipped_max.clear()
+
+    def _peek(
+            self,
+            heap: List[Tuple[int, int]],
+            sign: int,
+            values: Dict[int, int],
+            skipped: List[Tuple[int, int]],
+            alive: Callable[[int], bool],
+    ) -> Optional[Tuple[int, int]]:
+        while heap:
+            key, dev_id = heap[0]
+            if values.get(dev_id) != key * sign:
+                heappop(heap)
+                continue
+            if not alive(dev_id):
+                skipped.append(heappop(heap))
+                continue
+            return dev_id, key * sign
+        return None
+
+
+@dataclass(slots=True)
+class HeapTaskMigrator(ITaskMigrator):
+    """
+    Migrator that keeps per-device loads up to date through the OS load
+    listener and finds the most/least loaded devices with a LoadIndex, so a
+    step costs O(moves * log devices) instead of a scan of every process.
+
+    Moves go from the device with the most READY / RUNNING processes to the
+    one with the least work, processes still moving in counted. OSes
+    without a load listener are recounted on every rebalance.
+    """
+    imbalance_threshold: int = 2
+    max_moves: int = 1
+    # identity-preserving moves with transfer delay, see SimulationEngine.set_transport
+    transport: ProcessTransport | None = None
+
+    last_report: RebalanceReport = field(default_factory=RebalanceReport)
+    total_moves: int = 0
+
+    _devices: Dict[int, IDevice] = field(default_factory=dict)
+    _index: LoadIndex = field(default_factory=LoadIndex)
+    # devices whose OS has no load listener
+    _polled: Dict[int, IDevice] = field(default_factory=dict)
+
+    @property
+    def min_gap(self) -> int:
+        # a move only helps if it narrows the gap, otherwise two devices
+        # one process apart would trade it back and forth
+        return max(2, self.imbalance_threshold)
+
+    def is_settled(self) -> bool:
+        return self.last_report.moves == 0
+
+    # ---- device tracking ----
+
+    def on_device_added(self, device: IDevice) -> None:
+        os_ = device.os()
+        self._devices[device.id] = device
+        if hasattr(os_, "load_listener"):
+            os_.load_listener = partial(self._load_changed, device.id, os_)
+        else:
+            self._polled[device.id] = device
+        self._index.set(device.id, *device_loads(os_))
+
+    def on_device_removed(self, device_id: int) -> None:
+        dev = self._devices.pop(device_id, None)
+        self._polled.pop(device_id, None)
+        self._index.discard(device_id)
+        if dev is not None and hasattr(dev.os(), "load_listener"):
+            dev.os().load_listener = None
+
+    def _load_changed(self, device_id: int, os_: IOperatingSystem, load: int) -> None:
+        self._index.set(device_id, load, os_.active_load)
+
+    def _is_alive(self, device_id: int) -> bool:
+        return self._devices[device_id].is_alive()
+
+    # ---- ITaskMigrator ----
+
+    def rebalance(self, devices: Sequence[IDevice]) -> None:
+        if len(devices) != len(self._devices):
+            sync_devices(self, devices, self._devices)
+        for dev_id, dev in self._polled.items():
+            self._index.set(dev_id, *device_loads(dev.os()))
+
+        moves = 0
+        imbalance = 0
+
+        while True:
+            most = self._index.most_loaded(self._is_alive)
+            least = self._index.least_loaded(self._is_alive)
+            if most is None or least is None:
+                imbalance = 0
+                break
+
+            (src_id, max_load), (dst_id, min_load) = most, least
+            imbalance = max_load - min_load
+            if moves >= self.max_moves or imbalance < self.min_gap:
+                break
+
+            if move_first_active(self._devices[src_id], self._devices[dst_id], self.transport) is None:
+                break
+            moves += 1
+
+        self._index.release()
+        self.total_moves += moves
+        self.last_report = RebalanceReport(moves=moves, imbalance=imbalance)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from math import ceil
+from typing import Dict, Iterable, List, Optional, Sequence
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: Sequence[int], p: float) -> Optional[int]:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return None
+    rank = max(1, ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def describe(values: Iterable[int], percentiles: Sequence[float] = PERCENTILES) -> dict:
+    ordered = sorted(values)
+    out: dict = {f"p{p:g}": percentile(ordered, p) for p in percentiles}
+    out["mean"] = round(sum(ordered) / len(ordered), 3) if ordered else None
+    out["max"] = ordered[-1] if ordered else None
+    return out
+
+
+@dataclass(slots=True)
+class LatencyMetrics:
+    """
+    Completed-process latencies, one typed-array row per completion.
+
+    Shared by an engine and its operating systems: the engine moves `time`
+    forward every step, the OS stamps arrival / first-run steps into its
+    process table and records a row here when a process finishes. Times
+    are in steps; wait is first run - arrival, turnaround finish - arrival,
+    both measured from the original arrival across migrations.
+    """
+    time: int = 0
+    migration_count: int = 0
+
+    device: array = field(default_factory=lambda: array("q"))
+    arrival: array = field(default_factory=lambda: array("q"))
+    first_run: array = field(default_factory=lambda: array("q"))
+    finish: array = field(default_factory=lambda: array("q"))
+    migrations: array = field(default_factory=lambda: array("i"))
+    # device id -> processes moved off / onto it
+    moved_out: Dict[int, int] = field(default_factory=dict)
+    moved_in: Dict[int, int] = field(default_factory=dict)
+
+    def record_completion(self, device: Optional[int], arrival: int, first_run: int, migrations: int) -> None:
+        self.device.append(-1 if device is None else device)
+        self.arrival.append(arrival)
+        self.first_run.append(first_run)
+        self.finish.append(self.time)
+        self.migrations.append(migrations)
+
+    def record_migration(self, source: Optional[int], target: Optional[int]) -> None:
+        self.migration_count += 1
+        if source is not None:
+            self.moved_out[source] = self.moved_out.get(source, 0) + 1
+        if target is not None:
+            self.moved_in[target] = self.moved_in.get(target, 0) + 1
+
+    @property
+    def completed_count(self) -> int:
+        return len(self.finish)
+
+    # ---- summaries ----
+
+    def _rows(self, rows: Optional[List[int]]) -> Iterable[int]:
+        return range(len(self.finish)) if rows is None else rows
+
+    def _describe_rows(self, rows: Optional[List[int]], percentiles: Sequence[float]) -> dict:
+        arrival, first_run, finish = self.arrival, self.first_run, self.finish
+        idx = list(self._rows(rows))
+        return {
+            "completed": len(idx),
+            "wait": describe((first_run[i] - arrival[i] for i in idx), percentiles),
+            "turnaround": describe((finish[i] - arrival[i] for i in idx), percentiles),
+        }
+
+    def summary(self, percentiles: Sequence[float] = PERCENTILES, per_device: bool = True) -> dict:
+        """
+        Wait and turnaround percentiles cluster-wide, for migrated and never
+        migrated processes, and (with `per_device`) per finishing device.
+        """
+        migrated = [i for i, m in enumerate(self.migrations) if m]
+        stayed = [i for i, m in enumerate(self.migrations) if not m]
+        out = {
+            "cluster": self._describe_rows(None, percentiles),
+            "migrated": self._describe_rows(migrated, percentiles),
+            "not_migrated": self._describe_rows(stayed, percentiles),
+            "migrations": self.migration_count,
+        }
+        if per_device:
+            by_device: Dict[int, List[int]] = {}
+            for i, dev in enumerate(self.device):
+                by_device.setdefault(dev, []).append(i)
+            out["devices"] = {
+                str(dev): {
+                    **self._describe_rows(rows, percentiles),
+                    "moved_out": self.moved_out.get(dev, 0),
+                    "moved_in": self.moved_in.get(dev, 0),
+                }
+                for dev, rows in sorted(by_device.items())
+            }
+        return out
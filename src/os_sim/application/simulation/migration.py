@@ -0,0 +1,83 @@
+from __future__ import annotations
+from typing import Dict, Optional, Sequence, Tuple
+
+from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.operating_system import IOperatingSystem
+from os_sim.interfaces.task_migrator import ITaskMigrator
+from os_sim.application.simulation.transport import ProcessTransport
+
+
+def move_first_active(
+        source: IDevice, target: IDevice, transport: Optional[ProcessTransport] = None,
+) -> Optional[Tuple[Process, Process]]:
+    """
+    Move the oldest READY/RUNNING process of `source` to `target`.
+    Returns (old, new) processes, or None if nothing could be moved.
+
+    Without a transport the process is re-created on `target` under a new
+    pid and runs there from the next step; with one it keeps its pid and
+    goes through the transport's in-flight delay.
+    """
+    proc_to_move = source.os().first_process(ProcessState.READY, ProcessState.RUNNING)
+    if not proc_to_move:
+        return None
+    if transport is not None:
+        moved = transport.send(proc_to_move, source, target)
+        return None if moved is None else (proc_to_move, moved)
+
+    new_proc = target.os().create_process(
+        cpu_time=proc_to_move.remaining,
+        mem_required=proc_to_move.mem_required,
+    )
+    if not new_proc:
+        # no memory to allocate for new proc
+        return None
+    cpu_time = proc_to_move.remaining
+    # the copy keeps the original arrival / first run, so latency is
+    # measured end to end across moves
+    if hasattr(new_proc, "migrations"):
+        new_proc.arrival = proc_to_move.arrival
+        new_proc.first_run = proc_to_move.first_run
+        new_proc.migrations = proc_to_move.migrations + 1
+        new_proc.priority = proc_to_move.priority
+    source.os().evict_process(proc_to_move.pid)
+
+    metrics = getattr(target.os(), "metrics", None)
+    if metrics is not None:
+        metrics.record_migration(source.id, target.id)
+
+    os_logger = getattr(source.os(), "logger", None)
+    if os_logger:
+        os_logger.log(
+            f"[MIGRATION] moved pid={proc_to_move.pid} with cpu_time={cpu_time} "
+            f"from device {source.id} to device {target.id} "
+            f"(new pid={new_proc.pid})",
+            device=source.id, pid=proc_to_move.pid,
+        )
+    return proc_to_move, new_proc
+
+
+def device_loads(os_: IOperatingSystem) -> Tuple[int, int]:
+    """
+    (load, active_load) of `os_`: processes it still has to run, those
+    moving in included, and the READY / RUNNING ones that can be moved.
+    """
+    load = getattr(os_, "load", None)
+    if load is None:
+        load = os_.count_processes(ProcessState.READY, ProcessState.RUNNING, ProcessState.BLOCKED)
+    return load, os_.active_load
+
+
+def sync_devices(migrator: ITaskMigrator, devices: Sequence[IDevice], tracked: Dict[int, IDevice]) -> None:
+    """
+    Bring a migrator's `tracked` devices in line with `devices`, for
+    devices added to or removed from the engine list behind its hooks.
+    """
+    current = {d.id: d for d in devices}
+    for dev_id in [i for i in tracked if i not in current]:
+        migrator.on_device_removed(dev_id)
+    for dev_id, dev in current.items():
+        if tracked.get(dev_id) is not dev:
+            migrator.on_device_added(dev)
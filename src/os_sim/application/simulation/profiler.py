@@ -0,0 +1,121 @@
+from __future__ import annotations
+import csv
+import json
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields
+from typing import Deque, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class StepSample:
+    """Wall times (seconds) and counters of one SimulationEngine step."""
+    time: int
+    workload_s: float
+    failures_s: float
+    messages_s: float
+    ticks_s: float
+    rebalance_s: float
+    total_s: float
+    # device whose tick took longest this step
+    slowest_device: int
+    slowest_tick_s: float
+    messages: int
+    created: int
+    finished: int
+    migrated: int
+    failures: int
+
+
+SAMPLE_FIELDS = tuple(f.name for f in fields(StepSample))
+# fields that are aggregated (everything but the identifying ones)
+_AGGREGATED = tuple(n for n in SAMPLE_FIELDS if n not in ("time", "slowest_device"))
+
+
+@dataclass(slots=True)
+class StepProfiler:
+    """
+    Per-phase timings and counters collected by SimulationEngine.step when
+    attached as `engine.profiler`.
+
+    Keeps the last `max_samples` raw samples, aggregates over the last
+    `window` of them, and cumulative tick time per device.
+    """
+    window: int = 1000
+    max_samples: int = 100_000
+
+    samples: Deque[StepSample] = field(init=False)
+    steps: int = 0
+    # device id -> total tick seconds / ticks, over all recorded steps
+    device_time: Dict[int, float] = field(default_factory=dict)
+    device_ticks: Dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.samples = deque(maxlen=max(1, self.max_samples))
+
+    def record(self, sample: StepSample) -> None:
+        self.samples.append(sample)
+        self.steps += 1
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.steps = 0
+        self.device_time.clear()
+        self.device_ticks.clear()
+
+    # ---- aggregates ----
+
+    def aggregates(self, window: Optional[int] = None) -> dict:
+        """Mean / max / sum of every sampled field over the last `window` steps."""
+        n = min(len(self.samples), self.window if window is None else window)
+        recent = list(self.samples)[len(self.samples) - n:]
+        out: dict = {"steps": n}
+        for name in _AGGREGATED:
+            values = [getattr(s, name) for s in recent]
+            total = sum(values)
+            out[name] = {
+                "mean": total / n if n else 0.0,
+                "max": max(values, default=0),
+                "sum": total,
+            }
+        return out
+
+    def slowest_devices(self, top: int = 10) -> List[dict]:
+        """Devices by cumulative tick time, slowest first."""
+        ranked = sorted(self.device_time.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        return [
+            {
+                "device": dev_id,
+                "tick_s": seconds,
+                "ticks": self.device_ticks[dev_id],
+                "mean_tick_s": seconds / self.device_ticks[dev_id],
+            }
+            for dev_id, seconds in ranked
+        ]
+
+    # ---- export ----
+
+    def export_csv(self, path: str) -> int:
+        """Write the raw samples, one row per step; returns the row count."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(SAMPLE_FIELDS)
+            for s in self.samples:
+                writer.writerow([getattr(s, name) for name in SAMPLE_FIELDS])
+        return len(self.samples)
+
+    def export_json(self, path: str) -> int:
+        """Write aggregates, per-device totals and the raw samples."""
+        data = {
+            "aggregates": self.aggregates(),
+            "devices": self.slowest_devices(top=len(self.device_time)),
+            "samples": [asdict(s) for s in self.samples],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return len(self.samples)
+
+    def export(self, path: str) -> int:
+        """CSV for a .csv path, JSON otherwise."""
+        if path.lower().endswith(".csv"):
+            return self.export_csv(path)
+        return self.export_json(path)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Sequence, Dict
+from typing import Sequence, Dict, Optional
 import random
 
 from os_sim.interfaces.failure_strategy import IFailureStrategy
@@ -12,7 +12,13 @@ from os_sim.domain.states import DeviceState
 class RandomFailureStrategy(IFailureStrategy):
     fail_probability: float = 0.05
     recovery_delay: int = 5
+    seed: int | None = None
+    failure_count: int = 0
     _failed_at: Dict[int, int] = field(default_factory=dict)
+    _rng: random.Random = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
 
     def apply(self, time: int, devices: Sequence[IDevice]) -> None:
         # try to recover failed devices
@@ -21,11 +27,20 @@ class RandomFailureStrategy(IFailureStrategy):
                 started = self._failed_at.get(dev.id, None)
                 if started is not None and time - started >= self.recovery_delay:
                     # recover
-                    dev._state = DeviceState.ONLINE  # bad, change to dev.recover()
+                    dev.recover()
                     self._failed_at.pop(dev.id, None)
 
         # fail some devices
         for dev in devices:
-            if dev.state is DeviceState.ONLINE and random.random() < self.fail_probability:
-                dev._state = DeviceState.FAILED   # bad, change to dev.fail()
+            if dev.state is DeviceState.ONLINE and self._rng.random() < self.fail_probability:
+                dev.fail()
                 self._failed_at[dev.id] = time
+                self.failure_count += 1
+
+    def next_event_time(self, time: int, devices: Sequence[IDevice]) -> Optional[int]:
+        if self.fail_probability > 0 and any(dev.is_alive() for dev in devices):
+            # every online device rolls for failure on every step
+            return time + 1
+        if not self._failed_at:
+            return None
+        return max(time + 1, min(self._failed_at.values()) + self.recovery_delay)
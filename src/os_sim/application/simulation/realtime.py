@@ -0,0 +1,108 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Optional
+
+from os_sim.application.simulation.engine import SimulationEngine
+
+
+@dataclass(slots=True)
+class RealtimeDriver:
+    """
+    Advances an engine at `rate` steps per wall-clock second on an asyncio
+    loop.
+
+    Commands submitted with submit() run between two steps. `render` is
+    called at most `fps` times per second and only while the driver is on
+    schedule: when stepping falls behind, frames are dropped so the
+    simulation clock keeps up with the wall clock. A backlog longer than
+    `max_catch_up` steps is dropped as well (counted in `skipped_steps`).
+    """
+    sim: SimulationEngine
+    rate: float = 10.0
+    fps: float = 20.0
+    render: Optional[Callable[[SimulationEngine], None]] = None
+    max_catch_up: int = 1000
+
+    steps: int = 0
+    frames: int = 0
+    dropped_frames: int = 0
+    skipped_steps: int = 0
+    paused: bool = False
+
+    _commands: Deque[Callable[[], None]] = field(default_factory=deque)
+    _wake: Optional[asyncio.Event] = None
+    _stopped: bool = False
+
+    def submit(self, command: Callable[[], None]) -> None:
+        """Run `command` on the driver loop before the next step."""
+        self._commands.append(command)
+        if self._wake is not None:
+            self._wake.set()
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._wake is not None:
+            self._wake.set()
+
+    def set_rate(self, rate: float) -> None:
+        self.rate = rate
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """Step until stop() is called."""
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopped = False
+        next_step = next_frame = loop.time()
+        rate = self.rate
+        redraw = True
+
+        try:
+            while not self._stopped:
+                while self._commands:
+                    self._commands.popleft()()
+                    # a command changes what is on screen, show it right away
+                    redraw = True
+
+                now = loop.time()
+                if self.rate != rate:
+                    rate = self.rate
+                    next_step = now
+                if self.paused or rate <= 0:
+                    next_step = now
+
+                stepped = False
+                if not self.paused and rate > 0:
+                    behind = 0
+                    while next_step <= now and behind < self.max_catch_up:
+                        self.sim.step()
+                        self.steps += 1
+                        behind += 1
+                        next_step += 1.0 / rate
+                    if next_step <= now:
+                        self.skipped_steps += int((now - next_step) * rate) + 1
+                        next_step = now + 1.0 / rate
+                    stepped = behind > 0
+
+                if self.render is not None and (stepped or redraw):
+                    now = loop.time()
+                    if stepped and not redraw and now >= next_step:
+                        # already late for the next step, keep up instead
+                        self.dropped_frames += 1
+                    elif redraw or now >= next_frame:
+                        self.render(self.sim)
+                        self.frames += 1
+                        redraw = False
+                        next_frame = now + (1.0 / self.fps if self.fps > 0 else 0.0)
+
+                self._wake.clear()
+                timeout = None if self.paused or rate <= 0 else max(0.0, next_step - loop.time())
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wake = None
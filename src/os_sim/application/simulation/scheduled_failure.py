@@ -0,0 +1,133 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from math import log, log1p
+from typing import Dict, List, Optional, Sequence, Tuple
+import random
+
+from os_sim.interfaces.failure_strategy import IFailureStrategy
+from os_sim.interfaces.device import IDevice
+
+# recoveries sort before failures due at the same step, like in
+# RandomFailureStrategy.apply where recovered devices roll right away
+_RECOVER = 0
+_FAIL = 1
+
+
+@dataclass(slots=True)
+class ScheduledFailureStrategy(IFailureStrategy):
+    """
+    Same failure model as RandomFailureStrategy (every online device fails
+    with `fail_probability` per step and comes back `recovery_delay` steps
+    later), but driven by an event heap.
+
+    Each device's next failure step is drawn up front from the geometric
+    distribution of the per-step Bernoulli trials, so apply() only touches
+    devices with an event due. Devices are tracked through the
+    on_device_added / on_device_removed hooks.
+    """
+    fail_probability: float = 0.05
+    recovery_delay: int = 5
+    seed: int | None = None
+    failure_count: int = 0
+    # device id -> step it failed at, for devices waiting to recover
+    _failed_at: Dict[int, int] = field(default_factory=dict)
+
+    _rng: random.Random = field(init=False)
+    _devices: Dict[int, IDevice] = field(init=False)
+    # (step, kind, device id, seq); an entry is stale once `_seq` moved on
+    _heap: List[Tuple[int, int, int, int]] = field(init=False)
+    _seq: Dict[int, int] = field(init=False)
+    _next_seq: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+        self._devices = {}
+        self._heap = []
+        self._seq = {}
+        self._next_seq = 0
+
+    # ---- device tracking ----
+
+    def on_device_added(self, device: IDevice, time: int) -> None:
+        self._devices[device.id] = device
+        if device.is_alive():
+            self._schedule_failure(device.id, time + 1)
+        elif device.id in self._failed_at:
+            due = max(time + 1, self._failed_at[device.id] + self.recovery_delay)
+            self._push(due, _RECOVER, device.id)
+
+    def on_device_removed(self, device_id: int) -> None:
+        self._devices.pop(device_id, None)
+        self._seq.pop(device_id, None)
+        self._failed_at.pop(device_id, None)
+
+    def rebound(self, devices: Sequence[IDevice]) -> "ScheduledFailureStrategy":
+        """
+        A copy with the same schedule, RNG state and counters that fails and
+        recovers `devices` (same ids, e.g. another engine's views) instead.
+        """
+        copy = ScheduledFailureStrategy(
+            fail_probability=self.fail_probability,
+            recovery_delay=self.recovery_delay,
+            seed=self.seed,
+            failure_count=self.failure_count,
+            _failed_at=dict(self._failed_at),
+        )
+        copy._rng.setstate(self._rng.getstate())
+        copy._devices = {d.id: d for d in devices if d.id in self._devices}
+        copy._heap = list(self._heap)
+        copy._seq = dict(self._seq)
+        copy._next_seq = self._next_seq
+        return copy
+
+    # ---- IFailureStrategy ----
+
+    def apply(self, time: int, devices: Sequence[IDevice]) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= time:
+            _, kind, dev_id, seq = heappop(heap)
+            if self._seq.get(dev_id) != seq:
+                continue
+            del self._seq[dev_id]
+            dev = self._devices[dev_id]
+
+            if kind == _RECOVER:
+                dev.recover()
+                self._failed_at.pop(dev_id, None)
+                self._schedule_failure(dev_id, time)
+            elif dev.is_alive():
+                dev.fail()
+                self._failed_at[dev_id] = time
+                self.failure_count += 1
+                self._push(time + max(1, self.recovery_delay), _RECOVER, dev_id)
+            else:
+                # taken offline by someone else, start rolling again next step
+                self._schedule_failure(dev_id, time + 1)
+
+    def next_event_time(self, time: int, devices: Sequence[IDevice]) -> Optional[int]:
+        heap = self._heap
+        while heap and self._seq.get(heap[0][2]) != heap[0][3]:
+            heappop(heap)
+        if not heap:
+            return None
+        return max(time + 1, heap[0][0])
+
+    # ---- scheduling ----
+
+    def _schedule_failure(self, device_id: int, first: int) -> None:
+        """Draw the step of the first successful per-step roll from `first` on."""
+        p = self.fail_probability
+        if p <= 0:
+            return
+        skipped = 0
+        if p < 1:
+            # 1 - random() lies in (0, 1], so log() is defined
+            skipped = int(log(1.0 - self._rng.random()) / log1p(-p))
+        self._push(first + skipped, _FAIL, device_id)
+
+    def _push(self, due: int, kind: int, device_id: int) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq[device_id] = seq
+        heappush(self._heap, (due, kind, device_id, seq))
@@ -0,0 +1,494 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing.connection import Connection
+import multiprocessing
+from typing import Dict, List, Optional, Set, Tuple
+
+from os_sim.domain.messages import Message
+from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.failure_strategy import IFailureStrategy
+from os_sim.interfaces.ipc import IMessageBus
+from os_sim.interfaces.logging import ILogger
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator, LoadIndex
+from os_sim.application.simulation.random_failure import RandomFailureStrategy
+from os_sim.application.simulation.scheduled_failure import ScheduledFailureStrategy
+
+# (alive, load, free memory) as last reported by a shard
+DeviceStatus = Tuple[bool, int, int]
+# (pid, remaining, mem_required) of a process that may be migrated
+Candidate = Tuple[int, int, int]
+
+# keeps per-shard failure seeds apart while shard 0 reuses the base seed
+_SHARD_SEED_STRIDE = 1_000_003
+
+
+# (message, device, pid) as passed to ILogger.log
+LogLine = Tuple[str, Optional[int], Optional[int]]
+
+
+@dataclass(slots=True)
+class _LineBuffer(ILogger):
+    lines: List[LogLine] = field(default_factory=list)
+
+    def log(self, message: str, *, device: int | None = None, pid: int | None = None) -> None:
+        self.lines.append((message, device, pid))
+
+    def drain(self) -> List[LogLine]:
+        lines, self.lines = self.lines, []
+        return lines
+
+
+@dataclass(slots=True)
+class _Shard:
+    """Devices owned by one worker process."""
+    devices: List[IDevice]
+    failure_strategy: Optional[IFailureStrategy]
+    logger: Optional[_LineBuffer]
+    candidates_per_step: int
+    # last step run, devices added now start rolling for failure at time + 1
+    time: int = 0
+
+    _by_id: Dict[int, IDevice] = field(default_factory=dict)
+    _reported: Dict[int, Optional[DeviceStatus]] = field(default_factory=dict)
+    # devices whose load (and with it memory use) changed since the last report
+    _dirty: Set[int] = field(default_factory=set)
+    _index: LoadIndex = field(default_factory=LoadIndex)
+    _completed_on_removed: int = 0
+
+    def __post_init__(self) -> None:
+        for d in self.devices:
+            self._adopt(d)
+
+    def _adopt(self, device: IDevice) -> None:
+        os_ = device.os()
+        os_.logger = self.logger
+        if hasattr(os_, "load_listener"):
+            os_.load_listener = partial(self._mark_dirty, device.id)
+        self._by_id[device.id] = device
+        self._set_reported(device.id, _status(device))
+        if self.failure_strategy:
+            self.failure_strategy.on_device_added(device, self.time)
+
+    def _mark_dirty(self, device_id: int, load: int) -> None:
+        self._dirty.add(device_id)
+
+    def _set_reported(self, device_id: int, status: Optional[DeviceStatus]) -> None:
+        self._reported[device_id] = status
+        if status is not None:
+            self._index.set(device_id, status[1])
+
+    def add(self, device: IDevice) -> None:
+        self.devices.append(device)
+        self._adopt(device)
+
+    def remove(self, device_id: int) -> bool:
+        dev = self._by_id.pop(device_id, None)
+        if dev is None:
+            return False
+        self.devices.remove(dev)
+        if self.failure_strategy:
+            self.failure_strategy.on_device_removed(device_id)
+        self._completed_on_removed += getattr(dev.os(), "finished_count", 0)
+        self._reported.pop(device_id, None)
+        self._index.discard(device_id)
+        self._dirty.discard(device_id)
+        return True
+
+    def create(self, device_id: int, cpu_time: int, mem_required: int) -> Optional[int]:
+        proc = self._by_id[device_id].os().create_process(cpu_time, mem_required)
+        return proc.pid if proc else None
+
+    def counters(self) -> Tuple[int, int]:
+        """(completed processes, device failures) since the shard started."""
+        completed = self._completed_on_removed + sum(
+            getattr(d.os(), "finished_count", 0) for d in self.devices
+        )
+        return completed, getattr(self.failure_strategy, "failure_count", 0)
+
+    def step(
+            self, time: int, messages: Dict[int, List[Message]]
+    ) -> Tuple[List[Tuple[int, bool, int, int]], Dict[int, List[Candidate]], List[LogLine]]:
+        self.time = time
+        if self.failure_strategy:
+            self.failure_strategy.apply(time, self.devices)
+
+        for dev_id, inbox in messages.items():
+            self._by_id[dev_id].os().deliver_messages(inbox)
+
+        for d in self.devices:
+            d.tick()
+
+        return self._report()
+
+    def _report(self) -> Tuple[List[Tuple[int, bool, int, int]], Dict[int, List[Candidate]], List[LogLine]]:
+        reported = self._reported
+        for d in self.devices:
+            last = reported[d.id]
+            if last is None or last[0] != d.is_alive():
+                self._dirty.add(d.id)
+
+        changed: List[Tuple[int, bool, int, int]] = []
+        for dev_id in self._dirty:
+            status = _status(self._by_id[dev_id])
+            if reported[dev_id] != status:
+                self._set_reported(dev_id, status)
+                changed.append((dev_id, *status))
+        self._dirty.clear()
+
+        # a step moves at most k processes, so only this shard's k most
+        # loaded devices can be picked as sources
+        candidates: Dict[int, List[Candidate]] = {}
+        k = self.candidates_per_step
+        while len(candidates) < k:
+            top = self._index.most_loaded(
+                lambda dev_id: reported[dev_id][0] and dev_id not in candidates
+            )
+            if top is None:
+                break
+            candidates[top[0]] = _first_active(self._by_id[top[0]], k)
+        self._index.release()
+
+        lines = self.logger.drain() if self.logger else []
+        return changed, candidates, lines
+
+    def admit(
+            self, dev_id: int, cpu_time: int, mem_required: int, src_id: int, old_pid: int,
+    ) -> Optional[DeviceStatus]:
+        """
+        Re-create a migrating process on `dev_id`. Returns the device's new
+        status, or None if it could not take the process (nothing changed).
+        """
+        dev = self._by_id[dev_id]
+        new_proc = dev.os().create_process(cpu_time, mem_required)
+        if new_proc is None:
+            return None
+        status = _status(dev)
+        self._set_reported(dev_id, status)
+        if self.logger:
+            self.logger.log(
+                f"[MIGRATION] moved pid={old_pid} with cpu_time={cpu_time} "
+                f"from device {src_id} to device {dev_id} "
+                f"(new pid={new_proc.pid})",
+                device=src_id, pid=old_pid,
+            )
+        return status
+
+    def evict(self, evictions: List[Tuple[int, int]]) -> None:
+        # left to the next report: the coordinator only guessed the new status
+        for dev_id, pid in evictions:
+            self._by_id[dev_id].os().evict_process(pid)
+            self._dirty.add(dev_id)
+
+
+def _status(device: IDevice) -> DeviceStatus:
+    os_ = device.os()
+    return device.is_alive(), os_.load, os_.memory.total - os_.memory.used
+
+
+def _first_active(device: IDevice, k: int) -> List[Candidate]:
+    found: List[Candidate] = []
+    for p in device.os().processes():
+        if p.state in (ProcessState.READY, ProcessState.RUNNING):
+            found.append((p.pid, p.remaining, p.mem_required))
+            if len(found) == k:
+                break
+    return found
+
+
+def _run_shard(conn: Connection, shard: _Shard) -> None:
+    while True:
+        cmd, payload = conn.recv()
+        if cmd == "step":
+            conn.send(shard.step(*payload))
+        elif cmd == "admit":
+            conn.send(shard.admit(*payload))
+        elif cmd == "evict":
+            shard.evict(payload)
+        elif cmd == "add":
+            shard.add(payload)
+        elif cmd == "remove":
+            conn.send(shard.remove(payload))
+        elif cmd == "create":
+            conn.send(shard.create(*payload))
+        elif cmd == "snapshot":
+            conn.send(shard.devices)
+        elif cmd == "counters":
+            conn.send(shard.counters())
+        elif cmd == "close":
+            conn.close()
+            return
+
+
+@dataclass(slots=True)
+class ShardedSimulationEngine:
+    """
+    SimulationEngine split across worker processes.
+
+    Devices are partitioned into contiguous shards, one per worker. Each
+    worker applies failures, delivers IPC and ticks its own devices. The
+    coordinator routes cross-shard messages and plans migrations (same rules
+    as HeapTaskMigrator) at the end-of-step barrier. Each move is first
+    admitted by the destination's worker, which answers whether its memory
+    manager could place the process; only then is it evicted from the
+    source and counted, so a refused move ends the round as in the
+    reference engine.
+
+    Runs are deterministic for a given seed and worker count; shard i draws
+    failures from seed + i * 1_000_003, so one worker replays the
+    reference engine.
+    """
+    workers: int
+    message_bus: Optional[IMessageBus] = None
+    logger: Optional[ILogger] = None
+    # smallest load gap that triggers a migration, None disables migration
+    min_gap: Optional[int] = None
+    max_moves: int = 1
+
+    time: int = 0
+    total_moves: int = 0
+
+    # counts carried over from the engine this one was built from
+    _base_completed: int = 0
+    _base_failures: int = 0
+    _conns: List[Connection] = field(default_factory=list)
+    _procs: List[multiprocessing.Process] = field(default_factory=list)
+    _shard_of: Dict[int, int] = field(default_factory=dict)
+    _shard_sizes: List[int] = field(default_factory=list)
+    _status: Dict[int, DeviceStatus] = field(default_factory=dict)
+    _index: LoadIndex = field(default_factory=LoadIndex)
+
+    @classmethod
+    def from_engine(cls, sim: SimulationEngine, workers: int) -> "ShardedSimulationEngine":
+        """Partition a freshly built reference simulation across `workers` processes."""
+        if sim.transport is not None:
+            raise ValueError("unsupported identity-preserving migration (transport)")
+        migrator = sim.task_migrator
+        if migrator is not None and not isinstance(migrator, HeapTaskMigrator):
+            raise ValueError(f"unsupported task migrator: {type(migrator).__name__}")
+        strategy = sim.failure_strategy
+        if strategy is not None \
+                and not isinstance(strategy, (RandomFailureStrategy, ScheduledFailureStrategy)):
+            raise ValueError(f"unsupported failure strategy: {type(strategy).__name__}")
+
+        workers = max(1, min(workers, len(sim.devices) or 1))
+        engine = cls(
+            workers=workers,
+            message_bus=sim.message_bus,
+            logger=sim.logger,
+            min_gap=migrator.min_gap if migrator else None,
+            max_moves=migrator.max_moves if migrator else 0,
+            time=sim.time,
+            _base_completed=sim.completed_count - sum(
+                getattr(d.os(), "finished_count", 0) for d in sim.devices
+            ),
+            _base_failures=sim.failure_count,
+        )
+
+        for d in sim.devices:
+            if migrator is not None:
+                migrator.on_device_removed(d.id)
+
+        bounds = [len(sim.devices) * i // workers for i in range(workers + 1)]
+        ctx = multiprocessing.get_context()
+        for i in range(workers):
+            devices = list(sim.devices[bounds[i]:bounds[i + 1]])
+            failure = None
+            if strategy is not None:
+                failure = type(strategy)(
+                    fail_probability=strategy.fail_probability,
+                    recovery_delay=strategy.recovery_delay,
+                    seed=None if strategy.seed is None else strategy.seed + i * _SHARD_SEED_STRIDE,
+                )
+                failure._failed_at = {
+                    d.id: strategy._failed_at[d.id] for d in devices if d.id in strategy._failed_at
+                }
+            for d in devices:
+                engine._track(d, i)
+
+            shard = _Shard(
+                devices=devices,
+                failure_strategy=failure,
+                logger=_LineBuffer() if sim.logger else None,
+                candidates_per_step=engine.max_moves,
+                time=sim.time,
+            )
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_run_shard, args=(child, shard), daemon=True)
+            proc.start()
+            child.close()
+            engine._conns.append(parent)
+            engine._procs.append(proc)
+            engine._shard_sizes.append(len(devices))
+        return engine
+
+    def _track(self, device: IDevice, shard: int) -> None:
+        os_ = device.os()
+        os_.logger = None
+        if hasattr(os_, "load_listener"):
+            os_.load_listener = None
+        self._shard_of[device.id] = shard
+        self._set_status(device.id, _status(device))
+
+    def _set_status(self, device_id: int, status: DeviceStatus) -> None:
+        self._status[device_id] = status
+        self._index.set(device_id, status[1])
+
+    def _is_alive(self, device_id: int) -> bool:
+        return self._status[device_id][0]
+
+    # ---- simulation ----
+
+    def step(self) -> None:
+        self.time += 1
+        if self.logger:
+            self.logger.set_time(self.time)
+            self.logger.log(f"[SIM] === Step t={self.time} ===")
+
+        outgoing: List[Dict[int, List[Message]]] = [{} for _ in self._conns]
+        if self.message_bus:
+            for dev_id, inbox in self.message_bus.drain_all(self._shard_of).items():
+                outgoing[self._shard_of[dev_id]][dev_id] = inbox
+
+        for conn, messages in zip(self._conns, outgoing):
+            conn.send(("step", (self.time, messages)))
+
+        candidates: Dict[int, List[Candidate]] = {}
+        for conn in self._conns:
+            changed, shard_candidates, lines = conn.recv()
+            for dev_id, alive, load, free in changed:
+                self._set_status(dev_id, (alive, load, free))
+            candidates.update(shard_candidates)
+            if self.logger:
+                for message, device, pid in lines:
+                    self.logger.log(message, device=device, pid=pid)
+
+        if self.min_gap is not None:
+            self._rebalance(candidates)
+
+    def run(self, steps: int) -> None:
+        for _ in range(steps):
+            self.step()
+
+    def _rebalance(self, candidates: Dict[int, List[Candidate]]) -> None:
+        evictions: List[List[Tuple[int, int]]] = [[] for _ in self._conns]
+        taken: Dict[int, int] = {}
+        moves = 0
+
+        while moves < self.max_moves:
+            most = self._index.most_loaded(self._is_alive)
+            least = self._index.least_loaded(self._is_alive)
+            if most is None or least is None:
+                break
+            (src, max_load), (dst, min_load) = most, least
+            if max_load - min_load < self.min_gap:
+                break
+
+            pending = candidates.get(src, [])
+            n = taken.get(src, 0)
+            if n >= len(pending):
+                break
+            pid, remaining, mem = pending[n]
+            if mem > self._status[dst][2]:
+                # no memory to allocate for new proc
+                break
+            # free memory is only an upper bound (e.g. a fragmented buddy
+            # allocator), so the destination decides
+            conn = self._conns[self._shard_of[dst]]
+            conn.send(("admit", (dst, remaining, mem, src, pid)))
+            dst_status = conn.recv()
+            if dst_status is None:
+                break
+            taken[src] = n + 1
+
+            src_alive, _, src_free = self._status[src]
+            self._set_status(src, (src_alive, max_load - 1, src_free + mem))
+            self._set_status(dst, dst_status)
+            evictions[self._shard_of[src]].append((src, pid))
+            moves += 1
+
+        self._index.release()
+        self.total_moves += moves
+        for conn, evicts in zip(self._conns, evictions):
+            if evicts:
+                conn.send(("evict", evicts))
+
+    # ---- counters ----
+
+    def _counters(self) -> Tuple[int, int]:
+        for conn in self._conns:
+            conn.send(("counters", None))
+        completed, failures = self._base_completed, self._base_failures
+        for conn in self._conns:
+            c, f = conn.recv()
+            completed += c
+            failures += f
+        return completed, failures
+
+    @property
+    def completed_count(self) -> int:
+        return self._counters()[0]
+
+    @property
+    def failure_count(self) -> int:
+        return self._counters()[1]
+
+    # ---- cluster management ----
+
+    @property
+    def devices(self) -> List[IDevice]:
+        """Snapshot copies of every device, ordered by id (read-only)."""
+        for conn in self._conns:
+            conn.send(("snapshot", None))
+        snapshot: List[IDevice] = []
+        for conn in self._conns:
+            snapshot.extend(conn.recv())
+        snapshot.sort(key=lambda d: d.id)
+        return snapshot
+
+    def add_device(self, device: IDevice) -> None:
+        shard = min(range(len(self._conns)), key=lambda i: self._shard_sizes[i])
+        self._track(device, shard)
+        self._shard_sizes[shard] += 1
+        self._conns[shard].send(("add", device))
+        if self.message_bus:
+            self.message_bus.on_device_added(device.id)
+
+    def remove_device(self, device_id: int) -> bool:
+        shard = self._shard_of.pop(device_id, None)
+        if shard is None:
+            return False
+        self._conns[shard].send(("remove", device_id))
+        self._conns[shard].recv()
+        self._shard_sizes[shard] -= 1
+        self._status.pop(device_id, None)
+        self._index.discard(device_id)
+        return True
+
+    def create_process(self, device_id: int, cpu_time: int, mem_required: int) -> Optional[Process]:
+        shard = self._shard_of.get(device_id)
+        if shard is None:
+            return None
+        self._conns[shard].send(("create", (device_id, cpu_time, mem_required)))
+        pid = self._conns[shard].recv()
+        if pid is None:
+            return None
+        return Process(pid=pid, cpu_time=cpu_time, mem_required=mem_required)
+
+    def close(self) -> None:
+        for conn in self._conns:
+            conn.send(("close", None))
+            conn.close()
+        for proc in self._procs:
+            proc.join()
+        self._conns.clear()
+        self._procs.clear()
+
+    def __enter__(self) -> "ShardedSimulationEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import random
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from typing import Dict, Optional, Sequence
+
+from os_sim.interfaces.task_migrator import ITaskMigrator
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.operating_system import IOperatingSystem
+from os_sim.application.simulation.migration import device_loads, move_first_active, sync_devices
+from os_sim.application.simulation.transport import ProcessTransport
+
+
+@dataclass(slots=True)
+class StealReport:
+    moves: int = 0
+    # alive idle devices that tried to steal, and peers they sampled
+    thieves: int = 0
+    probes: int = 0
+
+
+@dataclass(slots=True)
+class StealingTaskMigrator(ITaskMigrator):
+    """
+    Pull-based migrator: every device whose load is at most `idle_threshold`
+    samples `samples` random peers (power-of-d choices) and, if the most
+    loaded of them is at least `min_gap` ahead, takes half the difference.
+
+    Loads come from the OS load listener and idle devices are kept in a set
+    of their own, so a step looks at no more than `max_thieves` of them and
+    moves no more than `max_moves` processes however big the cluster is.
+    Thieves cut off by either limit go first on the next step.
+
+    Idleness counts processes still moving in; victims are weighed by
+    their READY / RUNNING processes only, the ones that can be taken. OSes
+    without a load listener are recounted on every rebalance.
+    """
+    imbalance_threshold: int = 2
+    idle_threshold: int = 0
+    samples: int = 2
+    max_moves: int = 16
+    max_thieves: int = 64
+    seed: int | None = None
+    # set by SimulationEngine.set_transport
+    transport: ProcessTransport | None = None
+
+    last_report: StealReport = field(default_factory=StealReport)
+    total_moves: int = 0
+
+    _devices: Dict[int, IDevice] = field(default_factory=dict)
+    # work still to run per device (moving in included), and the movable part
+    _loads: Dict[int, int] = field(default_factory=dict)
+    _active: Dict[int, int] = field(default_factory=dict)
+    # devices with load <= idle_threshold, in the order they get to steal
+    _idle: OrderedDict[int, None] = field(default_factory=OrderedDict)
+    # devices with active load >= min_gap, the only ones worth stealing from
+    _heavy: int = 0
+    # devices whose OS has no load listener
+    _polled: Dict[int, IDevice] = field(default_factory=dict)
+    _rng: random.Random = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.samples < 1:
+            raise ValueError("StealingTaskMigrator needs samples >= 1")
+        self._rng = random.Random(self.seed)
+
+    @property
+    def min_gap(self) -> int:
+        # see HeapTaskMigrator.min_gap
+        return max(2, self.imbalance_threshold)
+
+    def is_settled(self) -> bool:
+        # a step that sampled nobody drew no random numbers either, so
+        # skipping the steps after it cannot change what later ones pick
+        return self.last_report.probes == 0
+
+    # ---- device tracking ----
+
+    def on_device_added(self, device: IDevice) -> None:
+        os_ = device.os()
+        self._devices[device.id] = device
+        if hasattr(os_, "load_listener"):
+            os_.load_listener = partial(self._load_changed, device.id, os_)
+        else:
+            self._polled[device.id] = device
+        self._set_load(device.id, *device_loads(os_))
+
+    def on_device_removed(self, device_id: int) -> None:
+        dev = self._devices.pop(device_id, None)
+        self._polled.pop(device_id, None)
+        self._loads.pop(device_id, None)
+        active = self._active.pop(device_id, None)
+        if active is not None and active >= self.min_gap:
+            self._heavy -= 1
+        self._idle.pop(device_id, None)
+        if dev is not None and hasattr(dev.os(), "load_listener"):
+            dev.os().load_listener = None
+
+    def _load_changed(self, device_id: int, os_: IOperatingSystem, load: int) -> None:
+        self._set_load(device_id, load, os_.active_load)
+
+    def _set_load(self, device_id: int, load: int, active: int) -> None:
+        gap = self.min_gap
+        old = self._active.get(device_id)
+        self._loads[device_id] = load
+        self._active[device_id] = active
+        self._heavy += (active >= gap) - (old is not None and old >= gap)
+        if load <= self.idle_threshold:
+            if device_id not in self._idle:
+                self._idle[device_id] = None
+        else:
+            self._idle.pop(device_id, None)
+
+    # ---- ITaskMigrator ----
+
+    def rebalance(self, devices: Sequence[IDevice]) -> None:
+        if len(devices) != len(self._devices):
+            sync_devices(self, devices, self._devices)
+        for dev_id, dev in self._polled.items():
+            self._set_load(dev_id, *device_loads(dev.os()))
+
+        report = StealReport()
+        self.last_report = report
+        if not self._heavy or not self._idle or len(devices) < 2:
+            return
+
+        gap, samples = self.min_gap, self.samples
+        loads, active, idle, randrange = self._loads, self._active, self._idle, self._rng.randrange
+        n = len(devices)
+        for thief_id in list(islice(idle, self.max_thieves)):
+            if report.moves >= self.max_moves:
+                break
+            idle.move_to_end(thief_id)
+            thief = self._devices[thief_id]
+            if not thief.is_alive():
+                continue
+            report.thieves += 1
+
+            victim: Optional[IDevice] = None
+            most = -1
+            for _ in range(samples):
+                peer = devices[randrange(n)]
+                load = active.get(peer.id, 0)
+                if load > most and peer.id != thief_id and peer.is_alive():
+                    victim, most = peer, load
+            report.probes += samples
+            if victim is None:
+                continue
+
+            # take half the difference, so both end up near the middle
+            gap_now = most - loads[thief_id]
+            if gap_now < gap:
+                continue
+            for _ in range(min(gap_now // 2, self.max_moves - report.moves)):
+                if move_first_active(victim, thief, self.transport) is None:
+                    break
+                report.moves += 1
+
+        self.total_moves += report.moves
@@ -0,0 +1,135 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+
+from os_sim.domain.pid_namespace import PidNamespace
+from os_sim.domain.processes import Process
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.logging import ILogger
+
+
+@dataclass(slots=True)
+class MigrationRecord:
+    """One move of a process between devices."""
+    pid: int
+    source: int
+    target: int
+    # step the move started and step from which the process can run again
+    sent: int
+    arrives: int
+    mem_required: int
+    # CPU time still to do when it left
+    remaining: int
+
+    @property
+    def delay(self) -> int:
+        """Steps lost in flight, beyond those of an instant move."""
+        return self.arrives - self.sent - 1
+
+
+@dataclass(slots=True)
+class ProcessTransport:
+    """
+    Identity-preserving migration: a moved process keeps its pid (from the
+    shared `pids` namespace) and its latency bookkeeping, and spends
+    ceil(`ticks_per_mem` * mem_required) steps in flight, BLOCKED on the
+    target device, before it can run there. Every move is kept in
+    `history`, by pid.
+
+    Attached with SimulationEngine.set_transport, which also shares `pids`
+    with the OSes and hands the transport to the task migrator.
+    """
+    ticks_per_mem: float = 0.0
+    pids: PidNamespace = field(default_factory=PidNamespace)
+    logger: ILogger | None = None
+
+    # step of the engine, updated by land()
+    time: int = 0
+    history: Dict[int, List[MigrationRecord]] = field(default_factory=dict)
+    transfers: int = 0
+    # steps spent in flight over all transfers, and CPU time that moved
+    transfer_ticks: int = 0
+    moved_cpu: int = 0
+    # processes whose target device was removed while they were in flight
+    lost: int = 0
+
+    # (arrives, seq, pid, target device)
+    _in_flight: List[Tuple[int, int, int, IDevice]] = field(default_factory=list)
+    _seq: int = 0
+
+    def delay_of(self, mem_required: int) -> int:
+        return ceil(self.ticks_per_mem * mem_required)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def send(self, proc: Process, source: IDevice, target: IDevice) -> Optional[Process]:
+        """
+        Move `proc` from `source` to `target`; the process on `target`, or
+        None if it cannot take it (pid already there, no memory).
+        """
+        moved = target.os().adopt_process(proc, blocked=True)
+        if moved is None:
+            return None
+        pid, remaining, mem = proc.pid, proc.remaining, proc.mem_required
+        source.os().evict_process(pid)
+
+        delay = self.delay_of(mem)
+        arrives = self.time + 1 + delay
+        self._seq += 1
+        heappush(self._in_flight, (arrives, self._seq, pid, target))
+        self.history.setdefault(pid, []).append(
+            MigrationRecord(pid, source.id, target.id, self.time, arrives, mem, remaining)
+        )
+        self.transfers += 1
+        self.transfer_ticks += delay
+        self.moved_cpu += remaining
+
+        metrics = getattr(target.os(), "metrics", None)
+        if metrics is not None:
+            metrics.record_migration(source.id, target.id)
+        if self.logger:
+            self.logger.log(
+                f"[MIGRATION] sending pid={pid} with cpu_time={remaining} "
+                f"from device {source.id} to device {target.id}, arrives at t={arrives}",
+                device=source.id, pid=pid,
+            )
+        return moved
+
+    def land(self, time: int) -> int:
+        """Unblock every process due by `time`; returns how many landed."""
+        self.time = time
+        landed = 0
+        heap = self._in_flight
+        while heap and heap[0][0] <= time:
+            _, _, pid, target = heappop(heap)
+            if target.os().unblock_process(pid) is not None:
+                landed += 1
+        return landed
+
+    def next_event_time(self) -> Optional[int]:
+        return self._in_flight[0][0] if self._in_flight else None
+
+    def on_device_removed(self, device_id: int) -> None:
+        kept = [e for e in self._in_flight if e[3].id != device_id]
+        self.lost += len(self._in_flight) - len(kept)
+        if len(kept) != len(self._in_flight):
+            self._in_flight = kept
+            self._in_flight.sort()
+
+    def summary(self) -> dict:
+        """Totals to weigh the CPU time moved against the steps lost moving it."""
+        moved = len(self.history)
+        return {
+            "transfers": self.transfers,
+            "processes_moved": moved,
+            "moves_per_process": round(self.transfers / moved, 3) if moved else 0.0,
+            "in_flight": self.in_flight,
+            "transfer_ticks": self.transfer_ticks,
+            "mean_delay": round(self.transfer_ticks / self.transfers, 3) if self.transfers else 0.0,
+            "moved_cpu": self.moved_cpu,
+            "lost": self.lost,
+        }
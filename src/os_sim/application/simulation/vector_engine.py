@@ -0,0 +1,649 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import random
+
+import numpy as np
+
+from os_sim.domain.messages import Message
+from os_sim.domain.processes import Process
+from os_sim.domain.states import DeviceState, ProcessState
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.ipc import IMessageBus
+from os_sim.interfaces.logging import ILogger
+from os_sim.interfaces.operating_system import IOperatingSystem
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator
+from os_sim.application.simulation.random_failure import RandomFailureStrategy
+from os_sim.application.simulation.scheduled_failure import ScheduledFailureStrategy
+from os_sim.application.simulation.simple_migrator import SimpleTaskMigrator
+
+READY = ProcessState.READY.value
+RUNNING = ProcessState.RUNNING.value
+FINISHED = ProcessState.FINISHED.value
+MIGRATED = ProcessState.MIGRATED.value
+
+_NO_ROW = -1
+_MIN_ROWS = 1024
+_MIN_DEVICES = 16
+_DEVICE_COLUMNS = (
+    "_dev_id", "_online", "_failed_at", "_mem_total", "_mem_used", "_mem_peak",
+    "_next_pid", "_current", "_load",
+)
+_PROCESS_COLUMNS = (
+    "_p_dev", "_p_pid", "_p_cpu", "_p_remaining", "_p_mem", "_p_state", "_p_live", "_p_order",
+)
+
+
+@dataclass(slots=True)
+class VectorSimulationEngine:
+    """
+    Struct-of-arrays counterpart of SimulationEngine for very large clusters.
+
+    Device state, memory and every process column live in NumPy arrays and a
+    step is a handful of vectorized passes. It models the default stack
+    (BasicOperatingSystem + RoundRobinScheduler + SimpleMemoryManager,
+    RandomFailureStrategy or ScheduledFailureStrategy, Heap/SimpleTaskMigrator)
+    and reproduces the reference engine step for step, including the failure
+    RNG stream: random failures are rolled in one vectorized draw, a failure
+    schedule is replayed through device views.
+    Per-process log lines are not emitted.
+
+    Build one with from_engine() from a reference engine, or with
+    from_specs() straight from device and process specs.
+    """
+    message_bus: Optional[IMessageBus] = None
+    logger: Optional[ILogger] = None
+
+    # RandomFailureStrategy model, None disables the per-step rolls
+    fail_probability: Optional[float] = None
+    recovery_delay: int = 5
+    # event-driven failures, applied through VectorDeviceViews; takes the
+    # place of the rolls above
+    failure_strategy: Optional[ScheduledFailureStrategy] = None
+    # migration model; min_gap is the smallest load gap that triggers a move
+    migrate: bool = False
+    min_gap: int = 2
+    max_moves: int = 1
+
+    time: int = 0
+    total_moves: int = 0
+    completed_count: int = 0
+    failure_count: int = 0
+
+    # ---- device columns: views of the first len(devices) rows of buffers
+    # that grow by doubling ----
+    _dev_id: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _online: np.ndarray = field(default_factory=lambda: np.zeros(0, np.bool_))
+    _failed_at: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _mem_total: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _mem_used: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _mem_peak: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _next_pid: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _current: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _load: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    _dev_buffers: Dict[str, np.ndarray] = field(default_factory=dict)
+    # device id -> index into the device columns
+    _idx_of: Dict[int, int] = field(default_factory=dict)
+    _inbox: Dict[int, List[Message]] = field(default_factory=dict)
+
+    # ---- process columns (rows kept in creation order) ----
+    _rows: int = 0
+    _in_table: int = 0
+    _p_dev: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int64))
+    _p_pid: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int64))
+    _p_cpu: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int64))
+    _p_remaining: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int64))
+    _p_mem: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int64))
+    _p_state: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int8))
+    _p_live: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.bool_))
+    # run-queue position: stamped on admission and again whenever the
+    # round-robin rotation moves a process to the tail of its queue
+    _p_order: np.ndarray = field(default_factory=lambda: np.zeros(_MIN_ROWS, np.int64))
+    _order_clock: int = 0
+    # FINISHED / MIGRATED rows not reaped yet
+    _reap_rows: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+
+    _rng: np.random.RandomState = field(default_factory=np.random.RandomState)
+
+    # ---- construction ----
+
+    @classmethod
+    def from_engine(cls, sim: SimulationEngine) -> "VectorSimulationEngine":
+        """Copy the current state of a reference engine into columnar form."""
+        if sim.transport is not None:
+            raise ValueError("unsupported identity-preserving migration (transport)")
+        vec = cls(
+            message_bus=sim.message_bus,
+            logger=sim.logger,
+            time=sim.time,
+            total_moves=sim.total_moves,
+            completed_count=sim.completed_count,
+            failure_count=sim.failure_count,
+        )
+
+        strategy = sim.failure_strategy
+        if isinstance(strategy, RandomFailureStrategy):
+            vec.fail_probability = strategy.fail_probability
+            vec.recovery_delay = strategy.recovery_delay
+            vec._rng = _numpy_rng(strategy._rng)
+        elif strategy is not None and not isinstance(strategy, ScheduledFailureStrategy):
+            raise ValueError(f"unsupported failure strategy: {type(strategy).__name__}")
+
+        migrator = sim.task_migrator
+        if isinstance(migrator, HeapTaskMigrator):
+            vec.migrate = True
+            vec.min_gap = migrator.min_gap
+            vec.max_moves = migrator.max_moves
+        elif isinstance(migrator, SimpleTaskMigrator):
+            vec.migrate = True
+            vec.min_gap = migrator.imbalance_threshold
+            vec.max_moves = 1
+        elif migrator is not None:
+            raise ValueError(f"unsupported task migrator: {type(migrator).__name__}")
+
+        for d in sim.devices:
+            vec.add_device(d)
+        if isinstance(strategy, (RandomFailureStrategy, ScheduledFailureStrategy)):
+            for i, dev_id in enumerate(vec._dev_id):
+                vec._failed_at[i] = strategy._failed_at.get(int(dev_id), _NO_ROW)
+        if isinstance(strategy, ScheduledFailureStrategy):
+            # attached after the devices so adding them draws no new failures
+            vec.failure_strategy = strategy.rebound(vec.devices)
+        return vec
+
+    @classmethod
+    def from_specs(
+            cls, devices: Iterable[Tuple[int, int, Sequence[Tuple[int, int]]]],
+            seed: Optional[int] = None, **settings,
+    ) -> "VectorSimulationEngine":
+        """
+        Build a cluster directly in columnar form. Each entry of `devices` is
+        (device id, memory, [(cpu_time, mem_required), ...]), admitted like
+        BasicOperatingSystem.create_processes. Failure rolls draw from the
+        stream RandomFailureStrategy(seed=seed) would; `settings` are passed
+        on to the constructor; a `failure_strategy` among them gets the
+        devices registered in order, as SimulationEngine does.
+        """
+        vec = cls(**settings)
+        vec._rng = _numpy_rng(random.Random(seed))
+        for dev_id, memory, procs in devices:
+            idx = vec._new_device(dev_id, online=True, mem_total=memory)
+            vec.create_processes(idx, procs)
+        if vec.failure_strategy is not None:
+            for view in vec.devices:
+                vec.failure_strategy.on_device_added(view, vec.time)
+        return vec
+
+    def add_device(self, device: IDevice) -> None:
+        os_ = device.os()
+        if not isinstance(os_, BasicOperatingSystem) \
+                or not isinstance(os_.scheduler, RoundRobinScheduler) \
+                or not isinstance(os_.memory, SimpleMemoryManager):
+            raise ValueError(f"device {device.id}: unsupported OS/scheduler/memory stack")
+        if os_.quantum or os_.switch_cost:
+            raise ValueError(f"device {device.id}: time quanta and switch costs are not modelled")
+
+        idx = self._new_device(
+            device.id, device.state is DeviceState.ONLINE, os_.memory.total,
+            os_.memory.used, os_.memory.peak_used, os_._next_pid, os_.load,
+        )
+
+        reaping = {p.pid for p in os_._reap_queue}
+        reap_rows: List[int] = []
+        row_of: Dict[int, int] = {}
+        for p in os_.processes():
+            row = self._append_row(idx, p.pid, p.cpu_time, p.remaining, p.mem_required, p.state.value)
+            row_of[p.pid] = row
+            if os_._current is not None and p.pid == os_._current.pid:
+                self._current[idx] = row
+            if p.pid in reaping:
+                reap_rows.append(row)
+        for pid in os_.scheduler._queue:
+            self._p_order[row_of[pid]] = self._order_clock
+            self._order_clock += 1
+        if reap_rows:
+            self._reap_rows = np.concatenate([self._reap_rows, np.array(reap_rows, np.int64)])
+
+        inbox = list(os_.pending_messages())
+        if inbox:
+            self._inbox[idx] = inbox
+        if self.message_bus:
+            self.message_bus.on_device_added(device.id)
+        if self.failure_strategy is not None:
+            self.failure_strategy.on_device_added(VectorDeviceView(self, device.id), self.time)
+
+    def _new_device(
+            self, dev_id: int, online: bool, mem_total: int, mem_used: int = 0,
+            mem_peak: int = 0, next_pid: int = 1, load: int = 0,
+    ) -> int:
+        idx = len(self._dev_id)
+        self._resize_devices(idx + 1)
+        self._dev_id[idx] = dev_id
+        self._online[idx] = online
+        self._failed_at[idx] = _NO_ROW
+        self._mem_total[idx] = mem_total
+        self._mem_used[idx] = mem_used
+        self._mem_peak[idx] = max(mem_peak, mem_used)
+        self._next_pid[idx] = next_pid
+        self._current[idx] = _NO_ROW
+        self._load[idx] = load
+        self._idx_of[dev_id] = idx
+        return idx
+
+    def _resize_devices(self, n: int) -> None:
+        buffers = self._dev_buffers
+        cap = len(buffers["_dev_id"]) if buffers else 0
+        if n > cap:
+            cap = max(n, 2 * cap, _MIN_DEVICES)
+            for name in _DEVICE_COLUMNS:
+                old = getattr(self, name)
+                new = np.zeros(cap, old.dtype)
+                new[:len(old)] = old
+                buffers[name] = new
+        for name in _DEVICE_COLUMNS:
+            setattr(self, name, buffers[name][:n])
+
+    def remove_device(self, device_id: int) -> bool:
+        idx = self._idx_of.pop(device_id, None)
+        if idx is None:
+            return False
+        if self.failure_strategy is not None:
+            self.failure_strategy.on_device_removed(device_id)
+
+        n = self._rows
+        on_dev = self._p_dev[:n] == idx
+        self._in_table -= int(np.count_nonzero(self._p_live[:n] & on_dev))
+        self._p_live[:n][on_dev] = False
+        self._reap_rows = self._reap_rows[self._p_dev[self._reap_rows] != idx]
+        self._p_dev[:n][self._p_dev[:n] > idx] -= 1
+
+        last = len(self._dev_id) - 1
+        for name in _DEVICE_COLUMNS:
+            col = getattr(self, name)
+            col[idx:last] = col[idx + 1:]
+        self._resize_devices(last)
+        for i in range(idx, last):
+            self._idx_of[int(self._dev_id[i])] = i
+        self._inbox = {(i - 1 if i > idx else i): m for i, m in self._inbox.items() if i != idx}
+        return True
+
+    def create_process(self, dev_idx: int, cpu_time: int, mem_required: int) -> Optional[int]:
+        """Admit a process on the device at `dev_idx`; returns its pid or None."""
+        if self._mem_used[dev_idx] + mem_required > self._mem_total[dev_idx]:
+            return None
+        used = self._mem_used[dev_idx] + mem_required
+        self._mem_used[dev_idx] = used
+        if used > self._mem_peak[dev_idx]:
+            self._mem_peak[dev_idx] = used
+        pid = int(self._next_pid[dev_idx])
+        self._next_pid[dev_idx] += 1
+        self._load[dev_idx] += 1
+        self._append_row(dev_idx, pid, cpu_time, cpu_time, mem_required, READY)
+        return pid
+
+    def create_processes(self, dev_idx: int, specs: Sequence[Tuple[int, int]]) -> int:
+        """
+        Batch create_process for (cpu_time, mem_required) specs: admitted in
+        order while they fit, with consecutive pids. Returns how many were.
+        """
+        if not len(specs):
+            return 0
+        cpu, mem = np.asarray(specs, np.int64).reshape(-1, 2).T
+        free = int(self._mem_total[dev_idx] - self._mem_used[dev_idx])
+        if int(mem.sum()) > free:
+            # does not fit as a whole: admit greedily in order
+            fits = np.zeros(len(mem), np.bool_)
+            for i, m in enumerate(mem.tolist()):
+                if m <= free:
+                    fits[i] = True
+                    free -= m
+            cpu, mem = cpu[fits], mem[fits]
+        k = len(cpu)
+        if not k:
+            return 0
+
+        used = self._mem_used[dev_idx] + mem.sum()
+        self._mem_used[dev_idx] = used
+        if used > self._mem_peak[dev_idx]:
+            self._mem_peak[dev_idx] = used
+        first = int(self._next_pid[dev_idx])
+        self._next_pid[dev_idx] += k
+        self._load[dev_idx] += k
+
+        while self._rows + k > len(self._p_pid):
+            self._grow()
+        rows = slice(self._rows, self._rows + k)
+        self._p_dev[rows] = dev_idx
+        self._p_pid[rows] = np.arange(first, first + k)
+        self._p_cpu[rows] = cpu
+        self._p_remaining[rows] = cpu
+        self._p_mem[rows] = mem
+        self._p_state[rows] = READY
+        self._p_live[rows] = True
+        self._p_order[rows] = np.arange(self._order_clock, self._order_clock + k)
+        self._order_clock += k
+        self._rows += k
+        self._in_table += k
+        return k
+
+    def evict_process(self, dev_idx: int, pid: int) -> Optional[int]:
+        """
+        Mark a READY / RUNNING process MIGRATED, to be reaped on the device's
+        next tick. Returns its row, or None when there is no such process.
+        """
+        n = self._rows
+        state = self._p_state[:n]
+        hit = np.flatnonzero(
+            self._p_live[:n] & (self._p_dev[:n] == dev_idx) & (self._p_pid[:n] == pid)
+            & ((state == READY) | (state == RUNNING))
+        )
+        if not len(hit):
+            return None
+        row = int(hit[0])
+        self._p_remaining[row] = 0
+        self._p_state[row] = MIGRATED
+        self._load[dev_idx] -= 1
+        self._reap_rows = np.append(self._reap_rows, row)
+        return row
+
+    def _append_row(self, dev_idx: int, pid: int, cpu: int, remaining: int, mem: int, state: int) -> int:
+        if self._rows == len(self._p_pid):
+            self._grow()
+        row = self._rows
+        self._p_dev[row] = dev_idx
+        self._p_pid[row] = pid
+        self._p_cpu[row] = cpu
+        self._p_remaining[row] = remaining
+        self._p_mem[row] = mem
+        self._p_state[row] = state
+        self._p_live[row] = True
+        self._p_order[row] = self._order_clock
+        self._order_clock += 1
+        self._rows += 1
+        self._in_table += 1
+        return row
+
+    def _grow(self) -> None:
+        for name in _PROCESS_COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _compact(self) -> None:
+        """Drop reaped rows, keeping creation order and remapping row indices."""
+        n = self._rows
+        keep = self._p_live[:n].copy()
+        new_index = np.cumsum(keep) - 1
+        m = int(keep.sum())
+        for name in _PROCESS_COLUMNS:
+            col = getattr(self, name)
+            col[:m] = col[:n][keep]
+        self._p_live[m:n] = False
+
+        busy = self._current != _NO_ROW
+        self._current[busy] = new_index[self._current[busy]]
+        self._reap_rows = new_index[self._reap_rows]
+        self._rows = m
+
+    # ---- simulation ----
+
+    def step(self) -> None:
+        self.time += 1
+        if self.logger:
+            self.logger.set_time(self.time)
+            self.logger.log(f"[SIM] === Step t={self.time} ===")
+
+        if self.failure_strategy is not None:
+            failures = self.failure_strategy.failure_count
+            self.failure_strategy.apply(self.time, ())
+            self.failure_count += self.failure_strategy.failure_count - failures
+        elif self.fail_probability is not None:
+            self._apply_failures()
+
+        if self.message_bus:
+            idx_of = self._idx_of
+            for dev_id, inbox in self.message_bus.drain_all(idx_of).items():
+                self._inbox.setdefault(idx_of[dev_id], []).extend(inbox)
+
+        self._tick(self._online)
+
+        if self.migrate:
+            self._rebalance()
+
+    def run(self, steps: int) -> None:
+        for _ in range(steps):
+            self.step()
+
+    def _apply_failures(self) -> None:
+        failed = ~self._online
+        recovered = failed & (self._failed_at != _NO_ROW) \
+            & (self.time - self._failed_at >= self.recovery_delay)
+        self._online[recovered] = True
+        self._failed_at[recovered] = _NO_ROW
+
+        online_idx = np.flatnonzero(self._online)
+        draws = self._rng.random_sample(len(online_idx))
+        newly_failed = online_idx[draws < self.fail_probability]
+        self._online[newly_failed] = False
+        self._failed_at[newly_failed] = self.time
+        self.failure_count += len(newly_failed)
+
+    def tick_device(self, dev_idx: int) -> None:
+        """Tick the OS of one device on its own, as IOperatingSystem.tick does."""
+        active = np.zeros(len(self._dev_id), np.bool_)
+        active[dev_idx] = True
+        self._tick(active)
+
+    def _tick(self, active: np.ndarray) -> None:
+        """Tick the OS of every device flagged in `active`."""
+        n = self._rows
+
+        # the OS only drains its inbox when it has a logger to report to
+        if self._inbox and self.logger:
+            for idx in [i for i in self._inbox if active[i]]:
+                del self._inbox[idx]
+
+        # pick: devices whose current process is gone take the head of their
+        # run queue (lowest order stamp) and rotate it to the tail; a MIGRATED
+        # head that is still waiting to be reaped makes the device idle
+        cur = self._current
+        cur_state = self._p_state[np.where(cur == _NO_ROW, 0, cur)]
+        need = active & ((cur == _NO_ROW) | (cur_state == FINISHED) | (cur_state == MIGRATED))
+        if need.any():
+            rows = np.flatnonzero(self._p_live[:n] & need[self._p_dev[:n]])
+            devs = self._p_dev[rows]
+            order = self._p_order[rows]
+            head = np.full(len(cur), np.iinfo(np.int64).max)
+            np.minimum.at(head, devs, order)
+            picked = rows[order == head[devs]]
+            picked_devs = self._p_dev[picked]
+
+            self._p_order[picked] = self._order_clock + np.arange(len(picked))
+            self._order_clock += len(picked)
+            cur[need] = _NO_ROW
+            ready = self._p_state[picked] == READY
+            cur[picked_devs[ready]] = picked[ready]
+            self._p_state[picked[ready]] = RUNNING
+
+        # execute
+        busy = np.flatnonzero(active & (cur != _NO_ROW))
+        rows = cur[busy]
+        self._p_remaining[rows] -= 1
+        done = self._p_remaining[rows] <= 0
+        if done.any():
+            finished_rows = rows[done]
+            self._p_state[finished_rows] = FINISHED
+            self.completed_count += len(finished_rows)
+            cur[busy[done]] = _NO_ROW
+            np.subtract.at(self._load, busy[done], 1)
+            self._reap_rows = np.concatenate([self._reap_rows, finished_rows])
+
+        # reap FINISHED / MIGRATED rows of devices that ticked
+        if len(self._reap_rows):
+            ticked = active[self._p_dev[self._reap_rows]]
+            reaped = self._reap_rows[ticked]
+            self._reap_rows = self._reap_rows[~ticked]
+            self._p_live[reaped] = False
+            np.subtract.at(self._mem_used, self._p_dev[reaped], self._p_mem[reaped])
+            np.maximum(self._mem_used, 0, out=self._mem_used)
+            self._in_table -= len(reaped)
+
+        if self._rows > _MIN_ROWS and self._in_table * 2 < self._rows:
+            self._compact()
+
+    def _rebalance(self) -> None:
+        if len(self._dev_id) < 2 or not self._online.any():
+            return
+        n = self._rows
+        load = self._load
+        for _ in range(self.max_moves):
+            alive_load = np.where(self._online, load, -1)
+            src = int(np.argmax(alive_load))
+            dst = int(np.argmin(np.where(self._online, load, np.iinfo(np.int64).max)))
+            if alive_load[src] - load[dst] < self.min_gap:
+                return
+
+            state = self._p_state[:n]
+            movable = np.flatnonzero(
+                self._p_live[:n] & (self._p_dev[:n] == src) & ((state == READY) | (state == RUNNING))
+            )
+            if not len(movable):
+                return
+            row = int(movable[0])
+            if self.create_process(dst, int(self._p_remaining[row]), int(self._p_mem[row])) is None:
+                return
+            n = self._rows
+
+            self.evict_process(src, int(self._p_pid[row]))
+            self.total_moves += 1
+
+    # ---- views for the CLI ----
+
+    @property
+    def devices(self) -> List["VectorDeviceView"]:
+        return [VectorDeviceView(self, dev_id) for dev_id in self._dev_id.tolist()]
+
+    def device_processes(self, dev_idx: int) -> List[Process]:
+        n = self._rows
+        rows = np.flatnonzero(self._p_live[:n] & (self._p_dev[:n] == dev_idx))
+        return [self.process_at(int(row)) for row in rows]
+
+    def process_at(self, row: int) -> Process:
+        """A detached Process copy of the row."""
+        p = Process(pid=int(self._p_pid[row]), cpu_time=int(self._p_cpu[row]),
+                    mem_required=int(self._p_mem[row]))
+        p.remaining = int(self._p_remaining[row])
+        p.state = ProcessState(int(self._p_state[row]))
+        return p
+
+
+def _numpy_rng(rng: random.Random) -> np.random.RandomState:
+    """A RandomState that continues the Mersenne Twister stream of `rng`."""
+    state = rng.getstate()[1]
+    out = np.random.RandomState()
+    out.set_state(("MT19937", np.array(state[:624], dtype=np.uint32), state[624]))
+    return out
+
+
+@dataclass(slots=True)
+class _MemoryView:
+    total: int
+    used: int
+    peak_used: int
+
+    @property
+    def largest_free_block(self) -> int:
+        return self.total - self.used
+
+    @property
+    def fragmentation(self) -> float:
+        return 0.0
+
+
+@dataclass(slots=True)
+class VectorOSView(IOperatingSystem):
+    """IOperatingSystem facade over one device's rows; calls go to the engine."""
+    engine: VectorSimulationEngine
+    device_id: int
+
+    @property
+    def index(self) -> int:
+        return self.engine._idx_of[self.device_id]
+
+    @property
+    def memory(self) -> _MemoryView:
+        eng, i = self.engine, self.index
+        return _MemoryView(int(eng._mem_total[i]), int(eng._mem_used[i]), int(eng._mem_peak[i]))
+
+    @property
+    def load(self) -> int:
+        return int(self.engine._load[self.index])
+
+    def create_process(self, cpu_time: int, mem_required: int) -> Optional[Process]:
+        pid = self.engine.create_process(self.index, cpu_time, mem_required)
+        if pid is None:
+            return None
+        return Process(pid=pid, cpu_time=cpu_time, mem_required=mem_required)
+
+    def tick(self) -> None:
+        self.engine.tick_device(self.index)
+
+    def processes(self) -> Iterable[Process]:
+        return self.engine.device_processes(self.index)
+
+    def get_process(self, pid: int) -> Optional[Process]:
+        return next((p for p in self.processes() if p.pid == pid), None)
+
+    def evict_process(self, pid: int) -> Optional[Process]:
+        row = self.engine.evict_process(self.index, pid)
+        return None if row is None else self.engine.process_at(row)
+
+    def deliver_messages(self, messages: Iterable[Message]) -> None:
+        self.engine._inbox.setdefault(self.index, []).extend(messages)
+
+    def pending_messages(self) -> Iterable[Message]:
+        return tuple(self.engine._inbox.get(self.index, ()))
+
+
+@dataclass(slots=True)
+class VectorDeviceView(IDevice):
+    """IDevice facade over one device's columns, valid while the device is in the engine."""
+    engine: VectorSimulationEngine
+    device_id: int
+
+    @property
+    def index(self) -> int:
+        return self.engine._idx_of[self.device_id]
+
+    @property
+    def id(self) -> int:
+        return self.device_id
+
+    @property
+    def state(self) -> DeviceState:
+        return DeviceState.ONLINE if self.engine._online[self.index] else DeviceState.FAILED
+
+    def os(self) -> VectorOSView:
+        return VectorOSView(self.engine, self.device_id)
+
+    def tick(self) -> None:
+        if self.is_alive():
+            self.engine.tick_device(self.index)
+
+    def fail(self) -> None:
+        i = self.index
+        self.engine._online[i] = False
+        self.engine._failed_at[i] = self.engine.time
+
+    def recover(self) -> None:
+        i = self.index
+        self.engine._online[i] = True
+        self.engine._failed_at[i] = _NO_ROW
+
+    def is_alive(self) -> bool:
+        return bool(self.engine._online[self.index])
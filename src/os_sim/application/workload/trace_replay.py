@@ -0,0 +1,156 @@
+from __future__ import annotations
+import csv
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import IO, Dict, Iterator, NamedTuple, Optional, Sequence
+
+from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.logging import ILogger
+from os_sim.interfaces.workload import IWorkload
+
+TRACE_FIELDS = ("time", "device", "cpu_time", "mem")
+
+
+class TraceError(ValueError):
+    """A trace row cannot be parsed or is out of time order."""
+
+
+class Arrival(NamedTuple):
+    time: int
+    device: int
+    cpu_time: int
+    mem: int
+
+
+def _open_text(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="")
+    return open(path, newline="")
+
+
+def read_trace(path: str) -> Iterator[Arrival]:
+    """
+    Stream arrivals from a CSV or JSON Lines trace (gzip if it ends in .gz),
+    one row at a time.
+
+    CSV rows are `time,device,cpu_time,mem`, with an optional header that
+    may order the columns differently; JSONL lines are objects with those
+    keys. Arrivals must be sorted by time.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    last = None
+    with _open_text(path) as f:
+        rows = _jsonl_rows(f, path) if name.endswith((".jsonl", ".ndjson")) else _csv_rows(f, path)
+        for line_no, row in rows:
+            try:
+                arrival = Arrival(*map(int, row))
+            except (TypeError, ValueError):
+                raise TraceError(f"{path}:{line_no}: bad arrival {row!r}") from None
+            if last is not None and arrival.time < last:
+                raise TraceError(f"{path}:{line_no}: trace is not sorted by time")
+            last = arrival.time
+            yield arrival
+
+
+def _csv_rows(f: IO[str], path: str) -> Iterator[tuple]:
+    reader = csv.reader(f)
+    order = None
+    for row in reader:
+        if not row or row[0].startswith("#"):
+            continue
+        if order is None:
+            order = list(range(len(TRACE_FIELDS)))
+            if not row[0].strip().lstrip("-").isdigit():
+                header = [c.strip() for c in row]
+                try:
+                    order = [header.index(name) for name in TRACE_FIELDS]
+                except ValueError:
+                    raise TraceError(f"{path}: trace header needs the columns {', '.join(TRACE_FIELDS)}") from None
+                continue
+        yield reader.line_num, [row[i] for i in order]
+
+
+def _jsonl_rows(f: IO[str], path: str) -> Iterator[tuple]:
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise TraceError(f"{path}:{line_no}: {e}") from None
+        if not isinstance(obj, dict):
+            raise TraceError(f"{path}:{line_no}: expected a JSON object")
+        yield line_no, [obj.get(name) for name in TRACE_FIELDS]
+
+
+@dataclass(slots=True)
+class TraceWorkload(IWorkload):
+    """
+    Replays a stream of arrivals: every arrival is created on its device
+    during the step equal to its time. Only the next arrival is held in
+    memory, so `arrivals` can be read_trace() over a file of any size.
+
+    Arrivals that find too little free memory are dropped and counted in
+    `rejected`; arrivals for a device that is not attached land in
+    `unknown_device`.
+    """
+    arrivals: Iterator[Arrival]
+    logger: Optional[ILogger] = None
+
+    injected: int = 0
+    rejected: int = 0
+    unknown_device: int = 0
+
+    _devices: Dict[int, IDevice] = field(default_factory=dict)
+    _next: Optional[Arrival] = None
+
+    def __post_init__(self) -> None:
+        self.arrivals = iter(self.arrivals)
+        self._next = next(self.arrivals, None)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._next is None
+
+    def on_device_added(self, device: IDevice) -> None:
+        self._devices[device.id] = device
+
+    def on_device_removed(self, device_id: int) -> None:
+        self._devices.pop(device_id, None)
+
+    def apply(self, time: int, devices: Sequence[IDevice]) -> None:
+        arrival = self._next
+        if arrival is None or arrival.time > time:
+            return
+        by_id = self._devices
+        arrivals = self.arrivals
+        while arrival is not None and arrival.time <= time:
+            dev = by_id.get(arrival.device)
+            if dev is None:
+                self.unknown_device += 1
+            elif dev.os().create_process(cpu_time=arrival.cpu_time, mem_required=arrival.mem) is None:
+                self.rejected += 1
+                if self.logger:
+                    self.logger.log(
+                        f"[TRACE] Rejected arrival on device {arrival.device}: "
+                        f"mem={arrival.mem} does not fit",
+                        device=arrival.device,
+                    )
+            else:
+                self.injected += 1
+            arrival = next(arrivals, None)
+        self._next = arrival
+
+    def next_event_time(self, time: int) -> Optional[int]:
+        if self._next is None:
+            return None
+        return max(time + 1, self._next.time)
+
+    def stats(self) -> dict:
+        return {
+            "injected": self.injected,
+            "rejected_memory": self.rejected,
+            "unknown_device": self.unknown_device,
+            "exhausted": self.exhausted,
+        }
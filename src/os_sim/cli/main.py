@@ -1,22 +1,45 @@
 from __future__ import annotations
 
 import os
+import sys
+import json
 import time
 import argparse
+import asyncio
+import contextlib
+import io
 
+from os_sim.application.scheduling.heap_schedulers import PriorityScheduler, SRTFScheduler
+from os_sim.application.scheduling.mlfq import MLFQScheduler
 from os_sim.application.scheduling.round_robin import RoundRobinScheduler
 from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.memory.buddy_memory import BuddyMemoryManager
 from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.os.multicore_os import MultiCoreOperatingSystem
 from os_sim.application.devices.simple_device import SimpleDevice
 from os_sim.application.simulation.engine import SimulationEngine
-from os_sim.application.simulation.simple_migrator import SimpleTaskMigrator
-from os_sim.application.simulation.random_failure import RandomFailureStrategy
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator
+from os_sim.application.simulation.stealing_migrator import StealingTaskMigrator
+from os_sim.application.simulation.transport import ProcessTransport
+from os_sim.application.simulation.sharded_engine import ShardedSimulationEngine
+from os_sim.application.simulation.checkpoint import CheckpointError, load_checkpoint, save_checkpoint
+from os_sim.application.simulation.scheduled_failure import ScheduledFailureStrategy
+from os_sim.application.simulation.latency_metrics import LatencyMetrics
+from os_sim.application.simulation.profiler import StepProfiler
+from os_sim.application.simulation.realtime import RealtimeDriver
+from os_sim.application.workload.trace_replay import TraceError, TraceWorkload, read_trace
 from os_sim.application.logging.in_memory_logger import InMemoryLogger
 from os_sim.application.ipc.simple_bus import SimpleMessageBus
+from os_sim.cli.watch import KeyReader, TerminalFrame
 from os_sim.domain.messages import Message
-from typing import Callable, Sequence
+from os_sim.domain.pid_namespace import PidNamespace
+from os_sim.domain.states import ProcessState
+from typing import Callable, NamedTuple, Sequence
 
 from os_sim.interfaces.device import IDevice
+from os_sim.interfaces.memory_manager import IMemoryManager
+from os_sim.interfaces.operating_system import IOperatingSystem
+from os_sim.interfaces.task_migrator import ITaskMigrator
 
 ProcTemplate = Callable[[int], tuple[int, int]]  # (device_index) -> (cpu_time, mem)
 
@@ -24,10 +47,39 @@ PROC_TEMPLATES: Sequence[ProcTemplate] = [
     lambda i: (5 + i, i + 3),
 ]
 
+# --memory choices: counter only tracks totals, buddy places blocks
+MEMORY_MANAGERS = {
+    "counter": SimpleMemoryManager,
+    "buddy": BuddyMemoryManager,
+}
+
+# --scheduler / add-dev choices
+SCHEDULERS = {
+    "rr": RoundRobinScheduler,
+    "priority": PriorityScheduler,
+    "srtf": SRTFScheduler,
+    "mlfq": MLFQScheduler,
+}
+
+
+class DeviceSetup(NamedTuple):
+    """Memory manager, scheduler, CPU slicing and cores of devices added from the console."""
+    memory: str = "counter"
+    scheduler: str = "rr"
+    quantum: int = 0
+    switch_cost: int = 0
+    cores: int = 1
+
+
 # === Simulation Parameters ===
 IMBALANCE_THRESHOLD = 1
+MAX_MIGRATIONS_PER_STEP = 1
 FAILURE_PROBABILTY = 0.1
 RECOVERY_DELAY = 2
+LOG_CAPACITY = 100_000
+WATCH_FPS = 20.0
+WATCH_MAX_PROCS = 8
+LIVE_RATE = 10.0
 
 # === ANSI colors ===
 RESET = "\033[0m"
@@ -51,23 +103,40 @@ def clear_screen() -> None:
     print("Developed by <Kharlamov Ilia>")
 
 
-def build_demo_simulation(
-        logger: InMemoryLogger,
-        num_devices: int = 2,
-        procs_per_device: int = 5,
-        imbalance_threshold: int = IMBALANCE_THRESHOLD,
-        fail_probability: float = FAILURE_PROBABILTY,
+def make_os(
+        mem: IMemoryManager, scheduler: str, logger: InMemoryLogger,
+        quantum: int = 0, switch_cost: int = 0, cores: int = 1, pids: PidNamespace | None = None,
+) -> IOperatingSystem:
+    """BasicOperatingSystem, or a MultiCoreOperatingSystem for several cores."""
+    if cores > 1:
+        return MultiCoreOperatingSystem.with_cores(
+            mem, cores, SCHEDULERS[scheduler],
+            logger=logger, quantum=quantum, switch_cost=switch_cost, pids=pids,
+        )
+    return BasicOperatingSystem(
+        memory=mem, scheduler=SCHEDULERS[scheduler](), logger=logger, quantum=quantum, switch_cost=switch_cost,
+        pids=pids,
+    )
+
+
+def make_migrator(kind: str, imbalance_threshold: int, max_moves: int, seed: int | None = None) -> ITaskMigrator:
+    """`heap` pushes from the most to the least loaded device, `steal` lets idle devices pull."""
+    if kind == "steal":
+        return StealingTaskMigrator(imbalance_threshold=imbalance_threshold, max_moves=max_moves, seed=seed)
+    return HeapTaskMigrator(imbalance_threshold=imbalance_threshold, max_moves=max_moves)
+
+
+def plan_demo_devices(
+        num_devices: int,
+        procs_per_device: int,
         proc_templates: Sequence[ProcTemplate] | None = None,
-) -> SimulationEngine:
+        memory: str = "counter",
+) -> list[tuple[int, int, list[tuple[int, int]]]]:
+    """(device id, memory, [(cpu_time, mem_required), ...]) of every demo device."""
     if proc_templates is None:
         proc_templates = PROC_TEMPLATES
-
-    devices: list[SimpleDevice] = []
-
-    # create devices
+    plan = []
     for dev_idx in range(num_devices):
-        dev_id = dev_idx + 1
-
         # 1) Plan processes for THIS device
         proc_specs: list[tuple[int, int]] = []
         for proc_idx in range(procs_per_device):
@@ -76,25 +145,58 @@ def build_demo_simulation(
             proc_specs.append((cpu_time + dev_idx, mem_req + dev_idx))
 
         # 2) Calculate required memory for this device
-        required_mem = sum(mem for _, mem in proc_specs)
+        if memory == "buddy":
+            # size for the power-of-two blocks the allocator hands out
+            required_mem = sum(1 << (mem - 1).bit_length() for _, mem in proc_specs)
+        else:
+            required_mem = sum(mem for _, mem in proc_specs)
         free_mem = max(10, required_mem // 5)  # 20% margin
-        total_mem = required_mem + free_mem
+        plan.append((dev_idx + 1, required_mem + free_mem, proc_specs))
+    return plan
+
+
+def build_demo_simulation(
+        logger: InMemoryLogger,
+        num_devices: int = 2,
+        procs_per_device: int = 5,
+        imbalance_threshold: int = IMBALANCE_THRESHOLD,
+        fail_probability: float = FAILURE_PROBABILTY,
+        proc_templates: Sequence[ProcTemplate] | None = None,
+        max_migrations: int = MAX_MIGRATIONS_PER_STEP,
+        seed: int | None = None,
+        memory: str = "counter",
+        recovery_delay: int = RECOVERY_DELAY,
+        scheduler: str = "rr",
+        quantum: int = 0,
+        switch_cost: int = 0,
+        cores: int = 1,
+        migrator: str = "heap",
+        transfer_cost: float | None = None,
+) -> SimulationEngine:
+    """
+    `transfer_cost` switches to identity-preserving migration: cluster-wide
+    pids and transfer_cost steps in flight per unit of memory moved.
+    """
+    transport = None if transfer_cost is None else ProcessTransport(ticks_per_mem=transfer_cost, logger=logger)
+
+    devices: list[SimpleDevice] = []
 
-        mem = SimpleMemoryManager(_total=total_mem)
-        sched = RoundRobinScheduler()
-        os_ = BasicOperatingSystem(memory=mem, scheduler=sched, logger=logger)
+    # create devices
+    for dev_id, total_mem, proc_specs in plan_demo_devices(num_devices, procs_per_device, proc_templates, memory):
+        mem = MEMORY_MANAGERS[memory](total_mem)
+        os_ = make_os(mem, scheduler, logger, quantum, switch_cost, cores, transport and transport.pids)
         dev = SimpleDevice(_id=dev_id, _os=os_)
 
-        # 3) Actually create processes with the planned specs
-        for cpu_time, mem_req in proc_specs:
-            proc = os_.create_process(cpu_time=cpu_time, mem_required=mem_req)
-            if proc is None:
-                print(f"Cannot create process on device {dev_id}: not enough memory")
-            else:
-                logger.log(
-                    f"[CMD] Created process pid={proc.pid} "
-                    f"with cpu_time={cpu_time} on device {dev_id}"
-                )
+        # 3) Actually create processes with the planned specs, in one batch
+        procs = os_.create_processes(proc_specs)
+        pids = [p.pid for p in procs if p is not None]
+        if len(pids) < len(procs):
+            print(f"Cannot create {len(procs) - len(pids)} processes on device {dev_id}: not enough memory")
+        if pids:
+            logger.log(
+                f"[CMD] Created {len(pids)} processes pid={pids[0]}..{pids[-1]} on device {dev_id}",
+                device=dev_id,
+            )
 
         devices.append(dev)
 
@@ -102,86 +204,310 @@ def build_demo_simulation(
 
     engine = SimulationEngine(
         devices=devices,
-        task_migrator=SimpleTaskMigrator(imbalance_threshold=imbalance_threshold),
-        failure_strategy=RandomFailureStrategy(
+        task_migrator=make_migrator(migrator, imbalance_threshold, max_migrations, seed),
+        failure_strategy=ScheduledFailureStrategy(
             fail_probability=fail_probability,
-            recovery_delay=RECOVERY_DELAY
+            recovery_delay=recovery_delay,
+            seed=seed,
         ),
         message_bus=bus,
         logger=logger,
     )
+    if transport is not None:
+        engine.set_transport(transport)
     return engine
 
 
+def _vector_engine_class():
+    try:
+        from os_sim.application.simulation.vector_engine import VectorSimulationEngine
+    except ImportError:
+        raise SystemExit("The vector engine requires numpy (pip install numpy)")
+    return VectorSimulationEngine
+
+
+def to_vector_engine(sim: SimulationEngine):
+    try:
+        return _vector_engine_class().from_engine(sim)
+    except ValueError as e:
+        raise SystemExit(f"The vector engine cannot take this setup: {e}")
+
+
+def build_demo_vector_simulation(
+        logger: InMemoryLogger,
+        num_devices: int = 2,
+        procs_per_device: int = 5,
+        imbalance_threshold: int = IMBALANCE_THRESHOLD,
+        fail_probability: float = FAILURE_PROBABILTY,
+        proc_templates: Sequence[ProcTemplate] | None = None,
+        max_migrations: int = MAX_MIGRATIONS_PER_STEP,
+        seed: int | None = None,
+        recovery_delay: int = RECOVERY_DELAY,
+):
+    """
+    The default demo stack built straight into a VectorSimulationEngine,
+    without creating the per-process objects first.
+    """
+    return _vector_engine_class().from_specs(
+        plan_demo_devices(num_devices, procs_per_device, proc_templates),
+        seed=seed,
+        message_bus=SimpleMessageBus(logger=logger),
+        logger=logger,
+        failure_strategy=ScheduledFailureStrategy(
+            fail_probability=fail_probability,
+            recovery_delay=recovery_delay,
+            seed=seed,
+        ),
+        migrate=True,
+        # HeapTaskMigrator.min_gap
+        min_gap=max(2, imbalance_threshold),
+        max_moves=max_migrations,
+    )
+
+
 def get_next_device_id(sim: SimulationEngine) -> int:
     if not sim.devices:
         return 1
     return max(d.id for d in sim.devices) + 1
 
 
-def format_state(sim: SimulationEngine) -> str:
+STATE_COLORS = {
+    ProcessState.RUNNING: FG_GREEN,
+    ProcessState.READY: FG_YELLOW,
+    ProcessState.BLOCKED: FG_BLUE,
+    ProcessState.MIGRATED: FG_MAGENTA,
+}
+
+
+def format_device(dev: IDevice, max_procs: int | None = None) -> list[str]:
+    """
+    Lines describing one device. With `max_procs`, a process table longer
+    than that is replaced by per-state counts.
+    """
     lines: list[str] = []
+    dev_state = dev.state.name
+    if dev_state == "ONLINE":
+        dev_state_str = color(dev_state, FG_GREEN, BOLD)
+    else:
+        dev_state_str = color(dev_state, FG_RED, BOLD)
+
+    lines.append(f"{color('Device', FG_MAGENTA)} {dev.id}: {dev_state_str}")
+
+    os_ = dev.os()
+    mem_mgr = os_.memory
+    mem_total = mem_mgr.total
+    mem_used = mem_mgr.used
+    mem_free = mem_total - mem_used
+
+    mem_line = f"  Memory: total={mem_total:03d} used={mem_used:03d} free={mem_free:03d}"
+    largest = mem_mgr.largest_free_block
+    if largest != mem_free:
+        # only allocators that place blocks can lose free memory this way
+        mem_line += f" largest={largest:03d} frag={mem_mgr.fragmentation:.0%}"
+    lines.append(mem_line)
+    if getattr(os_, "quantum", 0) or getattr(os_, "switch_cost", 0):
+        lines.append(
+            f"  CPU: quantum={os_.quantum} switch_cost={os_.switch_cost} "
+            f"switches={os_.context_switches} preempted={os_.preemptions} lost={os_.switch_ticks}"
+        )
+    utilisation = getattr(os_, "utilisation", None)
+    if utilisation is not None:
+        cores = " ".join(f"{u:.0%}" for u in utilisation())
+        lines.append(f"  Cores: {len(os_.cores)} busy={cores} steals={sum(c.steals for c in os_.cores)}")
+
+    if max_procs is not None:
+        counts = [(s, os_.count_processes(s)) for s in ProcessState]
+        total = sum(c for _, c in counts)
+        if total > max_procs:
+            summary = ", ".join(
+                color(f"{s.name} {c}", STATE_COLORS.get(s, FG_RED)) for s, c in counts if c
+            )
+            lines.append(f"  Processes: {total} ({summary})")
+            procs = []
+        else:
+            procs = list(os_.processes()) if total else []
+            if not procs:
+                lines.append("  (no processes)")
+    else:
+        procs = list(os_.processes())
+        if not procs:
+            lines.append("  (no processes)")
 
+    if procs:
+        lines.append("  PID  | STATE    | REMAIN | MEM ")
+        lines.append("  -----+----------+--------+-----")
+        for p in procs:
+            state = p.state
+            lines.append(
+                f"  {p.pid:4d} | "
+                f"{color(state.name.ljust(8), STATE_COLORS.get(state, FG_RED))} | "
+                f"{p.remaining:6d} | "
+                f"{p.mem_required:4d}"
+            )
+
+    inbox = list(os_.pending_messages())
+    if inbox:
+        lines.append(f"  Inbox: {len(inbox)} message(s)")
+    lines.append("")
+    return lines
+
+
+def format_header(sim: SimulationEngine) -> list[str]:
     header = f"FakeOS Simulation  t={sim.time}"
-    lines.append(color(header, BOLD, FG_CYAN))
-    lines.append("-" * len(header))
+    transport = getattr(sim, "transport", None)
+    if transport is not None:
+        header += f"  in flight={transport.in_flight}"
+    return [color(header, BOLD, FG_CYAN), "-" * len(header)]
+
 
+def format_state(sim: SimulationEngine) -> str:
+    lines = format_header(sim)
     for dev in sim.devices:
-        dev_state = dev.state.name
-        if dev_state == "ONLINE":
-            dev_state_str = color(dev_state, FG_GREEN, BOLD)
-        else:
-            dev_state_str = color(dev_state, FG_RED, BOLD)
+        lines.extend(format_device(dev))
+    return "\n".join(lines)
 
-        lines.append(f"{color('Device', FG_MAGENTA)} {dev.id}: {dev_state_str}")
 
-        mem_mgr = dev.os().memory
-        mem_total = mem_mgr.total
-        mem_used = mem_mgr.used
-        mem_free = mem_total - mem_used
+def format_watch_frame(
+        sim: SimulationEngine,
+        devices: Sequence[IDevice],
+        first: int,
+        height: int,
+        max_procs: int,
+        status: str,
+) -> tuple[list[str], int]:
+    """
+    One screen of `watch`: the `devices` from index `first` on that fit in
+    `height` rows, plus a status line. Devices below the screen are not
+    formatted at all. Returns the rows and the number of devices shown.
+    """
+    rows = format_header(sim)
+    body = max(1, height - len(rows) - 1)
+    shown = 0
+    for dev in devices[first:]:
+        block = format_device(dev, max_procs)
+        if shown and len(rows) - 2 + len(block) > body:
+            break
+        rows.extend(block[:body - (len(rows) - 2)])
+        shown += 1
+        if len(rows) - 2 >= body:
+            break
+    last = first + shown
+    rows.append(color(
+        f"devices {first}-{max(first, last - 1)} of {len(devices)} | {status}",
+        DIM,
+    ))
+    return rows, shown
 
+
+def print_state(sim: SimulationEngine) -> None:
+    print(format_state(sim))
+
+
+def watch(
+        sim: SimulationEngine,
+        n: int,
+        delay: float,
+        fps: float = WATCH_FPS,
+        max_procs: int = WATCH_MAX_PROCS,
+) -> None:
+    """
+    Step `n` times, redrawing a paged view of the devices at most `fps`
+    times per second. Only changed rows are rewritten, and devices with
+    more than `max_procs` processes are shown as per-state counts.
+    """
+    frame = TerminalFrame(fps=fps)
+    first = 0
+    page_starts: list[int] = []
+    shown = 0
+    stopped = False
+    frame.open()
+    try:
+        with KeyReader() as keys:
+            for i in range(n):
+                sim.step()
+                key = keys.read()
+                while key:
+                    if key in ("n", " ", "\033[6~") and shown:
+                        page_starts.append(first)
+                        first += shown
+                    elif key in ("p", "\033[5~") and page_starts:
+                        first = page_starts.pop()
+                    elif key == "q":
+                        stopped = True
+                    key = keys.read()
+                last = stopped or i == n - 1
+                if last or frame.due():
+                    # one snapshot per frame (sharded engines fetch it from workers)
+                    devices = sim.devices
+                    if first >= len(devices):
+                        first, page_starts = 0, []
+                    rows, shown = format_watch_frame(
+                        sim, devices, first, frame.height(), max_procs,
+                        f"watch {i + 1}/{n}, delay={delay}s "
+                        f"| n/space: next page  p: prev page  q: stop",
+                    )
+                    frame.draw(rows)
+                if stopped:
+                    break
+                if delay > 0:
+                    time.sleep(delay)
+    except KeyboardInterrupt:
+        stopped = True
+    finally:
+        frame.close()
+    if stopped:
+        print("Watch interrupted.")
+
+
+def format_profile(prof: StepProfiler) -> str:
+    agg = prof.aggregates()
+    lines = [color(f"Profile over the last {agg['steps']} of {prof.steps} steps", BOLD)]
+    lines.append("  PHASE       | MEAN ms  | MAX ms   | SHARE")
+    total = agg["total_s"]["sum"] or 1.0
+    for name in ("workload_s", "failures_s", "messages_s", "ticks_s", "rebalance_s", "total_s"):
+        a = agg[name]
+        lines.append(
+            f"  {name[:-2]:<11} | {a['mean'] * 1e3:8.3f} | {a['max'] * 1e3:8.3f} | "
+            f"{a['sum'] / total:5.1%}"
+        )
+    counts = ", ".join(
+        f"{name} {agg[name]['sum']}" for name in ("messages", "created", "finished", "migrated", "failures")
+    )
+    lines.append(f"  Counts: {counts}")
+    for d in prof.slowest_devices(top=3):
         lines.append(
-            f"  Memory: total={mem_total:03d} used={mem_used:03d} free={mem_free:03d}"
+            f"  Device {d['device']}: {d['tick_s'] * 1e3:.2f} ms over {d['ticks']} ticks"
         )
+    return "\n".join(lines)
 
-        procs = list(dev.os().processes())
-        if not procs:
-            lines.append("  (no processes)")
-        else:
-            lines.append("  PID  | STATE    | REMAIN | MEM ")
-            lines.append("  -----+----------+--------+-----")
-            for p in procs:
-                if p.state.name == "RUNNING":
-                    s_color = FG_GREEN
-                elif p.state.name == "READY":
-                    s_color = FG_YELLOW
-                elif p.state.name == "BLOCKED":
-                    s_color = FG_BLUE
-                elif p.state.name == "MIGRATED":
-                    s_color = FG_MAGENTA
-                else:
-                    s_color = FG_RED
-
-                state_text = p.state.name
-                state_padded = state_text.ljust(8)
-
-                lines.append(
-                    f"  {p.pid:4d} | "
-                    f"{color(state_padded, s_color)} | "
-                    f"{p.remaining:6d} | "
-                    f"{p.mem_required:4d}"
-                )
 
-        inbox = list(dev.os().pending_messages())
-        if inbox:
-            lines.append(f"  Inbox: {len(inbox)} message(s)")
-        lines.append("")
+def format_latency(metrics: LatencyMetrics) -> str:
+    summary = metrics.summary()
+    lines = [color(
+        f"Latency over {metrics.completed_count} completed processes, {summary['migrations']} migrations (steps)", BOLD
+    )]
+    lines.append("  GROUP          | DONE  | WAIT p50/p95/p99   | TURNAROUND p50/p95/p99")
 
+    def row(name: str, group: dict) -> str:
+        wait, turn = group["wait"], group["turnaround"]
+        fmt = lambda d: "/".join("-" if d[p] is None else str(d[p]) for p in ("p50", "p95", "p99"))
+        return f"  {name:<14} | {group['completed']:5} | {fmt(wait):<18} | {fmt(turn)}"
+
+    for name in ("cluster", "migrated", "not_migrated"):
+        lines.append(row(name.replace("_", " "), summary[name]))
+    for dev_id, group in summary["devices"].items():
+        lines.append(row(f"device {dev_id}", group))
     return "\n".join(lines)
 
 
-def print_state(sim: SimulationEngine) -> None:
-    print(format_state(sim))
+def format_transfers(transport: ProcessTransport) -> str:
+    t = transport.summary()
+    return (
+        f"Transfers: {t['transfers']} of {t['processes_moved']} processes "
+        f"({t['moves_per_process']} each), {t['in_flight']} in flight, {t['lost']} lost\n"
+        f"  {t['transfer_ticks']} steps in flight (mean {t['mean_delay']}) "
+        f"to move {t['moved_cpu']} units of CPU time"
+    )
 
 
 def print_help() -> None:
@@ -190,16 +516,378 @@ def print_help() -> None:
     print("  " + color("step [N]", FG_CYAN) + "                  - advance simulation by N steps (default 1)")
     print("  " + color("run N", FG_CYAN) + "                     - same as step N")
     print("  " + color("watch N [delay]", FG_CYAN) + "           - auto-step N times with optional delay (seconds)")
+    print("                              fps=F caps redraws, procs=K summarises longer process tables")
+    print("  " + color("live [RATE]", FG_CYAN) + "               - run RATE steps/s (default 10) while taking send/add-*/remove-dev")
+    print("                              commands; rate R, pause, resume, stop")
     print("  " + color("state", FG_CYAN) + "                     - show current devices and processes")
     print("  " + color("send FROM TO MESSAGE...", FG_CYAN) + "   - send IPC message FROM device TO device")
-    print("  " + color("add-dev MEM", FG_CYAN) + "               - add new device with MEM memory")
-    print("  " + color("add-proc DEV CPU MEM", FG_CYAN) + "      - add process to device DEV")
+    print("  " + color("add-dev MEM [SCHED]", FG_CYAN) + "       - add new device with MEM memory (rr|priority|srtf|mlfq)")
+    print("                              quantum=Q and switch=C set its time slice and switch cost,")
+    print("                              cores=K gives it K cores")
+    print("  " + color("add-proc DEV CPU MEM [P]", FG_CYAN) + "  - add process to device DEV, priority P (lower first)")
     print("  " + color("remove-dev DEV", FG_CYAN) + "            - remove a device and all its processes")
+    print("  " + color("save PATH", FG_CYAN) + "                 - write a checkpoint of the simulation")
+    print("  " + color("load PATH", FG_CYAN) + "                 - replace the simulation with a checkpoint")
+    print("  " + color("trace", FG_CYAN) + "                     - arrivals replayed from --trace so far")
+    print("  " + color("profile [on|off|PATH]", FG_CYAN) + "     - show step phase timings, toggle them or export CSV/JSON")
+    print("  " + color("latency [on|off]", FG_CYAN) + "          - wait / turnaround percentiles of finished processes")
+    print("  " + color("history [PID]", FG_CYAN) + "             - migration totals, or the moves of one process")
     print("  " + color("log [N]", FG_CYAN) + "                   - show last N log lines (default 20)")
+    print("                              filter with dev=ID pid=PID tag=OS|IPC|MIGRATION|SIM|CMD|TRACE")
     print("  " + color("clear", FG_CYAN) + "                     - clear screen")
     print("  " + color("quit/exit", FG_CYAN) + "                 - exit console")
 
 
+def peak_rss_kb() -> int | None:
+    """Peak resident set size of this process (and reaped workers), in KiB."""
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def peak_memory(final: dict) -> dict:
+    """Simulated memory high-water marks from a summarize_state() result."""
+    devices = final["devices"]
+    utils = [d["memory_peak"] / d["memory_total"] if d["memory_total"] else 0.0 for d in devices]
+    busiest = max(range(len(devices)), key=utils.__getitem__, default=None)
+    return {
+        # per-device peaks need not coincide, so their sum bounds the
+        # cluster-wide peak from above
+        "used_sum": sum(d["memory_peak"] for d in devices),
+        "total": final["memory_total"],
+        "max_utilisation": round(utils[busiest], 4) if busiest is not None else 0.0,
+        "max_device": devices[busiest]["id"] if busiest is not None else None,
+        "mean_utilisation": round(sum(utils) / len(utils), 4) if utils else 0.0,
+    }
+
+
+def summarize_state(sim: SimulationEngine) -> dict:
+    devices = []
+    for d in sim.devices:
+        os_ = d.os()
+        devices.append({
+            "id": d.id,
+            "state": d.state.name,
+            "processes": sum(1 for _ in os_.processes()),
+            "memory_used": os_.memory.used,
+            "memory_peak": os_.memory.peak_used,
+            "memory_total": os_.memory.total,
+            "context_switches": getattr(os_, "context_switches", 0),
+            "preemptions": getattr(os_, "preemptions", 0),
+            "switch_ticks": getattr(os_, "switch_ticks", 0),
+        })
+        if hasattr(os_, "utilisation"):
+            devices[-1]["core_utilisation"] = [round(u, 4) for u in os_.utilisation()]
+            devices[-1]["steals"] = sum(c.steals for c in os_.cores)
+    return {
+        "time": sim.time,
+        "devices_online": sum(1 for d in devices if d["state"] == "ONLINE"),
+        "processes": sum(d["processes"] for d in devices),
+        "memory_used": sum(d["memory_used"] for d in devices),
+        "memory_total": sum(d["memory_total"] for d in devices),
+        "context_switches": sum(d["context_switches"] for d in devices),
+        "preemptions": sum(d["preemptions"] for d in devices),
+        "switch_ticks": sum(d["switch_ticks"] for d in devices),
+        "devices": devices,
+    }
+
+
+def do_send(sim: SimulationEngine, logger: InMemoryLogger, setup: DeviceSetup, args: list[str]) -> bool:
+    if len(args) < 3:
+        print("Usage: send FROM TO MESSAGE...")
+        return False
+    try:
+        from_id = int(args[0])
+        to_id = int(args[1])
+    except ValueError:
+        print("FROM and TO must be integers (device ids)")
+        return False
+    text = " ".join(args[2:])
+    if not sim.message_bus:
+        print("No message bus configured.")
+        return False
+    msg = Message(from_device=from_id, to_device=to_id, payload=text)
+    sim.message_bus.send(msg)
+    print(f"Sent message from {from_id} to {to_id}")
+    return False
+
+
+def do_add_dev(sim: SimulationEngine, logger: InMemoryLogger, setup: DeviceSetup, args: list[str]) -> bool:
+    opts = dict(a.split("=", 1) for a in args if "=" in a)
+    args = [a for a in args if "=" not in a]
+    if len(args) < 1:
+        print(f"Usage: add-dev MEM [{'|'.join(SCHEDULERS)}] [quantum=Q] [switch=C] [cores=K]")
+        return False
+    try:
+        mem_size = int(args[0])
+        quantum = int(opts.get("quantum", setup.quantum))
+        switch_cost = int(opts.get("switch", setup.switch_cost))
+        cores = int(opts.get("cores", setup.cores))
+    except ValueError:
+        print("MEM, quantum, switch and cores must be integers")
+        return False
+    if quantum < 0 or switch_cost < 0:
+        print("quantum and switch must not be negative")
+        return False
+    if cores < 1:
+        print("cores must be at least 1")
+        return False
+    kind = args[1].lower() if len(args) > 1 else setup.scheduler
+    if kind not in SCHEDULERS:
+        print(f"Unknown scheduler {kind!r}, expected one of {', '.join(SCHEDULERS)}")
+        return False
+
+    dev_id = get_next_device_id(sim)
+    mem = MEMORY_MANAGERS[setup.memory](mem_size)
+    os_ = make_os(mem, kind, logger, quantum, switch_cost, cores)
+    dev = SimpleDevice(_id=dev_id, _os=os_)
+    sim.add_device(dev)
+
+    logger.log(f"[CMD] Added device {dev_id} with memory={mem_size}, scheduler={kind}", device=dev_id)
+    print(f"Added device {dev_id} with memory={mem_size}, scheduler={kind}")
+    return True
+
+
+def do_add_proc(sim: SimulationEngine, logger: InMemoryLogger, setup: DeviceSetup, args: list[str]) -> bool:
+    if len(args) < 3:
+        print("Usage: add-proc DEV_ID CPU MEM [PRIO]")
+        return False
+    try:
+        dev_id = int(args[0])
+        cpu = int(args[1])
+        mem_req = int(args[2])
+        prio = int(args[3]) if len(args) > 3 else None
+    except ValueError:
+        print("DEV_ID, CPU, MEM and PRIO must be integers")
+        return False
+
+    dev = find_device(sim, dev_id)
+    if not dev:
+        print(f"No device with id={dev_id}")
+        return False
+
+    if prio is not None and not isinstance(dev.os(), (BasicOperatingSystem, MultiCoreOperatingSystem)):
+        print("PRIO needs the object engine (--engine object)")
+        return False
+    if isinstance(sim, ShardedSimulationEngine):
+        # devices are snapshots, the process has to be created in the worker
+        proc = sim.create_process(dev_id, cpu_time=cpu, mem_required=mem_req)
+    elif prio is not None:
+        proc = dev.os().create_process(cpu_time=cpu, mem_required=mem_req, priority=prio)
+    else:
+        proc = dev.os().create_process(cpu_time=cpu, mem_required=mem_req)
+    if proc is None:
+        print(f"Cannot create process on device {dev_id}: not enough memory")
+    else:
+        logger.log(
+            f"[CMD] Created process pid={proc.pid} with cpu_time={cpu} on device {dev_id}",
+            device=dev_id, pid=proc.pid,
+        )
+        print(f"Created process pid={proc.pid} with cpu_time={cpu} on device {dev_id}")
+    return True
+
+
+def do_remove_dev(sim: SimulationEngine, logger: InMemoryLogger, setup: DeviceSetup, args: list[str]) -> bool:
+    if len(args) < 1:
+        print("[CMD] Usage: remove-dev <device_id>")
+        return False
+
+    try:
+        dev_id = int(args[0])
+    except ValueError:
+        print("[CMD] device_id must be an integer")
+        return False
+
+    removed = bool(sim.remove_device(dev_id))
+    if removed:
+        logger.log(f"[CMD] Removed device {dev_id} and all its processes", device=dev_id)
+
+    if not removed:
+        print(f"[CMD] No device with id={dev_id}")
+    else:
+        print(f"Removed device {dev_id}")
+    return True
+
+
+# commands that change the cluster; they print their outcome and return
+# whether the state view should be shown afterwards
+CLUSTER_COMMANDS: dict[str, Callable[[SimulationEngine, InMemoryLogger, DeviceSetup, list[str]], bool]] = {
+    "send": do_send,
+    "add-dev": do_add_dev,
+    "add-proc": do_add_proc,
+    "remove-dev": do_remove_dev,
+}
+
+
+def live(
+        sim: SimulationEngine,
+        logger: InMemoryLogger,
+        setup: DeviceSetup,
+        rate: float,
+        fps: float = WATCH_FPS,
+        max_procs: int = WATCH_MAX_PROCS,
+) -> None:
+    """
+    Run the simulation at `rate` steps per second until `stop`, taking
+    cluster commands from the prompt between steps.
+    """
+    frame = TerminalFrame(fps=0, keep_cursor=True)
+    message = [color("live: send, add-dev, add-proc, remove-dev, rate R, pause, resume, stop", DIM)]
+    driver = RealtimeDriver(sim, rate=rate, fps=fps)
+
+    def render(s: SimulationEngine) -> None:
+        height = frame.height()
+        state = "paused" if driver.paused else f"{driver.rate:g} steps/s"
+        rows, _ = format_watch_frame(
+            s, s.devices, 0, height - 2, max_procs,
+            f"live {state}, {driver.dropped_frames} frames dropped",
+        )
+        frame.draw(rows + message)
+
+    def prompt() -> None:
+        height = frame.height()
+        frame.out.write(f"\033[{height};1H\033[K\033[{height - 1};1H\033[K")
+        frame.out.write(color("live> ", FG_GREEN))
+        frame.out.flush()
+
+    def run_command(line: str) -> None:
+        parts = line.split()
+        if not parts:
+            return
+        cmd, args = parts[0].lower(), parts[1:]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            if cmd in CLUSTER_COMMANDS:
+                CLUSTER_COMMANDS[cmd](sim, logger, setup, args)
+            elif cmd == "rate" and args:
+                try:
+                    driver.set_rate(float(args[0]))
+                    print(f"Rate set to {driver.rate:g} steps/s")
+                except ValueError:
+                    print("Usage: rate STEPS_PER_SECOND")
+            elif cmd in ("pause", "resume"):
+                driver.paused = cmd == "pause"
+                print("Paused" if driver.paused else "Resumed")
+            else:
+                print(f"Not available in live mode: {cmd}")
+        lines = out.getvalue().strip().splitlines()
+        message[0] = lines[-1] if lines else ""
+
+    async def session() -> None:
+        loop = asyncio.get_running_loop()
+        lines: asyncio.Queue = asyncio.Queue()
+        runner = asyncio.create_task(driver.run())
+        reader = None
+        fd = sys.stdin.fileno() if sys.stdin.isatty() else None
+        if fd is not None:
+            buf = bytearray()
+
+            def on_readable() -> None:
+                data = os.read(fd, 4096)
+                if not data:
+                    lines.put_nowait(None)
+                    loop.remove_reader(fd)
+                    return
+                buf.extend(data)
+                while b"\n" in buf:
+                    i = buf.index(b"\n")
+                    lines.put_nowait(buf[:i].decode(errors="ignore"))
+                    del buf[:i + 1]
+
+            try:
+                loop.add_reader(fd, on_readable)
+            except NotImplementedError:
+                fd = None
+        if fd is None:
+            # no selectable stdin (windows, pipes): read lines in a thread
+            async def read_lines() -> None:
+                while True:
+                    line = await loop.run_in_executor(None, sys.stdin.readline)
+                    lines.put_nowait(line.rstrip("\n") if line else None)
+                    if not line or line.strip() in ("stop", "quit", "exit"):
+                        return
+            reader = asyncio.create_task(read_lines())
+        try:
+            while True:
+                line = await lines.get()
+                if line is None or line.strip() in ("stop", "quit", "exit"):
+                    break
+                driver.submit(lambda line=line: run_command(line))
+                prompt()
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+            driver.stop()
+            await runner
+            if reader is not None:
+                await reader
+
+    driver.render = render
+    frame.open()
+    prompt()
+    try:
+        asyncio.run(session())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        frame.close()
+        frame.out.write("\033[J")
+    print(
+        f"Live mode stopped at t={sim.time}: {driver.steps} steps, "
+        f"{driver.frames} frames drawn, {driver.dropped_frames} dropped, "
+        f"{driver.skipped_steps} steps skipped"
+    )
+
+
+def run_headless(sim: SimulationEngine, steps: int, args) -> dict:
+    """Run `steps` steps without rendering and report throughput and counters."""
+    started = time.perf_counter()
+    sim.run(steps)
+    elapsed = time.perf_counter() - started
+
+    final = summarize_state(sim)
+    completed, failures = sim.completed_count, sim.failure_count
+    profile = {}
+    if getattr(sim, "workload", None) is not None:
+        profile["trace"] = sim.workload.stats()
+    if getattr(sim, "profiler", None) is not None:
+        profile["profile"] = sim.profiler.aggregates()
+        profile["slowest_devices"] = sim.profiler.slowest_devices(top=5)
+    if getattr(sim, "metrics", None) is not None:
+        profile["latency"] = sim.metrics.summary()
+    if getattr(sim, "transport", None) is not None:
+        profile["transfers"] = sim.transport.summary()
+    # reap the workers so their peak memory shows up in RUSAGE_CHILDREN
+    if isinstance(sim, ShardedSimulationEngine):
+        sim.close()
+
+    return {
+        "engine": args.engine,
+        "event_driven": args.event_driven,
+        "seed": args.seed,
+        "devices": args.devices,
+        "procs_per_device": args.procs,
+        "steps": steps,
+        "elapsed_s": round(elapsed, 6),
+        "steps_per_s": round(steps / elapsed, 2) if elapsed > 0 else None,
+        "processes_completed": completed,
+        "migrations": sim.total_moves,
+        "failures": failures,
+        "peak_memory": peak_memory(final),
+        # host memory of the simulator itself
+        "peak_rss_kb": peak_rss_kb(),
+        **profile,
+        "final_state": final,
+    }
+
+
 def find_device(sim: SimulationEngine, dev_id: int) -> IDevice | None:
     for d in sim.devices:
         if d.id == dev_id:
@@ -207,14 +895,15 @@ def find_device(sim: SimulationEngine, dev_id: int) -> IDevice | None:
     return None
 
 
-def repl(sim: SimulationEngine, logger: InMemoryLogger) -> None:
+def repl(sim: SimulationEngine, logger: InMemoryLogger, setup: DeviceSetup = DeviceSetup()) -> SimulationEngine:
+    """Run the console; returns the engine in use at exit (load replaces it)."""
     print(color("FakeOS simulation console. Type 'help' for commands.", FG_CYAN))
     while True:
         try:
             raw = input(color("> ", FG_GREEN)).strip()
         except (EOFError, KeyboardInterrupt):
             print("\nExiting.")
-            break
+            return sim
 
         if not raw:
             continue
@@ -225,7 +914,7 @@ def repl(sim: SimulationEngine, logger: InMemoryLogger) -> None:
 
         if cmd in ("quit", "exit"):
             print("Bye.")
-            break
+            return sim
 
         if cmd == "help":
             print_help()
@@ -243,18 +932,19 @@ def repl(sim: SimulationEngine, logger: InMemoryLogger) -> None:
                 except ValueError:
                     print("N must be an integer")
                     continue
-            for _ in range(max(1, n)):
-                sim.step()
+            sim.run(max(1, n))
             print_state(sim)
             continue
 
         if cmd == "watch":
             if not args:
-                print("Usage: watch N [delay_seconds]")
+                print("Usage: watch N [delay_seconds] [fps=F] [procs=K]")
                 continue
+            opts = dict(a.split("=", 1) for a in args if "=" in a)
+            args = [a for a in args if "=" not in a]
             try:
                 n = int(args[0])
-            except ValueError:
+            except (IndexError, ValueError):
                 print("N must be integer")
                 continue
             delay = 0.5
@@ -264,134 +954,177 @@ def repl(sim: SimulationEngine, logger: InMemoryLogger) -> None:
                 except ValueError:
                     print("delay must be number (seconds)")
                     continue
-            for i in range(max(1, n)):
-                sim.step()
-                print_state(sim)
-                print(color(f"(watch {i + 1}/{n}, delay={delay}s)", DIM))
-                try:
-                    time.sleep(delay)
-                except KeyboardInterrupt:
-                    print("\nWatch interrupted.")
-                    break
+            try:
+                fps = float(opts.get("fps", WATCH_FPS))
+                max_procs = int(opts.get("procs", WATCH_MAX_PROCS))
+            except ValueError:
+                print("fps must be a number and procs an integer")
+                continue
+            watch(sim, max(1, n), delay, fps=fps, max_procs=max_procs)
             continue
 
         if cmd == "state":
             print_state(sim)
             continue
 
-        if cmd == "send":
-            if len(args) < 3:
-                print("Usage: send FROM TO MESSAGE...")
+        if cmd in CLUSTER_COMMANDS:
+            if CLUSTER_COMMANDS[cmd](sim, logger, setup, args):
+                print_state(sim)
+            continue
+
+        if cmd == "live":
+            if not isinstance(sim, SimulationEngine):
+                print("live needs the object engine (--engine object)")
                 continue
+            opts = dict(a.split("=", 1) for a in args if "=" in a)
+            args = [a for a in args if "=" not in a]
             try:
-                from_id = int(args[0])
-                to_id = int(args[1])
+                rate = float(args[0]) if args else LIVE_RATE
+                fps = float(opts.get("fps", WATCH_FPS))
+                max_procs = int(opts.get("procs", WATCH_MAX_PROCS))
             except ValueError:
-                print("FROM and TO must be integers (device ids)")
-                continue
-            text = " ".join(args[2:])
-            if not sim.message_bus:
-                print("No message bus configured.")
+                print("Usage: live [steps_per_second] [fps=F] [procs=K]")
                 continue
-            msg = Message(from_device=from_id, to_device=to_id, payload=text)
-            sim.message_bus.send(msg)
-            print(f"Sent message from {from_id} to {to_id}")
+            live(sim, logger, setup, rate, fps=fps, max_procs=max_procs)
             continue
 
-        if cmd == "add-dev":
-            if len(args) < 1:
-                print("Usage: add-dev MEM")
+        if cmd in ("save", "load"):
+            if len(args) != 1:
+                print(f"Usage: {cmd} PATH")
+                continue
+            if not isinstance(sim, SimulationEngine):
+                print("save/load need the object engine (--engine object)")
                 continue
             try:
-                mem_size = int(args[0])
-            except ValueError:
-                print("MEM must be integer")
+                if cmd == "save":
+                    size = save_checkpoint(sim, args[0])
+                    print(f"Saved t={sim.time} to {args[0]} ({size} bytes)")
+                    continue
+                profiler, workload, metrics = sim.profiler, sim.workload, sim.metrics
+                sim = load_checkpoint(args[0], logger)
+                sim.profiler = profiler
+                sim.set_workload(workload)
+                if sim.metrics is None and metrics is not None:
+                    # the checkpoint has no latency store; start a fresh one
+                    sim.set_metrics(LatencyMetrics())
+            except (OSError, CheckpointError) as e:
+                print(f"Cannot {cmd} checkpoint: {e}")
                 continue
-
-            dev_id = get_next_device_id(sim)
-            mem = SimpleMemoryManager(_total=mem_size)
-            sched = RoundRobinScheduler()
-            os_ = BasicOperatingSystem(memory=mem, scheduler=sched, logger=logger)
-            dev = SimpleDevice(_id=dev_id, _os=os_)
-            sim.devices.append(dev)
-
-            logger.log(f"[CMD] Added device {dev_id} with memory={mem_size}")
-            print(f"Added device {dev_id} with memory={mem_size}")
+            logger.log(f"[CMD] Loaded checkpoint {args[0]} at t={sim.time}")
             print_state(sim)
             continue
 
-        if cmd == "add-proc":
-            if len(args) < 3:
-                print("Usage: add-proc DEV_ID CPU MEM")
-                continue
-            try:
-                dev_id = int(args[0])
-                cpu = int(args[1])
-                mem_req = int(args[2])
-            except ValueError:
-                print("DEV_ID, CPU and MEM must be integers")
+        if cmd == "trace":
+            workload = getattr(sim, "workload", None)
+            if not isinstance(workload, TraceWorkload):
+                print("No trace is being replayed (start with --trace PATH)")
                 continue
+            stats = workload.stats()
+            print(
+                f"Trace: {stats['injected']} injected, {stats['rejected_memory']} rejected "
+                f"for memory, {stats['unknown_device']} for unknown devices"
+                + (", exhausted" if stats["exhausted"] else "")
+            )
+            continue
 
-            dev = find_device(sim, dev_id)
-            if not dev:
-                print(f"No device with id={dev_id}")
+        if cmd == "profile":
+            if not isinstance(sim, SimulationEngine):
+                print("profile needs the object engine (--engine object)")
                 continue
-
-            proc = dev.os().create_process(cpu_time=cpu, mem_required=mem_req)
-            if proc is None:
-                print(f"Cannot create process on device {dev_id}: not enough memory")
-            else:
-                logger.log(f"[CMD] Created process pid={proc.pid} with cpu_time={cpu} on device {dev_id}")
-                print(f"Created process pid={proc.pid} with cpu_time={cpu} on device {dev_id}")
-
-            print_state(sim)
+            if args and args[0] in ("on", "off"):
+                sim.profiler = StepProfiler() if args[0] == "on" else None
+                print(f"Profiling {args[0]}")
+                continue
+            if sim.profiler is None:
+                print("Profiling is off (profile on, or start with --profile PATH)")
+                continue
+            if args:
+                try:
+                    rows = sim.profiler.export(args[0])
+                except OSError as e:
+                    print(f"Cannot write profile: {e}")
+                    continue
+                print(f"Wrote {rows} step samples to {args[0]}")
+                continue
+            print(format_profile(sim.profiler))
             continue
 
-        if cmd == "remove-dev":
-            if len(args) < 1:
-                print("[CMD] Usage: remove-dev <device_id>")
+        if cmd == "latency":
+            if not isinstance(sim, SimulationEngine):
+                print("latency needs the object engine (--engine object)")
+                continue
+            if args and args[0] in ("on", "off"):
+                sim.set_metrics(LatencyMetrics() if args[0] == "on" else None)
+                print(f"Latency metrics {args[0]}")
+                continue
+            if sim.metrics is None:
+                print("Latency metrics are off (latency on, or start with --latency)")
                 continue
+            print(format_latency(sim.metrics))
+            continue
 
+        if cmd == "history":
+            transport = getattr(sim, "transport", None)
+            if transport is None:
+                print("Processes keep no identity across moves (start with --transfer-cost X)")
+                continue
+            if not args:
+                print(format_transfers(transport))
+                continue
             try:
-                dev_id = int(args[0])
+                pid = int(args[0])
             except ValueError:
-                print("[CMD] device_id must be an integer")
+                print("Usage: history [PID]")
                 continue
-
-            removed = False
-            for d in list(sim.devices):
-                if d.id == dev_id:
-                    sim.devices.remove(d)
-                    removed = True
-                    logger.log(f"[CMD] Removed device {dev_id} and all its processes")
-                    break
-
-            if not removed:
-                print(f"[CMD] No device with id={dev_id}")
-            else:
-                print(f"Removed device {dev_id}")
-
-            print_state(sim)
+            records = transport.history.get(pid)
+            if not records:
+                print(f"pid={pid} has not moved")
+                continue
+            for r in records:
+                print(
+                    f"  t={r.sent}: device {r.source} -> {r.target}, mem={r.mem_required}, "
+                    f"cpu left={r.remaining}, arrives t={r.arrives} (delay {r.delay})"
+                )
             continue
 
         if cmd == "log":
             n = 20
-            if args:
-                try:
-                    n = int(args[0])
-                except ValueError:
-                    print("N must be an integer")
-                    continue
-            lines = logger.get_last(n)
-            print(color(f"--- Last {len(lines)} log lines ---", DIM))
-            for line in lines:
-                print(line)
+            filters = {}
+            try:
+                for arg in args:
+                    key, sep, value = arg.partition("=")
+                    if not sep:
+                        n = int(arg)
+                    elif key in ("dev", "device"):
+                        filters["device"] = int(value)
+                    elif key == "pid":
+                        filters["pid"] = int(value)
+                    elif key == "tag":
+                        filters["tag"] = value.strip("[]").upper()
+                    else:
+                        raise ValueError
+            except ValueError:
+                print("Usage: log [N] [dev=ID] [pid=PID] [tag=TAG]")
+                continue
+            entries = logger.query(n, **filters)
+            print(color(f"--- Last {len(entries)} log lines ---", DIM))
+            for entry in entries:
+                print(entry.message)
             print(color("--- end ---", DIM))
             continue
 
         print(f"Unknown command: {cmd}. Type 'help'.")
 
 
+def export_profile(sim: SimulationEngine, path: str) -> None:
+    if sim.profiler is None:
+        return
+    try:
+        sim.profiler.export(path)
+    except OSError as e:
+        raise SystemExit(f"Cannot write profile: {e}")
+
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Distributed OS Simulator"
@@ -425,23 +1158,286 @@ def parse_args():
         help="migration imbalance threshold (default=2)"
     )
 
+    parser.add_argument(
+        "--max-migrations", "-m",
+        type=int,
+        default=MAX_MIGRATIONS_PER_STEP,
+        help=f"max process migrations per step (default={MAX_MIGRATIONS_PER_STEP})"
+    )
+
+    parser.add_argument(
+        "--migrator",
+        choices=("heap", "steal"),
+        default="heap",
+        help="heap: move from the most to the least loaded device; steal: "
+             "idle devices pull from the busier of two random peers (default=heap)"
+    )
+
+    parser.add_argument(
+        "--transfer-cost",
+        type=float,
+        default=None,
+        help="move processes under their own pid (cluster-wide pids), "
+             "in flight for ceil(X * mem) extra steps; default: instant copy "
+             "under a new pid"
+    )
+
+    parser.add_argument(
+        "--engine", "-e",
+        choices=("object", "vector", "sharded"),
+        default="object",
+        help="simulation engine: object-per-process, NumPy vectorized "
+             "or sharded across worker processes (default=object)"
+    )
+
+    parser.add_argument(
+        "--memory",
+        choices=tuple(MEMORY_MANAGERS),
+        default="counter",
+        help="memory manager: plain usage counter or buddy allocator with "
+             "fragmentation (default=counter)"
+    )
+
+    parser.add_argument(
+        "--scheduler",
+        choices=tuple(SCHEDULERS),
+        default="rr",
+        help="per-device scheduler: round robin, static priority, shortest "
+             "remaining time first or multilevel feedback queue (default=rr)"
+    )
+
+    parser.add_argument(
+        "--quantum",
+        type=int,
+        default=0,
+        help="ticks a process runs before it is preempted back to the "
+             "scheduler; 0 runs it to completion (default=0)"
+    )
+
+    parser.add_argument(
+        "--switch-cost",
+        type=int,
+        default=0,
+        help="ticks lost whenever a device switches to another process (default=0)"
+    )
+
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=1,
+        help="cores per device, each with its own run queue; idle cores "
+             "steal waiting processes from busy ones (default=1)"
+    )
+
+    parser.add_argument(
+        "--event-driven",
+        action="store_true",
+        help="skip idle stretches on step/run N instead of ticking through them"
+    )
+
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes for --engine sharded (default=CPU count)"
+    )
+
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run --steps steps without the console and print a JSON report"
+    )
+
+    parser.add_argument(
+        "--steps", "-n",
+        type=int,
+        default=1000,
+        help="steps to run in --headless mode (default=1000)"
+    )
+
+    parser.add_argument(
+        "--seed", "-s",
+        type=int,
+        default=None,
+        help="seed for the failure model, for reproducible runs (default=random)"
+    )
+
+    parser.add_argument(
+        "--load",
+        metavar="PATH",
+        help="start from a checkpoint written by 'save' or --save instead of the demo setup"
+    )
+
+    parser.add_argument(
+        "--save",
+        metavar="PATH",
+        help="write a checkpoint after the --headless run"
+    )
+
+    parser.add_argument(
+        "--sweep",
+        metavar="GRID",
+        help="run a headless parameter sweep instead, e.g. "
+             "\"fail=0,0.05 imbalance=1,2,4 devices=10,50\" (also procs, recovery, "
+             "max_migrations); cells run on --workers processes for up to --steps steps"
+    )
+
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=1,
+        help="seeds per sweep cell, counted up from --seed (default=1)"
+    )
+
+    parser.add_argument(
+        "--sweep-out",
+        metavar="PATH",
+        default="sweep_results.csv",
+        help="CSV the sweep appends to; cells already in it are skipped (default=sweep_results.csv)"
+    )
+
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="replay process arrivals from a CSV or JSONL trace (time,device,"
+             "cpu_time,mem; .gz allowed), streamed while the object engine runs"
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="time every step phase (object engine) and write the samples "
+             "to PATH on exit, as CSV for *.csv and JSON otherwise"
+    )
+
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="record arrival, first-run and finish steps of every process "
+             "(object engine) and report wait / turnaround percentiles"
+    )
+
+    parser.add_argument(
+        "--log-capacity",
+        type=int,
+        default=LOG_CAPACITY,
+        help=f"log lines kept in memory (default={LOG_CAPACITY})"
+    )
+
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    logger = InMemoryLogger()
-    sim = build_demo_simulation(
-        logger=logger,
-        num_devices=args.devices,
-        procs_per_device=args.procs,
-        imbalance_threshold=args.imbalance,
-        fail_probability=args.fail,
-        proc_templates=PROC_TEMPLATES,
-    )
+    if args.quantum < 0 or args.switch_cost < 0:
+        raise SystemExit("--quantum and --switch-cost must not be negative")
+    if args.cores < 1:
+        raise SystemExit("--cores must be at least 1")
+    if args.transfer_cost is not None and args.transfer_cost < 0:
+        raise SystemExit("--transfer-cost must not be negative")
+    if args.sweep:
+        # imported here, the sweep module builds on this one
+        from os_sim.cli.sweep import main_sweep
+        main_sweep(args)
+        return
+    logger = InMemoryLogger(_max_lines=args.log_capacity)
+    if args.load:
+        try:
+            sim = load_checkpoint(args.load, logger)
+        except (OSError, CheckpointError) as e:
+            raise SystemExit(f"Cannot load checkpoint: {e}")
+        sim.event_driven = sim.event_driven or args.event_driven
+    elif args.engine == "vector":
+        if (args.memory, args.scheduler, args.quantum, args.switch_cost, args.cores) != ("counter", "rr", 0, 0, 1):
+            raise SystemExit("The vector engine cannot take this setup: unsupported OS/scheduler/memory stack")
+        if args.migrator == "steal":
+            raise SystemExit("--migrator steal needs --engine object")
+        if args.transfer_cost is not None:
+            raise SystemExit("--transfer-cost needs --engine object")
+        sim = build_demo_vector_simulation(
+            logger=logger,
+            num_devices=args.devices,
+            procs_per_device=args.procs,
+            imbalance_threshold=args.imbalance,
+            fail_probability=args.fail,
+            proc_templates=PROC_TEMPLATES,
+            max_migrations=args.max_migrations,
+            seed=args.seed,
+        )
+    else:
+        sim = build_demo_simulation(
+            logger=logger,
+            num_devices=args.devices,
+            procs_per_device=args.procs,
+            imbalance_threshold=args.imbalance,
+            fail_probability=args.fail,
+            proc_templates=PROC_TEMPLATES,
+            max_migrations=args.max_migrations,
+            seed=args.seed,
+            memory=args.memory,
+            scheduler=args.scheduler,
+            quantum=args.quantum,
+            switch_cost=args.switch_cost,
+            cores=args.cores,
+            migrator=args.migrator,
+            transfer_cost=args.transfer_cost,
+        )
+        sim.event_driven = args.event_driven
+    if args.engine != "object" and isinstance(getattr(sim, "task_migrator", None), StealingTaskMigrator):
+        raise SystemExit("--migrator steal needs --engine object")
+    if args.engine != "object" and getattr(sim, "transport", None) is not None:
+        raise SystemExit("--transfer-cost needs --engine object")
+    if args.engine == "vector" and isinstance(sim, SimulationEngine):
+        sim = to_vector_engine(sim)
+    elif args.engine == "sharded":
+        sim = ShardedSimulationEngine.from_engine(sim, workers=args.workers)
+    if args.profile:
+        if not isinstance(sim, SimulationEngine):
+            raise SystemExit("--profile needs --engine object")
+        sim.profiler = StepProfiler()
+    if args.latency:
+        if not isinstance(sim, SimulationEngine):
+            raise SystemExit("--latency needs --engine object")
+        if sim.metrics is None:
+            # a loaded checkpoint brings its own store
+            sim.set_metrics(LatencyMetrics())
+    if args.trace:
+        if not isinstance(sim, SimulationEngine):
+            raise SystemExit("--trace needs --engine object")
+        try:
+            sim.set_workload(TraceWorkload(read_trace(args.trace), logger=logger))
+        except (OSError, TraceError) as e:
+            raise SystemExit(f"Cannot replay trace: {e}")
+    if args.headless:
+        try:
+            report = run_headless(sim, max(0, args.steps), args)
+        except TraceError as e:
+            raise SystemExit(f"Bad trace: {e}")
+        finally:
+            if isinstance(sim, ShardedSimulationEngine):
+                sim.close()
+        if args.save:
+            if not isinstance(sim, SimulationEngine):
+                raise SystemExit("--save needs --engine object")
+            try:
+                report["checkpoint_bytes"] = save_checkpoint(sim, args.save)
+            except (OSError, CheckpointError) as e:
+                raise SystemExit(f"Cannot save checkpoint: {e}")
+        if args.profile:
+            export_profile(sim, args.profile)
+        print(json.dumps(report, indent=2))
+        return
     clear_screen()
     print_state(sim)
-    repl(sim, logger)
+    try:
+        sim = repl(sim, logger, DeviceSetup(args.memory, args.scheduler, args.quantum, args.switch_cost, args.cores))
+    except TraceError as e:
+        raise SystemExit(f"Bad trace: {e}")
+    finally:
+        if isinstance(sim, ShardedSimulationEngine):
+            sim.close()
+    if args.profile:
+        export_profile(sim, args.profile)
 
 
 if __name__ == "__main__":
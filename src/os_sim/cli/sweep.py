@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List
+
+from os_sim.application.logging.in_memory_logger import InMemoryLogger
+from os_sim.cli.main import RECOVERY_DELAY, build_demo_simulation
+
+# grid parameter -> type; also the leading columns of the results table
+SWEEP_PARAMS: Dict[str, type] = {
+    "devices": int,
+    "procs": int,
+    "fail": float,
+    "imbalance": int,
+    "recovery": int,
+    "max_migrations": int,
+}
+RESULT_FIELDS = (
+    *SWEEP_PARAMS,
+    "memory",
+    "seed",
+    "steps",
+    "completion_time",
+    "completed",
+    "throughput_per_s",
+    "completed_per_step",
+    "migrations",
+    "failures",
+    "mem_util_mean",
+    "mem_util_peak",
+    "elapsed_s",
+)
+# averaged over seeds in the summary table
+_METRICS = (
+    "completion_time",
+    "completed",
+    "throughput_per_s",
+    "completed_per_step",
+    "migrations",
+    "failures",
+    "mem_util_mean",
+    "mem_util_peak",
+)
+
+
+def parse_grid(spec: str, defaults: Dict[str, object]) -> List[Dict[str, object]]:
+    """
+    Expand `name=v1,v2 name=v3 ...` into one cell per combination; names
+    not in the spec keep their value from `defaults`.
+    """
+    axes: Dict[str, list] = {name: [defaults[name]] for name in SWEEP_PARAMS}
+    for part in spec.split():
+        name, sep, values = part.partition("=")
+        if not sep or name not in SWEEP_PARAMS:
+            raise ValueError(f"bad grid entry {part!r}, expected one of {', '.join(SWEEP_PARAMS)}=V1,V2,...")
+        axes[name] = [SWEEP_PARAMS[name](v) for v in values.split(",") if v]
+    return [dict(zip(axes, combo)) for combo in itertools.product(*axes.values())]
+
+
+# identifies a run; without the trailing seed, a grid point
+_KEY_FIELDS = (*SWEEP_PARAMS, "memory", "steps")
+
+
+def _key(row: Dict[str, object]) -> tuple:
+    return (
+        *(SWEEP_PARAMS[name](row[name]) for name in SWEEP_PARAMS),
+        str(row["memory"]),
+        int(row["steps"]),
+        int(row["seed"]),
+    )
+
+
+def run_cell(cell: Dict[str, object]) -> Dict[str, object]:
+    """
+    One headless run: steps until every process completed or `steps` ran.
+    Memory utilisation is sampled on ~100 evenly spaced steps.
+    """
+    sim = build_demo_simulation(
+        logger=InMemoryLogger(_max_lines=1),
+        num_devices=cell["devices"],
+        procs_per_device=cell["procs"],
+        imbalance_threshold=cell["imbalance"],
+        fail_probability=cell["fail"],
+        max_migrations=cell["max_migrations"],
+        seed=cell["seed"],
+        memory=cell["memory"],
+        recovery_delay=cell["recovery"],
+    )
+    steps = cell["steps"]
+    sample_every = max(1, steps // 100)
+    mem_total = sum(d.os().memory.total for d in sim.devices) or 1
+    utils: List[float] = []
+    completion_time = None
+
+    started = time.perf_counter()
+    for _ in range(steps):
+        sim.step()
+        if sim.time % sample_every == 0:
+            utils.append(sum(d.os().memory.used for d in sim.devices) / mem_total)
+        if not any(d.os().load for d in sim.devices):
+            completion_time = sim.time
+            break
+    elapsed = time.perf_counter() - started
+
+    completed = sim.completed_count
+    return {
+        **cell,
+        "completion_time": completion_time,
+        "completed": completed,
+        "throughput_per_s": round(completed / elapsed, 2) if elapsed > 0 else None,
+        "completed_per_step": round(completed / sim.time, 4) if sim.time else 0.0,
+        "migrations": sim.total_moves,
+        "failures": sim.failure_count,
+        "mem_util_mean": round(sum(utils) / len(utils), 4) if utils else 0.0,
+        "mem_util_peak": round(max(utils, default=0.0), 4),
+        "elapsed_s": round(elapsed, 4),
+    }
+
+
+def read_results(path: str) -> List[Dict[str, object]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        return [row for row in csv.DictReader(f) if row.get("elapsed_s")]
+
+
+def run_sweep(
+        cells: Iterable[Dict[str, object]],
+        out_path: str,
+        workers: int,
+        progress: Callable[[str], None] = print,
+) -> List[Dict[str, object]]:
+    """
+    Run every cell not already in `out_path` on a process pool, appending
+    each result as it finishes so an interrupted sweep resumes where it
+    stopped. Returns all rows, earlier ones included.
+    """
+    rows = read_results(out_path)
+    done = {_key(r) for r in rows}
+    pending = [c for c in cells if _key(c) not in done]
+    if rows:
+        progress(f"resuming: {len(rows)} cells already in {out_path}, {len(pending)} to run")
+
+    new_file = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+    with open(out_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        # biggest cells first, so no worker is left with a long one at the end
+        pending.sort(key=lambda c: c["devices"] * c["procs"], reverse=True)
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(run_cell, c) for c in pending]
+            for i, fut in enumerate(as_completed(futures), 1):
+                row = fut.result()
+                writer.writerow(row)
+                f.flush()
+                rows.append(row)
+                progress(f"[{i}/{len(pending)}] " + " ".join(f"{n}={row[n]}" for n in (*SWEEP_PARAMS, "seed")))
+    return rows
+
+
+def aggregate(rows: Iterable[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Mean of every metric over the seeds of each grid point."""
+    groups: Dict[tuple, List[Dict[str, object]]] = {}
+    for row in rows:
+        groups.setdefault(_key(row)[:-1], []).append(row)
+    table = []
+    for key in sorted(groups):
+        group = groups[key]
+        out: Dict[str, object] = dict(zip(_KEY_FIELDS, key))
+        out["seeds"] = len(group)
+        for name in _METRICS:
+            values = [float(r[name]) for r in group if r[name] not in (None, "")]
+            out[name] = round(sum(values) / len(values), 4) if values else None
+        # runs that finished every process within the step budget
+        out["finished_runs"] = sum(1 for r in group if r["completion_time"] not in (None, ""))
+        table.append(out)
+    return table
+
+
+def format_table(table: List[Dict[str, object]]) -> str:
+    if not table:
+        return "(no results)"
+    columns = list(table[0])
+    cells = [[("-" if row[c] is None else str(row[c])) for c in columns] for row in table]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = [" | ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines.append("-+-".join("-" * w for w in widths))
+    lines.extend(" | ".join(v.rjust(w) for v, w in zip(r, widths)) for r in cells)
+    return "\n".join(lines)
+
+
+def sweep_defaults(args) -> Dict[str, object]:
+    """Grid defaults taken from the regular command-line options."""
+    return {
+        "devices": args.devices,
+        "procs": args.procs,
+        "fail": args.fail,
+        "imbalance": args.imbalance,
+        "recovery": RECOVERY_DELAY,
+        "max_migrations": args.max_migrations,
+    }
+
+
+def main_sweep(args) -> None:
+    try:
+        grid = parse_grid(args.sweep, sweep_defaults(args))
+    except ValueError as e:
+        raise SystemExit(f"Cannot parse --sweep: {e}")
+    base_seed = args.seed or 0
+    cells = [
+        {**point, "memory": args.memory, "seed": base_seed + i, "steps": max(1, args.steps)}
+        for point in grid
+        for i in range(max(1, args.seeds))
+    ]
+    try:
+        rows = run_sweep(cells, args.sweep_out, args.workers)
+    except KeyboardInterrupt:
+        raise SystemExit(f"Sweep interrupted; finished cells are in {args.sweep_out}, rerun to resume")
+    print(format_table(aggregate(rows)))
+
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, TextIO
+
+try:
+    import select
+    import termios
+    import tty
+except ImportError:  # windows: no key handling while watching
+    termios = None
+
+CSI = "\033["
+
+
+@dataclass(slots=True)
+class TerminalFrame:
+    """
+    Full-screen frame that only rewrites the rows that changed since the
+    previous frame, at most `fps` times per second.
+
+    Line wrapping is switched off while the frame is open, so every line
+    occupies exactly one terminal row and rows can be addressed directly.
+    With `keep_cursor` the cursor stays visible and where it was (e.g. on a
+    prompt line below the frame) across draws.
+    """
+    out: TextIO = field(default_factory=lambda: sys.stdout)
+    fps: float = 20.0
+    keep_cursor: bool = False
+    _rows: List[str] = field(default_factory=list)
+    _last_draw: float = 0.0
+
+    def open(self) -> None:
+        # hide cursor, no autowrap, clear
+        hide = "" if self.keep_cursor else f"{CSI}?25l"
+        self.out.write(f"{hide}{CSI}?7l{CSI}2J{CSI}H")
+        self.out.flush()
+        self._rows = []
+        self._last_draw = 0.0
+
+    def close(self) -> None:
+        self.out.write(f"{CSI}{len(self._rows) + 1};1H{CSI}?7h{CSI}?25h")
+        self.out.flush()
+
+    def height(self) -> int:
+        return shutil.get_terminal_size().lines
+
+    def due(self) -> bool:
+        """True when the frame cap allows drawing again."""
+        return self.fps <= 0 or time.perf_counter() - self._last_draw >= 1.0 / self.fps
+
+    def draw(self, rows: List[str]) -> int:
+        """Write the rows that differ from the last frame; returns how many."""
+        prev = self._rows
+        parts: List[str] = []
+        for i, row in enumerate(rows):
+            if i >= len(prev) or prev[i] != row:
+                parts.append(f"{CSI}{i + 1};1H{row}{CSI}K")
+        if len(rows) < len(prev):
+            # erase what the longer previous frame left below
+            parts.append(f"{CSI}{len(rows) + 1};1H{CSI}J")
+        changed = len(parts)
+        if parts:
+            if self.keep_cursor:
+                # save / restore cursor position around the update
+                parts.insert(0, "\0337")
+                parts.append("\0338")
+            self.out.write("".join(parts))
+            self.out.flush()
+        self._rows = rows
+        self._last_draw = time.perf_counter()
+        return changed
+
+
+class KeyReader:
+    """
+    Non-blocking single key reads from a terminal stdin, as a context
+    manager. Reads nothing when stdin is not a tty or on platforms without
+    termios.
+    """
+
+    def __init__(self, stream: TextIO = sys.stdin) -> None:
+        self._stream = stream
+        self._fd: Optional[int] = None
+        self._saved = None
+
+    def __enter__(self) -> "KeyReader":
+        if termios is not None and self._stream.isatty():
+            self._fd = self._stream.fileno()
+            self._saved = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._fd is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved)
+            self._fd = None
+
+    def read(self) -> Optional[str]:
+        """Next pending key or escape sequence, or None."""
+        if self._fd is None or not select.select([self._fd], [], [], 0)[0]:
+            return None
+        # one read picks up a whole escape sequence (e.g. page down)
+        return os.read(self._fd, 16).decode(errors="ignore")
@@ -0,0 +1,15 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """
+    One structured log record. `tag` is the bracketed prefix of the
+    message without brackets (e.g. "OS", "IPC", "MIGRATION").
+    """
+    time: int
+    tag: str | None
+    device: int | None
+    pid: int | None
+    message: str
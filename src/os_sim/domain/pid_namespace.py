@@ -0,0 +1,17 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class PidNamespace:
+    """
+    Cluster-wide pid counter. OSes sharing one hand out pids that are unique
+    across devices, so a process can keep its pid when it moves.
+    """
+    next_pid: int = 1
+
+    def take(self, count: int = 1) -> int:
+        """Reserve `count` consecutive pids and return the first."""
+        first = self.next_pid
+        self.next_pid += count
+        return first
@@ -0,0 +1,299 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .states import ProcessState
+
+# state code of a removed row until the next compaction
+_FREE = 0
+_STATES = {s.value: s for s in ProcessState}
+_READY = ProcessState.READY.value
+_COLUMNS = (
+    "pid", "cpu_time", "remaining", "mem_required", "state", "arrival", "first_run", "migrations", "priority",
+)
+# first_run of a process that has not been scheduled yet
+NOT_RUN = -1
+
+
+@dataclass(slots=True)
+class ProcessTable:
+    """
+    Process records stored column by column in typed arrays (~55 bytes each).
+
+    Rows are only ever appended, so iteration follows the order processes
+    entered the table. While pids arrive in increasing order (an OS
+    numbering its own processes) the pid column is sorted and lookups are
+    a bisect; the first pid that arrives out of order (a process moved in
+    from another device) switches lookups to a pid -> row dict. Removed
+    rows are only marked free and get squeezed out once they outnumber the
+    live ones; `epoch` changes whenever rows move.
+    """
+    pid: array = field(default_factory=lambda: array("q"))
+    cpu_time: array = field(default_factory=lambda: array("q"))
+    remaining: array = field(default_factory=lambda: array("q"))
+    mem_required: array = field(default_factory=lambda: array("q"))
+    state: array = field(default_factory=lambda: array("b"))
+    # latency bookkeeping: step of arrival and first run, moves so far
+    arrival: array = field(default_factory=lambda: array("q"))
+    first_run: array = field(default_factory=lambda: array("q"))
+    migrations: array = field(default_factory=lambda: array("i"))
+    # scheduling priority, lower runs first (see PriorityScheduler)
+    priority: array = field(default_factory=lambda: array("h"))
+    epoch: int = 0
+    _live: int = 0
+    # pid -> row of live rows, once the pid column is no longer sorted
+    _index: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_columns(
+            cls, pid: array, cpu_time: array, remaining: array, mem_required: array, state: array,
+            arrival: array, first_run: array, migrations: array, priority: array,
+    ) -> "ProcessTable":
+        """Adopt columns without free rows, pids ascending (no copy is made)."""
+        return cls(
+            pid, cpu_time, remaining, mem_required, state, arrival, first_run, migrations, priority,
+            _live=len(pid),
+        )
+
+    # ---- rows ----
+
+    def add(
+            self,
+            pid: int,
+            cpu_time: int,
+            mem_required: int,
+            state: ProcessState = ProcessState.READY,
+            arrival: int = 0,
+            priority: int = 0,
+    ) -> "ProcessRef":
+        row = len(self.pid)
+        index = self._index
+        if index is None and row and pid <= self.pid[-1]:
+            index = self._build_index()
+        if index is not None:
+            if pid in index:
+                raise ValueError(f"pid {pid} is already in the table")
+            index[pid] = row
+        self.pid.append(pid)
+        self.cpu_time.append(cpu_time)
+        self.remaining.append(cpu_time)
+        self.mem_required.append(mem_required)
+        self.state.append(state.value)
+        self.arrival.append(arrival)
+        self.first_run.append(NOT_RUN)
+        self.migrations.append(0)
+        self.priority.append(priority)
+        self._live += 1
+        return ProcessRef(self, pid, row, self.epoch)
+
+    def extend(
+            self,
+            first_pid: int,
+            cpu_times: Sequence[int],
+            mem_required: Sequence[int],
+            arrival: int = 0,
+            priority: int = 0,
+    ) -> List["ProcessRef"]:
+        """Add READY rows for pids first_pid, first_pid + 1, ..., one column extend each."""
+        count = len(cpu_times)
+        n = len(self.pid)
+        pids = range(first_pid, first_pid + count)
+        index = self._index
+        if index is None and n and first_pid <= self.pid[-1]:
+            index = self._build_index()
+        if index is not None:
+            taken = next((p for p in pids if p in index), None)
+            if taken is not None:
+                raise ValueError(f"pid {taken} is already in the table")
+            index.update(zip(pids, range(n, n + count)))
+        self.pid.extend(pids)
+        self.cpu_time.extend(cpu_times)
+        self.remaining.extend(cpu_times)
+        self.mem_required.extend(mem_required)
+        self.state.extend(array("b", (_READY,)) * count)
+        self.arrival.extend(array("q", (arrival,)) * count)
+        self.first_run.extend(array("q", (NOT_RUN,)) * count)
+        self.migrations.extend(array("i", (0,)) * count)
+        self.priority.extend(array("h", (priority,)) * count)
+        self._live += count
+        return list(map(ProcessRef, repeat(self, count), pids, range(n, n + count), repeat(self.epoch, count)))
+
+    def _build_index(self) -> Dict[int, int]:
+        live = self.state
+        self._index = dict(zip(compress(self.pid, live), compress(range(len(live)), live)))
+        return self._index
+
+    @property
+    def pid_ordered(self) -> bool:
+        """True while rows are in pid order (no pid arrived out of order)."""
+        return self._index is None
+
+    def row_of(self, pid: int) -> Optional[int]:
+        if self._index is not None:
+            return self._index.get(pid)
+        row = bisect_left(self.pid, pid)
+        if row < len(self.pid) and self.pid[row] == pid and self.state[row] != _FREE:
+            return row
+        return None
+
+    def get(self, pid: int) -> Optional["ProcessRef"]:
+        row = self.row_of(pid)
+        return None if row is None else ProcessRef(self, pid, row, self.epoch)
+
+    def remove(self, pid: int) -> bool:
+        row = self.row_of(pid)
+        if row is None:
+            return False
+        self.state[row] = _FREE
+        self._live -= 1
+        if self._index is not None:
+            del self._index[pid]
+        free = len(self.pid) - self._live
+        if free > 32 and free > self._live:
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        # free rows are the zero state codes, so the state column is the mask
+        live = self.state
+        for name in _COLUMNS:
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, compress(col, live)))
+        if self._index is not None:
+            self._index = {pid: row for row, pid in enumerate(self.pid)}
+        self.epoch += 1
+
+    # ---- bulk queries ----
+
+    def count(self, *states: ProcessState) -> int:
+        return sum(self.state.count(s.value) for s in states)
+
+    def first(self, *states: ProcessState) -> Optional["ProcessRef"]:
+        """Process in any of `states` that entered the table first."""
+        best: Optional[int] = None
+        for s in states:
+            try:
+                row = self.state.index(s.value, 0, len(self.state) if best is None else best)
+            except ValueError:
+                continue
+            best = row
+        return None if best is None else ProcessRef(self, self.pid[best], best, self.epoch)
+
+    def live_columns(self) -> List[array]:
+        """Copies of the columns without free rows, in `pid, cpu_time,
+        remaining, mem_required, state, arrival, first_run, migrations,
+        priority` order."""
+        cols = [getattr(self, name) for name in _COLUMNS]
+        if self._live == len(self.pid):
+            return [array(col.typecode, col) for col in cols]
+        return [array(col.typecode, compress(col, self.state)) for col in cols]
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, pid: int) -> bool:
+        return self.row_of(pid) is not None
+
+    def __iter__(self) -> Iterator["ProcessRef"]:
+        """Live rows in the order they were added; do not add or remove while iterating."""
+        epoch = self.epoch
+        for row in compress(range(len(self.state)), self.state):
+            yield ProcessRef(self, self.pid[row], row, epoch)
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class ProcessRef:
+    """
+    Row view with the attributes of a Process. It follows its pid if the
+    table compacts, and raises LookupError once the pid has been removed.
+    """
+    table: ProcessTable
+    pid: int
+    _row: int = -1
+    _epoch: int = -1
+
+    @property
+    def row(self) -> int:
+        """Current row of this pid in `table` (valid until the table changes)."""
+        t = self.table
+        if self._epoch != t.epoch or t.state[self._row] == _FREE:
+            row = t.row_of(self.pid)
+            if row is None:
+                raise LookupError(f"pid {self.pid} is not in the process table")
+            self._row, self._epoch = row, t.epoch
+        return self._row
+
+    @property
+    def cpu_time(self) -> int:
+        return self.table.cpu_time[self.row]
+
+    @property
+    def mem_required(self) -> int:
+        return self.table.mem_required[self.row]
+
+    @property
+    def remaining(self) -> int:
+        return self.table.remaining[self.row]
+
+    @remaining.setter
+    def remaining(self, value: int) -> None:
+        self.table.remaining[self.row] = value
+
+    @property
+    def state(self) -> ProcessState:
+        return _STATES[self.table.state[self.row]]
+
+    @state.setter
+    def state(self, value: ProcessState) -> None:
+        self.table.state[self.row] = value.value
+
+    @property
+    def arrival(self) -> int:
+        return self.table.arrival[self.row]
+
+    @arrival.setter
+    def arrival(self, value: int) -> None:
+        self.table.arrival[self.row] = value
+
+    @property
+    def first_run(self) -> int:
+        return self.table.first_run[self.row]
+
+    @first_run.setter
+    def first_run(self, value: int) -> None:
+        self.table.first_run[self.row] = value
+
+    @property
+    def migrations(self) -> int:
+        return self.table.migrations[self.row]
+
+    @migrations.setter
+    def migrations(self, value: int) -> None:
+        self.table.migrations[self.row] = value
+
+    @property
+    def priority(self) -> int:
+        return self.table.priority[self.row]
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        self.table.priority[self.row] = value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ProcessRef):
+            return NotImplemented
+        return self.table is other.table and self.pid == other.pid
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.pid))
+
+    def __repr__(self) -> str:
+        try:
+            return (f"ProcessRef(pid={self.pid}, cpu_time={self.cpu_time}, "
+                    f"mem_required={self.mem_required}, remaining={self.remaining}, "
+                    f"state={self.state.name})")
+        except LookupError:
+            return f"ProcessRef(pid={self.pid}, removed)"
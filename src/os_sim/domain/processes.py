@@ -10,6 +10,8 @@ class Process:
     mem_required: int
     remaining: int = field(init=False)
     state: ProcessState = field(default=ProcessState.READY)
+    # lower runs first under PriorityScheduler
+    priority: int = 0
 
     def __post_init__(self) -> None:
         self.remaining = self.cpu_time
@@ -23,6 +23,14 @@ class IDevice(ABC):
     def tick(self) -> None:
         ...
 
+    @abstractmethod
+    def fail(self) -> None:
+        ...
+
+    @abstractmethod
+    def recover(self) -> None:
+        ...
+
     @abstractmethod
     def is_alive(self) -> bool:
         """Удобный шорткат — «онлайн ли девайс»."""
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Sequence
+from typing import Optional, Sequence
 from os_sim.interfaces.device import IDevice
 
 
@@ -11,3 +11,16 @@ class IFailureStrategy(ABC):
         Application of recover and failure strategy.
         """
         ...
+
+    def next_event_time(self, time: int, devices: Sequence[IDevice]) -> Optional[int]:
+        """
+        Earliest step after `time` at which apply() may change a device,
+        or None if it never will. Used by the event-driven engine to skip steps.
+        """
+        return time + 1
+
+    def on_device_added(self, device: IDevice, time: int) -> None:
+        """Hook for strategies that keep per-device state; `time` is the current step."""
+
+    def on_device_removed(self, device_id: int) -> None:
+        """Hook for strategies that keep per-device state."""
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Iterable, List
+from typing import Collection, Dict, Iterable, List, Optional
 from os_sim.domain.messages import Message
 
 
@@ -14,3 +14,35 @@ class IMessageBus(ABC):
     def poll_for_device(self, device_id: int) -> List[Message]:
         """Pull all messages addressed to a device and remove them from the bus."""
         ...
+
+    @abstractmethod
+    def drain_all(
+            self, device_ids: Optional[Collection[int]] = None
+    ) -> Dict[int, List[Message]]:
+        """
+        Pull pending messages grouped by destination device in one call.
+        If device_ids is given, mail for other destinations stays on the bus.
+        """
+        ...
+
+    def on_device_added(self, device_id: int) -> None:
+        """Mail already waiting for `device_id` should go out on the next drain_all."""
+
+    @property
+    @abstractmethod
+    def pending_count(self) -> int:
+        """Number of messages waiting on the bus."""
+        ...
+
+    @property
+    def fresh_count(self) -> int:
+        """
+        Destinations the next drain_all will offer mail for. Mail parked for
+        devices the caller did not know is left out; buses that do not park
+        report pending_count.
+        """
+        return self.pending_count
+
+    def send_many(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            self.send(message)
@@ -2,14 +2,19 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List
 
+from os_sim.domain.log_entry import LogEntry
+
 
 class ILogger(ABC):
     """Simple logging interface"""
 
     @abstractmethod
-    def log(self, message: str) -> None:
+    def log(self, message: str, *, device: int | None = None, pid: int | None = None) -> None:
         ...
 
+    def set_time(self, time: int) -> None:
+        """Simulation time stamped on subsequent entries."""
+
 
 class IReadableLogger(ILogger, ABC):
     """Logger extension for reading logs."""
@@ -17,3 +22,15 @@ class IReadableLogger(ILogger, ABC):
     @abstractmethod
     def get_last(self, n: int = 20) -> List[str]:
         ...
+
+    @abstractmethod
+    def query(
+            self,
+            n: int = 20,
+            *,
+            tag: str | None = None,
+            device: int | None = None,
+            pid: int | None = None,
+    ) -> List[LogEntry]:
+        """Last n entries matching every given filter, oldest first."""
+        ...
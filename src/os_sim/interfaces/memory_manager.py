@@ -1,18 +1,22 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
 
 
 class IMemoryManager(ABC):
+    # `owner` is the allocation handle (the pid for process memory); managers
+    # that place blocks use it to free the right one
+
     @abstractmethod
     def can_alloc(self, amount: int) -> bool:
         ...
 
     @abstractmethod
-    def alloc(self, amount: int) -> bool:
+    def alloc(self, amount: int, owner: Optional[int] = None) -> bool:
         ...
 
     @abstractmethod
-    def free(self, amount: int) -> None:
+    def free(self, amount: int, owner: Optional[int] = None) -> None:
         ...
 
     @property
@@ -24,3 +28,31 @@ class IMemoryManager(ABC):
     @abstractmethod
     def used(self) -> int:
         ...
+
+    @property
+    def peak_used(self) -> int:
+        """Highest `used` seen so far; managers that do not track it report `used`."""
+        return self.used
+
+    def alloc_many(self, amounts: Sequence[int], first_owner: int) -> List[bool]:
+        """
+        Allocate a batch in order; one success flag per request. Successful
+        requests are owned by first_owner, first_owner + 1, ... in turn.
+        """
+        flags = []
+        owner = first_owner
+        for amount in amounts:
+            ok = self.alloc(amount, owner)
+            owner += ok
+            flags.append(ok)
+        return flags
+
+    @property
+    def largest_free_block(self) -> int:
+        """Largest single allocation that would currently succeed."""
+        return self.total - self.used
+
+    @property
+    def fragmentation(self) -> float:
+        """External fragmentation, 1 - largest free block / free memory."""
+        return 0.0
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional, Iterable
+from typing import Iterable, List, Optional, Tuple
 
 from os_sim.domain.processes import Process
 from os_sim.domain.messages import Message
+from os_sim.domain.states import ProcessState
 
 
 class IOperatingSystem(ABC):
@@ -14,6 +15,13 @@ class IOperatingSystem(ABC):
     def create_process(self, cpu_time: int, mem_required: int) -> Optional[Process]:
         ...
 
+    def create_processes(self, specs: Iterable[Tuple[int, int]]) -> List[Optional[Process]]:
+        """
+        Create a batch of (cpu_time, mem_required) processes in order; one
+        entry per spec, None where the spec did not fit in memory.
+        """
+        return [self.create_process(cpu_time, mem) for cpu_time, mem in specs]
+
     @abstractmethod
     def tick(self) -> None:
         ...
@@ -22,6 +30,53 @@ class IOperatingSystem(ABC):
     def processes(self) -> Iterable[Process]:
         ...
 
+    @abstractmethod
+    def get_process(self, pid: int) -> Optional[Process]:
+        """Look up a live process by pid."""
+        ...
+
+    @abstractmethod
+    def evict_process(self, pid: int) -> Optional[Process]:
+        """Mark a process as MIGRATED and schedule it for reaping."""
+        ...
+
+    def adopt_process(self, proc: Process, blocked: bool = False) -> Optional[Process]:
+        """
+        Take over `proc` from another device under the same pid, with its
+        remaining CPU time; BLOCKED until unblock_process() if `blocked`.
+        None if the pid is taken, memory is short or moving is unsupported.
+        """
+        return None
+
+    def unblock_process(self, pid: int) -> Optional[Process]:
+        """Make a BLOCKED process READY; None if there is no such process."""
+        return None
+
+    @property
+    def active_load(self) -> int:
+        """READY / RUNNING processes, the ones a migrator can move away."""
+        return self.count_processes(ProcessState.READY, ProcessState.RUNNING)
+
+    def count_processes(self, *states: ProcessState) -> int:
+        """Number of processes in any of `states`."""
+        return sum(1 for p in self.processes() if p.state in states)
+
+    def first_process(self, *states: ProcessState) -> Optional[Process]:
+        """Oldest process in any of `states`."""
+        return next((p for p in self.processes() if p.state in states), None)
+
+    def next_event_in(self) -> Optional[int]:
+        """
+        Number of ticks until the tick in which more happens than the current
+        process burning one unit of CPU (1 = the next tick), None if never.
+        """
+        return 1
+
+    def fast_forward(self, ticks: int) -> None:
+        """Apply `ticks` ticks at once; `ticks` must be below next_event_in()."""
+        for _ in range(ticks):
+            self.tick()
+
     @abstractmethod
     def deliver_messages(self, messages: Iterable[Message]) -> None:
         ...
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Protocol, Optional
+from typing import ClassVar, Iterable, Protocol, Optional
 from os_sim.domain.processes import Process
 
 
@@ -11,10 +11,19 @@ class IProcessProvider(Protocol):
 
 
 class IScheduler(ABC):
+    # True if ran() may take the CPU away from the running process; the OS
+    # only consults ran() / requeue() for preemptive schedulers
+    preemptive: ClassVar[bool] = False
+
     @abstractmethod
     def add(self, proc: Process) -> None:
         ...
 
+    def add_many(self, procs: Iterable[Process]) -> None:
+        """Enqueue a batch, in order."""
+        for p in procs:
+            self.add(p)
+
     @abstractmethod
     def pick_next(self) -> Optional[Process]:
         ...
@@ -22,3 +31,17 @@ class IScheduler(ABC):
     @abstractmethod
     def remove(self, proc: Process) -> None:
         ...
+
+    def ran(self, proc: Process) -> bool:
+        """`proc` just ran one tick and is not done; True to preempt it."""
+        return False
+
+    def requeue(self, proc: Process) -> None:
+        """Take back a process the OS preempted."""
+
+    def steal(self, running: Optional[Process]) -> Optional[Process]:
+        """
+        Give up a waiting process (never `running`) to another core's run
+        queue; None if there is none or the scheduler does not allow it.
+        """
+        return None
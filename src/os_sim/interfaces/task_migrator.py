@@ -11,3 +11,16 @@ class ITaskMigrator(ABC):
         Executes the balancing of the given devices by migrating processes.
         """
         ...
+
+    def is_settled(self) -> bool:
+        """
+        True if the last rebalance moved nothing, so it will keep doing nothing
+        until a load or device state changes.
+        """
+        return False
+
+    def on_device_added(self, device: IDevice) -> None:
+        """Hook for migrators that keep per-device state."""
+
+    def on_device_removed(self, device_id: int) -> None:
+        """Hook for migrators that keep per-device state."""
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+from os_sim.interfaces.device import IDevice
+
+
+class IWorkload(ABC):
+    @abstractmethod
+    def apply(self, time: int, devices: Sequence[IDevice]) -> None:
+        """
+        Create the processes that arrive at step `time`.
+        """
+        ...
+
+    def next_event_time(self, time: int) -> Optional[int]:
+        """
+        Earliest step after `time` with an arrival, or None once the
+        workload is exhausted. Used by the event-driven engine to skip steps.
+        """
+        return time + 1
+
+    def on_device_added(self, device: IDevice) -> None:
+        """Hook for workloads that look devices up by id."""
+
+    def on_device_removed(self, device_id: int) -> None:
+        """Hook for workloads that look devices up by id."""
@@ -0,0 +1,5 @@
+import sys
+import pathlib
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "src"))
@@ -0,0 +1,105 @@
+"""BuddyMemoryManager: splitting, buddy merging and fragmentation."""
+import random
+
+import pytest
+
+from os_sim.application.memory.buddy_memory import BuddyMemoryManager
+
+
+def free_blocks(m: BuddyMemoryManager) -> list:
+    """(offset, size) of every free block, by address."""
+    return sorted((off, m.min_block << k) for k, offsets in enumerate(m._free) for off in offsets)
+
+
+def test_split_hands_out_the_lowest_address():
+    m = BuddyMemoryManager(64)
+    assert m.alloc(5, owner=1)  # rounds up to 8
+    assert m._blocks[1][:2] == (0, 3)
+    # 64 split down to 8: the upper halves 32, 16 and 8 stay free
+    assert free_blocks(m) == [(8, 8), (16, 16), (32, 32)]
+    assert (m.used, m.reserved, m.peak_used) == (5, 8, 5)
+
+    assert m.alloc(8, owner=2)
+    assert m._blocks[2][0] == 8
+    assert free_blocks(m) == [(16, 16), (32, 32)]
+
+
+def test_free_merges_with_free_buddies_only():
+    m = BuddyMemoryManager(64)
+    for owner in range(4):
+        assert m.alloc(16, owner)
+    m.free(16, 1)
+    m.free(16, 2)
+    # 16 and 32 are not buddies (16's buddy is 0), so nothing merges
+    assert free_blocks(m) == [(16, 16), (32, 16)]
+    m.free(16, 0)
+    assert free_blocks(m) == [(0, 32), (32, 16)]
+    m.free(16, 3)
+    assert free_blocks(m) == [(0, 64)]
+    assert (m.used, m.reserved, m.peak_used) == (0, 0, 64)
+
+
+def test_fragmentation_counts_free_memory_no_single_block_can_hold():
+    m = BuddyMemoryManager(64)
+    for owner in range(4):
+        m.alloc(16, owner)
+    m.free(16, 0)
+    m.free(16, 2)
+    assert m.largest_free_block == 16
+    assert not m.can_alloc(17)
+    assert not m.alloc(17, owner=9)
+    assert m.fragmentation == pytest.approx(0.5)
+
+
+def test_total_that_is_not_a_power_of_two():
+    m = BuddyMemoryManager(100, min_block=4)
+    # 25 units start out as blocks of 16, 8 and 1 units
+    assert free_blocks(m) == [(0, 64), (64, 32), (96, 4)]
+    assert m.alloc(4, owner=1)
+    # the lowest free block of the right size, not a split of a bigger one
+    assert m._blocks[1][0] == 96
+    assert free_blocks(m) == [(0, 64), (64, 32)]
+
+
+def test_owners_are_required_and_unique():
+    m = BuddyMemoryManager(32)
+    with pytest.raises(ValueError):
+        m.alloc(4)
+    m.alloc(4, owner=1)
+    with pytest.raises(ValueError):
+        m.alloc(4, owner=1)
+    with pytest.raises(ValueError):
+        BuddyMemoryManager(32, min_block=3)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_alloc_free_keeps_blocks_disjoint_and_fully_merges(seed):
+    rng = random.Random(seed)
+    total, min_block = rng.randint(1, 3000), rng.choice([1, 2, 8])
+    m = BuddyMemoryManager(total, min_block)
+    initial = free_blocks(m)
+    live = {}
+    for owner in range(400):
+        if live and rng.random() < 0.45:
+            victim = rng.choice(list(live))
+            m.free(live.pop(victim), victim)
+        else:
+            amount = rng.randint(0, 200)
+            fits = m.can_alloc(amount)
+            assert m.alloc(amount, owner) == fits
+            if fits:
+                live[owner] = amount
+            else:
+                assert m.block_size(amount) > m.largest_free_block
+
+        spans = free_blocks(m) + sorted(
+            (off, min_block << k) for off, k, _ in m._blocks.values() if k >= 0
+        )
+        spans.sort()
+        assert all(a + size <= b for (a, size), (b, _) in zip(spans, spans[1:]))
+        assert sum(size for _, size in spans) == total // min_block * min_block
+        assert m.used == sum(live.values())
+
+    for owner, amount in list(live.items()):
+        m.free(amount, owner)
+    assert free_blocks(m) == initial
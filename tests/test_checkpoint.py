@@ -0,0 +1,58 @@
+"""save_checkpoint / load_checkpoint round trips."""
+import pytest
+
+from os_sim.application.logging.in_memory_logger import InMemoryLogger
+from os_sim.application.simulation import checkpoint
+from os_sim.application.simulation.checkpoint import CheckpointError, load_checkpoint, save_checkpoint
+from os_sim.application.simulation.latency_metrics import LatencyMetrics
+from os_sim.cli.main import build_demo_simulation, format_state, summarize_state
+
+
+def demo(migrator: str = "heap"):
+    sim = build_demo_simulation(
+        InMemoryLogger(), num_devices=8, procs_per_device=10, imbalance_threshold=2,
+        fail_probability=0.05, seed=11, migrator=migrator,
+    )
+    sim.set_metrics(LatencyMetrics())
+    return sim
+
+
+@pytest.mark.parametrize("migrator", ["heap", "steal"])
+def test_resumed_run_matches_straight_run(tmp_path, migrator):
+    straight = demo(migrator)
+    straight.run(40)
+    path = str(tmp_path / "warm.ckpt")
+    save_checkpoint(straight, path)
+    resumed = load_checkpoint(path)
+
+    for _ in range(80):
+        straight.step()
+        resumed.step()
+        assert format_state(resumed) == format_state(straight)
+    assert summarize_state(resumed) == summarize_state(straight)
+    assert (resumed.completed_count, resumed.failure_count, resumed.total_moves) \
+        == (straight.completed_count, straight.failure_count, straight.total_moves)
+
+
+def test_latency_store_survives_the_round_trip(tmp_path):
+    sim = demo()
+    sim.run(60)
+    assert sim.metrics.completed_count
+    path = str(tmp_path / "warm.ckpt")
+    save_checkpoint(sim, path)
+    restored = load_checkpoint(path)
+
+    assert restored.metrics.completed_count == sim.metrics.completed_count
+    assert restored.metrics.summary() == sim.metrics.summary()
+    sim.run(30)
+    restored.run(30)
+    assert restored.metrics.summary() == sim.metrics.summary()
+
+
+def test_other_versions_are_refused(tmp_path, monkeypatch):
+    path = str(tmp_path / "old.ckpt")
+    monkeypatch.setattr(checkpoint, "VERSION", checkpoint.VERSION - 1)
+    save_checkpoint(demo(), path)
+    monkeypatch.undo()
+    with pytest.raises(CheckpointError, match="version"):
+        load_checkpoint(path)
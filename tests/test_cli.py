@@ -0,0 +1,39 @@
+"""Headless runs through the command line entry point."""
+import json
+import sys
+
+import pytest
+
+from os_sim.cli.main import main
+
+DEMO = ["--headless", "--seed", "1", "-d", "3", "-p", "4"]
+
+
+def run(monkeypatch, capsys, *argv: str) -> dict:
+    monkeypatch.setattr(sys, "argv", ["fakeOS", *argv])
+    main()
+    return json.loads(capsys.readouterr().out)
+
+
+def test_load_with_latency_keeps_the_checkpointed_store(monkeypatch, capsys, tmp_path):
+    ckpt = str(tmp_path / "warm.ckpt")
+    warm = run(monkeypatch, capsys, *DEMO, "--steps", "30", "--latency", "--save", ckpt)
+    resumed = run(monkeypatch, capsys, "--headless", "--steps", "30", "--load", ckpt, "--latency")
+    straight = run(monkeypatch, capsys, *DEMO, "--steps", "60", "--latency")
+
+    assert warm["latency"]["cluster"]["completed"] > 0
+    assert resumed["latency"] == straight["latency"]
+
+
+@pytest.mark.parametrize("engine", ["object", "vector"])
+def test_peak_memory_outlives_the_processes(monkeypatch, capsys, engine):
+    report = run(monkeypatch, capsys, *DEMO, "--steps", "200", "--fail", "0", "-e", engine)
+    final = report["final_state"]
+
+    assert final["processes"] == 0 and final["memory_used"] == 0
+    peak = report["peak_memory"]
+    assert 0 < peak["used_sum"] <= peak["total"]
+    assert peak["max_device"] in [d["id"] for d in final["devices"]]
+    assert all(d["memory_used"] <= d["memory_peak"] <= d["memory_total"] for d in final["devices"])
+    # the simulator's own memory is reported separately
+    assert "peak_rss_kb" in report
@@ -0,0 +1,80 @@
+"""Same seed, same run: the object, vector and sharded engines step alike."""
+import pytest
+
+from os_sim.application.ipc.simple_bus import SimpleMessageBus
+from os_sim.application.logging.in_memory_logger import InMemoryLogger
+from os_sim.application.simulation.random_failure import RandomFailureStrategy
+from os_sim.application.simulation.sharded_engine import ShardedSimulationEngine
+from os_sim.application.simulation.vector_engine import VectorSimulationEngine
+from os_sim.cli.main import (
+    PROC_TEMPLATES, build_demo_simulation, build_demo_vector_simulation, format_state,
+    plan_demo_devices, summarize_state,
+)
+
+STEPS = 150
+
+
+def demo(seed: int, fail: float, memory: str = "counter"):
+    return build_demo_simulation(
+        InMemoryLogger(), num_devices=12, procs_per_device=6, imbalance_threshold=2,
+        fail_probability=fail, seed=seed, memory=memory,
+    )
+
+
+def counters(sim) -> tuple:
+    return sim.time, sim.completed_count, sim.total_moves, sim.failure_count
+
+
+@pytest.mark.parametrize("seed, fail", [(1, 0.0), (2, 0.05), (3, 0.3)])
+def test_scheduled_failures_replay_on_every_engine(seed, fail):
+    sim = demo(seed, fail)
+    vec = VectorSimulationEngine.from_engine(demo(seed, fail))
+    spec = build_demo_vector_simulation(
+        InMemoryLogger(), num_devices=12, procs_per_device=6, imbalance_threshold=2,
+        fail_probability=fail, seed=seed,
+    )
+    for _ in range(STEPS):
+        sim.step()
+        vec.step()
+        spec.step()
+        assert format_state(vec) == format_state(sim)
+        assert format_state(spec) == format_state(sim)
+    assert counters(vec) == counters(spec) == counters(sim)
+
+    sharded = ShardedSimulationEngine.from_engine(demo(seed, fail), workers=1)
+    try:
+        sharded.run(STEPS)
+        assert counters(sharded) == counters(sim)
+        assert summarize_state(sharded) == summarize_state(sim)
+    finally:
+        sharded.close()
+
+
+@pytest.mark.parametrize("seed, fail, workers", [(1, 0.0, 1), (1, 0.0, 3), (2, 0.05, 1), (3, 0.3, 1)])
+def test_buddy_memory_refusals_replay_on_sharded_engine(seed, fail, workers):
+    # free memory overstates what a fragmented buddy device can place, so
+    # some planned moves are refused by the destination
+    sim = demo(seed, fail, "buddy")
+    sim.run(STEPS)
+    sharded = ShardedSimulationEngine.from_engine(demo(seed, fail, "buddy"), workers=workers)
+    try:
+        sharded.run(STEPS)
+        assert counters(sharded) == counters(sim)
+        assert summarize_state(sharded) == summarize_state(sim)
+    finally:
+        sharded.close()
+
+
+@pytest.mark.parametrize("seed", [4, 5])
+def test_random_failures_replay_on_vector_engine(seed):
+    sim = demo(seed, 0.1)
+    sim.failure_strategy = RandomFailureStrategy(fail_probability=0.1, recovery_delay=2, seed=seed)
+    vec = VectorSimulationEngine.from_specs(
+        plan_demo_devices(12, 6, PROC_TEMPLATES), seed=seed, message_bus=SimpleMessageBus(),
+        fail_probability=0.1, recovery_delay=2, migrate=True, min_gap=2,
+    )
+    for _ in range(STEPS):
+        sim.step()
+        vec.step()
+        assert format_state(vec) == format_state(sim)
+    assert counters(vec) == counters(sim)
@@ -0,0 +1,61 @@
+"""Event-driven runs skip idle stretches but end in the state stepping would."""
+import pytest
+
+from os_sim.application.logging.in_memory_logger import InMemoryLogger
+from os_sim.domain.messages import Message
+from os_sim.cli.main import build_demo_simulation, format_state
+
+# long CPU bursts so that most steps are pure burn-down
+TEMPLATES = [lambda i: (40 + 13 * i % 50, i + 3), lambda i: (200, 1), lambda i: (1 + 3 * i % 7, 2 + i % 4)]
+CHUNKS = (1, 7, 60, 300, 5, 500)
+
+
+def demo(event_driven: bool, **setup):
+    sim = build_demo_simulation(
+        InMemoryLogger(_max_lines=10**6), num_devices=6, procs_per_device=8, imbalance_threshold=3,
+        fail_probability=0.002, recovery_delay=20, proc_templates=TEMPLATES, seed=3, **setup,
+    )
+    sim.event_driven = event_driven
+    return sim
+
+
+def executed_steps(sim) -> int:
+    return sum(1 for line in sim.logger.get_last(10**6) if line.startswith("[SIM] === Step"))
+
+
+@pytest.mark.parametrize("setup, skips", [
+    ({}, True),
+    ({"quantum": 4, "switch_cost": 1}, True),
+    ({"cores": 2}, True),
+    ({"migrator": "steal"}, True),
+    ({"transfer_cost": 0.5}, True),
+    # preemptive schedulers may switch on any tick, so nothing is skipped
+    ({"scheduler": "mlfq"}, False),
+    ({"scheduler": "srtf", "quantum": 4}, False),
+], ids=["rr", "rr-quantum", "multicore", "steal", "transport", "mlfq", "srtf"])
+def test_event_driven_matches_stepping(setup, skips):
+    stepped, skipping = demo(False, **setup), demo(True, **setup)
+    for i, n in enumerate(CHUNKS):
+        if i == 2:
+            for sim in (stepped, skipping):
+                sim.devices[1].os().create_process(90, 2)
+        stepped.run(n)
+        skipping.run(n)
+        assert skipping.time == stepped.time
+        assert format_state(skipping) == format_state(stepped)
+    assert (skipping.completed_count, skipping.failure_count, skipping.total_moves) \
+        == (stepped.completed_count, stepped.failure_count, stepped.total_moves)
+    executed = executed_steps(skipping)
+    assert executed_steps(stepped) == sum(CHUNKS)
+    assert executed < sum(CHUNKS) if skips else executed == sum(CHUNKS)
+
+
+def test_parked_mail_does_not_stop_skipping():
+    sim = demo(True)
+    removed = sim.devices[-1].id
+    sim.remove_device(removed)
+    for to_device in (99, removed):
+        sim.message_bus.send(Message(from_device=1, to_device=to_device, payload="x"))
+    sim.run(2000)
+    assert sim.message_bus.pending_count == 2
+    assert executed_steps(sim) < 200
@@ -0,0 +1,50 @@
+"""SimpleMessageBus delivery through the engine."""
+from os_sim.application.devices.simple_device import SimpleDevice
+from os_sim.application.ipc.simple_bus import SimpleMessageBus
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.domain.messages import Message
+
+
+def device(dev_id: int) -> SimpleDevice:
+    return SimpleDevice(
+        _id=dev_id, _os=BasicOperatingSystem(memory=SimpleMemoryManager(10), scheduler=RoundRobinScheduler()),
+    )
+
+
+def test_drain_all_offers_each_mailbox_once_in_arrival_order():
+    bus = SimpleMessageBus()
+    for to in (3, 1, 3):
+        bus.send(Message(from_device=0, to_device=to, payload=f"to {to}"))
+    drained = bus.drain_all()
+    assert list(drained) == [3, 1]
+    assert [m.payload for m in drained[3]] == ["to 3", "to 3"]
+    assert bus.drain_all() == {}
+    assert (bus.sent_count, bus.delivered_count, bus.pending_count) == (3, 3, 0)
+
+
+def test_mail_for_an_unknown_device_waits_for_it():
+    bus = SimpleMessageBus()
+    sim = SimulationEngine(devices=[device(1)], message_bus=bus)
+    bus.send(Message(from_device=1, to_device=2, payload="early"))
+    sim.step()
+    sim.step()
+    assert bus.pending_count == 1
+
+    late = device(2)
+    sim.add_device(late)
+    sim.step()
+    assert bus.pending_count == 0
+    assert [m.payload for m in late.os().pending_messages()] == ["early"]
+
+
+def test_removed_device_is_no_longer_delivered_to():
+    bus = SimpleMessageBus()
+    sim = SimulationEngine(devices=[device(1), device(2)], message_bus=bus)
+    sim.remove_device(2)
+    bus.send(Message(from_device=1, to_device=2, payload="gone"))
+    sim.step()
+    assert bus.pending_count == 1
+    assert sim.devices_by_id().keys() == {1}
@@ -0,0 +1,55 @@
+"""Heap and stealing migrators: which devices they see and what they move."""
+from functools import partial
+
+import pytest
+
+from os_sim.application.devices.simple_device import SimpleDevice
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator
+from os_sim.application.simulation.stealing_migrator import StealingTaskMigrator
+from os_sim.application.simulation.vector_engine import VectorSimulationEngine
+
+# the thief samples random peers; this seed draws the busy device first
+STEALING = partial(StealingTaskMigrator, seed=2)
+MIGRATORS = [HeapTaskMigrator, STEALING]
+
+
+def device(dev_id: int, procs: int) -> SimpleDevice:
+    os_ = BasicOperatingSystem(memory=SimpleMemoryManager(100), scheduler=RoundRobinScheduler())
+    for _ in range(procs):
+        os_.create_process(10, 1)
+    return SimpleDevice(_id=dev_id, _os=os_)
+
+
+@pytest.mark.parametrize("migrator", MIGRATORS, ids=["heap", "steal"])
+def test_rebalance_follows_the_devices_it_is_given(migrator):
+    busy, idle = device(1, 6), device(2, 0)
+    m = migrator(max_moves=1)
+    # never announced through on_device_added
+    m.rebalance([busy, idle])
+    assert m.total_moves == 1
+    assert idle.os().load == 1
+
+    m.rebalance([busy])
+    m.rebalance([busy])
+    assert m.total_moves == 1
+    assert idle.os().load == 1
+
+
+@pytest.mark.parametrize("migrator, loads", [
+    (HeapTaskMigrator, [5, 7]),
+    (STEALING, [4, 8]),
+], ids=["heap", "steal"])
+def test_devices_without_load_listener_are_recounted(migrator, loads):
+    vec = VectorSimulationEngine.from_specs([(1, 100, [(10, 1)] * 4), (2, 100, [])])
+    views = vec.devices
+    m = migrator(max_moves=1)
+    for view in views:
+        m.on_device_added(view)
+    # device 2 fills up behind the migrator's back
+    vec.create_processes(1, [(10, 1)] * 8)
+    m.rebalance(views)
+    # counts from registration would have moved one from device 1 to 2
+    assert [v.os().load for v in views] == loads
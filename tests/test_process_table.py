@@ -0,0 +1,52 @@
+"""ProcessTable: append-only rows, pid lookups and compaction."""
+import pytest
+
+from os_sim.domain.process_table import ProcessTable
+from os_sim.domain.states import ProcessState
+
+
+def test_in_order_pids_are_looked_up_by_bisect():
+    table = ProcessTable()
+    table.extend(1, [5, 6, 7], [1, 1, 1])
+    table.add(4 + 1, 8, 1)
+    assert table.pid_ordered
+    assert [p.pid for p in table] == [1, 2, 3, 5]
+    assert table.get(5).cpu_time == 8
+    assert table.get(4) is None
+
+
+def test_out_of_order_pids_append_and_switch_to_an_index():
+    table = ProcessTable()
+    table.extend(10, [1, 2], [1, 1])
+    epoch = table.epoch
+    ref = table.get(11)
+    table.add(3, 30, 2, state=ProcessState.BLOCKED)
+    assert not table.pid_ordered
+    # appended, so rows and refs did not move
+    assert table.epoch == epoch
+    assert ref.row == 1 and ref.cpu_time == 2
+    assert [p.pid for p in table] == [10, 11, 3]
+    assert table.first(ProcessState.BLOCKED).pid == 3
+    assert table.get(3).cpu_time == 30
+    with pytest.raises(ValueError):
+        table.add(10, 1, 1)
+
+
+def test_removed_rows_are_squeezed_out_once_they_dominate():
+    table = ProcessTable()
+    table.extend(1, [1] * 100, [1] * 100)
+    table.add(500, 9, 1)
+    survivor = table.get(500)
+    epoch = table.epoch
+    for pid in range(1, 51):
+        assert table.remove(pid)
+    assert table.epoch == epoch and len(table.pid) == 101
+    # the 51st free row outnumbers the 50 live ones
+    assert table.remove(51)
+    assert not table.remove(1)
+    assert table.epoch > epoch
+    assert len(table) == len(table.pid) == 50
+    # the ref follows its pid to the new row
+    assert survivor.cpu_time == 9
+    assert table.get(52).row == 0
+    assert 51 not in table and 52 in table
@@ -0,0 +1,141 @@
+"""Run-queue order of the round-robin, heap-keyed and MLFQ schedulers."""
+from collections import OrderedDict
+
+import pytest
+
+from os_sim.application.scheduling.heap_schedulers import (
+    PriorityScheduler, SRTFScheduler, _KeyedHeapScheduler,
+)
+from os_sim.application.scheduling.mlfq import MLFQScheduler
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
+
+
+def proc(pid: int, cpu_time: int = 10, priority: int = 0) -> Process:
+    return Process(pid=pid, cpu_time=cpu_time, mem_required=1, priority=priority)
+
+
+def drain(sched) -> list:
+    order = []
+    while (p := sched.pick_next()) is not None:
+        order.append(p.pid)
+    return order
+
+
+def test_round_robin_rotates_and_removes_by_pid():
+    rr = RoundRobinScheduler()
+    rr.add_many(proc(pid) for pid in (1, 2, 3))
+    assert [rr.pick_next().pid for _ in range(4)] == [1, 2, 3, 1]
+    assert rr.remove_pid(2).pid == 2
+    assert rr.remove_pid(2) is None
+    assert [rr.pick_next().pid for _ in range(3)] == [3, 1, 3]
+    assert rr.queued() == 2
+
+
+def test_round_robin_resolves_bare_pids_on_demand():
+    made = []
+
+    def resolve(pid):
+        made.append(pid)
+        return proc(pid)
+
+    rr = RoundRobinScheduler(_queue=OrderedDict.fromkeys([1, 2, 3]), _resolve=resolve)
+    assert rr.pick_next().pid == 1
+    assert made == [1]
+    assert rr.remove_pid(3).pid == 3
+    assert [rr.pick_next().pid for _ in range(3)] == [2, 1, 2]
+    assert made == [1, 3, 2]
+
+
+def test_keyed_heap_scheduler_is_abstract():
+    with pytest.raises(TypeError):
+        _KeyedHeapScheduler()
+
+
+def test_priority_order_is_fifo_among_equals():
+    sched = PriorityScheduler()
+    for pid, prio in [(1, 2), (2, 0), (3, 1), (4, 0), (5, 2)]:
+        sched.add(proc(pid, priority=prio))
+    assert drain(sched) == [2, 4, 3, 1, 5]
+
+
+def test_priority_preempts_for_a_more_urgent_process_only():
+    sched = PriorityScheduler()
+    running = proc(1, priority=1)
+    sched.add(proc(2, priority=1))
+    assert not sched.ran(running)
+    sched.add(proc(3, priority=0))
+    assert sched.ran(running)
+
+
+def test_srtf_picks_least_remaining_and_skips_removed_and_evicted():
+    sched = SRTFScheduler()
+    procs = {pid: proc(pid, cpu_time=cpu) for pid, cpu in [(1, 9), (2, 3), (3, 5), (4, 1), (5, 3)]}
+    sched.add_many(procs.values())
+    sched.remove(procs[4])
+    procs[3].state = ProcessState.MIGRATED
+    assert drain(sched) == [2, 5, 1]
+    assert sched.queued() == 0
+
+
+def test_srtf_batch_and_single_adds_agree():
+    specs = [(pid, (pid * 7) % 11 + 1) for pid in range(1, 40)]
+    batch, single = SRTFScheduler(), SRTFScheduler()
+    batch.add_many(proc(pid, cpu) for pid, cpu in specs)
+    for pid, cpu in specs:
+        single.add(proc(pid, cpu))
+    assert drain(batch) == drain(single) == [pid for pid, _ in sorted(specs, key=lambda s: (s[1], s[0]))]
+
+
+def test_mlfq_demotes_after_a_full_slice():
+    sched = MLFQScheduler(levels=3, quantum=2, boost_interval=0)
+    a, b = proc(1), proc(2)
+    sched.add(a)
+    sched.add(b)
+    assert sched.pick_next() is a
+    assert not sched.ran(a)
+    assert sched.ran(a)  # slice of 2 used up: a drops to level 1
+    sched.requeue(a)
+    assert sched.pick_next() is b
+    sched.ran(b)
+    assert sched.ran(b)
+    sched.requeue(b)
+    # both on level 1 now, slices of 4
+    assert sched.pick_next() is a
+    assert [sched.ran(a) for _ in range(4)] == [False, False, False, True]
+
+
+def test_mlfq_preempts_for_a_higher_level():
+    sched = MLFQScheduler(levels=2, quantum=1, boost_interval=0)
+    a = proc(1)
+    sched.add(a)
+    sched.pick_next()
+    sched.ran(a)
+    sched.requeue(a)
+    assert sched.pick_next() is a
+    assert not sched.ran(a)
+    sched.add(proc(2))
+    assert sched.ran(a)
+    sched.requeue(a)
+    assert drain(sched) == [2, 1]
+
+
+def test_mlfq_boost_counts_ran_ticks():
+    sched = MLFQScheduler(levels=3, quantum=1, boost_interval=3)
+    a, b = proc(1), proc(2)
+    sched.add(a)
+    sched.add(b)
+    sched.pick_next()
+    sched.ran(a)  # a -> level 1
+    sched.requeue(a)
+    sched.pick_next()
+    sched.ran(b)  # b -> level 1
+    sched.requeue(b)
+    assert sched.pick_next() is a
+    # the third ran() tick boosts b back to level 0 before a, still running,
+    # uses up its new level-0 slice and drops again
+    assert sched.ran(a)
+    assert sched._level == {1: 1, 2: 0}
+    sched.requeue(a)
+    assert drain(sched) == [2, 1]
@@ -0,0 +1,118 @@
+"""Identity-preserving migration: processes keep their pid and land late."""
+import pytest
+
+from os_sim.application.devices.simple_device import SimpleDevice
+from os_sim.application.memory.simple_memory import SimpleMemoryManager
+from os_sim.application.os.basic_os import BasicOperatingSystem
+from os_sim.application.scheduling.round_robin import RoundRobinScheduler
+from os_sim.application.simulation.engine import SimulationEngine
+from os_sim.application.simulation.heap_migrator import HeapTaskMigrator
+from os_sim.application.simulation.stealing_migrator import StealingTaskMigrator
+from os_sim.application.simulation.transport import ProcessTransport
+from os_sim.domain.processes import Process
+from os_sim.domain.states import ProcessState
+
+
+def device(dev_id: int, transport: ProcessTransport | None = None) -> SimpleDevice:
+    os_ = BasicOperatingSystem(
+        memory=SimpleMemoryManager(100), scheduler=RoundRobinScheduler(),
+        pids=transport.pids if transport is not None else None,
+    )
+    return SimpleDevice(_id=dev_id, _os=os_)
+
+
+def cluster(ticks_per_mem: float, migrator=None):
+    transport = ProcessTransport(ticks_per_mem=ticks_per_mem)
+    busy, idle = device(1, transport), device(2, transport)
+    for _ in range(4):
+        busy.os().create_process(50, 2)
+    sim = SimulationEngine(devices=[busy, idle], task_migrator=migrator or HeapTaskMigrator(max_moves=1))
+    sim.set_transport(transport)
+    return sim, transport, busy, idle
+
+
+def test_moved_process_keeps_its_pid_and_waits_out_the_transfer():
+    sim, transport, busy, idle = cluster(1.5)
+    sim.step()
+    (record,) = transport.history[1]
+    assert (record.source, record.target, record.sent) == (1, 2, 1)
+    assert record.delay == 3  # ceil(1.5 * 2 memory)
+    assert record.remaining == 49
+
+    while sim.time + 1 < record.arrives:
+        sim.step()
+        assert idle.os().get_process(1).state is ProcessState.BLOCKED
+        assert idle.os().get_process(1).remaining == 49
+    assert busy.os().get_process(1) is None
+
+    sim.step()
+    moved = idle.os().get_process(1)
+    assert moved.state is ProcessState.RUNNING
+    assert moved.remaining == 48
+    assert moved.migrations == 1
+    assert transport.in_flight == sum(
+        1 for d in sim.devices for p in d.os().processes() if p.state is ProcessState.BLOCKED
+    )
+
+
+def test_zero_cost_transfer_runs_on_the_next_step():
+    sim, transport, busy, idle = cluster(0.0)
+    sim.step()
+    assert transport.history[1][0].delay == 0
+    assert idle.os().get_process(1).state is ProcessState.BLOCKED
+    sim.step()
+    assert idle.os().get_process(1).state is ProcessState.RUNNING
+
+
+def test_event_driven_run_lands_on_time():
+    stepped, _, _, _ = cluster(4.0)
+    skipping, _, _, _ = cluster(4.0)
+    skipping.event_driven = True
+    stepped.run(120)
+    skipping.run(120)
+    for a, b in zip(stepped.devices, skipping.devices):
+        assert [(p.pid, p.state, p.remaining) for p in a.os().processes()] \
+            == [(p.pid, p.state, p.remaining) for p in b.os().processes()]
+    assert skipping.completed_count == stepped.completed_count == 4
+
+
+@pytest.mark.parametrize("migrator", [HeapTaskMigrator, StealingTaskMigrator])
+def test_processes_in_flight_are_not_moved_again(migrator):
+    transport = ProcessTransport()
+    full, empty = device(1, transport), device(2, transport)
+    for pid in (1, 2, 3):
+        full.os().adopt_process(Process(pid=pid, cpu_time=10, mem_required=1), blocked=True)
+    sim = SimulationEngine(devices=[full, empty], task_migrator=migrator(imbalance_threshold=1, max_moves=3))
+    sim.set_transport(transport)
+    sim.task_migrator.rebalance(sim.devices)
+    assert sim.task_migrator.total_moves == 0
+    assert full.os().active_load == 0 and full.os().load == 3
+
+
+def test_removing_the_target_loses_processes_in_flight():
+    sim, transport, busy, idle = cluster(10.0)
+    sim.step()
+    assert transport.in_flight == 1
+    sim.remove_device(2)
+    assert (transport.in_flight, transport.lost) == (0, 1)
+    assert transport.summary()["lost"] == 1
+
+
+def test_transport_refused_over_locally_numbered_processes():
+    numbered = device(1)
+    numbered.os().create_process(5, 1)
+    sim = SimulationEngine(devices=[numbered, device(2)])
+    with pytest.raises(ValueError, match="pid namespace"):
+        sim.set_transport(ProcessTransport())
+    assert sim.transport is None
+    assert numbered.os().pids is None
+
+    transport = ProcessTransport()
+    sim = SimulationEngine(devices=[device(2)])
+    sim.set_transport(transport)
+    with pytest.raises(ValueError, match="pid namespace"):
+        sim.add_device(numbered)
+    shared = device(3, transport)
+    shared.os().create_process(5, 1)
+    sim.add_device(shared)
+    assert transport.pids.next_pid == 2